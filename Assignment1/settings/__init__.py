@@ -0,0 +1,19 @@
+# Settings profile chosen by DJANGO_PROFILE: 'base' (the default, for
+# development), 'production', or 'test' (used by manage.py test).
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+DJANGO_PROFILE = os.environ.get('DJANGO_PROFILE', 'base')
+
+if DJANGO_PROFILE == 'production':
+    from .production import *  # noqa: F401,F403
+elif DJANGO_PROFILE == 'test':
+    from .test import *  # noqa: F401,F403
+elif DJANGO_PROFILE == 'base':
+    from .base import *  # noqa: F401,F403
+else:
+    raise ImproperlyConfigured(
+        f"Unknown DJANGO_PROFILE {DJANGO_PROFILE!r}, expected 'base', 'production' or 'test'."
+    )
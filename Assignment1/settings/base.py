@@ -0,0 +1,214 @@
+"""
+Base Django settings for Assignment1 project, used for development. The
+production profile in production.py overrides them; __init__.py picks the
+profile from the DJANGO_PROFILE environment variable.
+
+Generated by 'django-admin startproject' using Django 5.1.1.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.1/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/5.1/ref/settings/
+"""
+
+import os
+from importlib.util import find_spec
+from pathlib import Path
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = os.environ.get(
+    'DJANGO_SECRET_KEY', 'django-insecure-pi-t=eeh3wdn2+g3cbumn_4xf2s4myydvq2gh_crny=mddg=m('
+)
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = True
+
+ALLOWED_HOSTS = []
+
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'attendance'
+]
+
+MIDDLEWARE = [
+    'attendance.instrumentation.InstrumentationMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'attendance.roles.RoleMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'Assignment1.urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [BASE_DIR / 'templates']
+        ,
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'Assignment1.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+# Configured from DATABASE_* environment variables. Connections are kept for
+# DATABASE_CONN_MAX_AGE seconds and checked before reuse. DATABASE_POOL=1
+# switches PostgreSQL to a psycopg 3 connection pool instead; without
+# psycopg_pool installed (e.g. on psycopg2) persistent connections are used.
+
+DATABASE_ENGINE = os.environ.get('DATABASE_ENGINE', 'django.db.backends.postgresql')
+
+DATABASES = {
+    'default': {
+        'ENGINE': DATABASE_ENGINE,
+        'NAME': os.environ.get('DATABASE_NAME', 'attendance_system_db'),
+        'USER': os.environ.get('DATABASE_USER', 'dbuser'),
+        'PASSWORD': os.environ.get('DATABASE_PASSWORD', 'dbpassword'),
+        'HOST': os.environ.get('DATABASE_HOST', 'localhost'),
+        'PORT': os.environ.get('DATABASE_PORT', '5432'),
+        'CONN_MAX_AGE': int(os.environ.get('DATABASE_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {},
+    }
+}
+
+if (
+    os.environ.get('DATABASE_POOL') == '1'
+    and DATABASE_ENGINE == 'django.db.backends.postgresql'
+    and find_spec('psycopg') is not None
+    and find_spec('psycopg_pool') is not None
+):
+    # Pooled connections go back to the pool after each request, so Django
+    # must not also keep them open.
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.environ.get('DATABASE_POOL_MIN_SIZE', 2)),
+        'max_size': int(os.environ.get('DATABASE_POOL_MAX_SIZE', 10)),
+        'timeout': int(os.environ.get('DATABASE_POOL_TIMEOUT', 10)),
+    }
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Local memory by default, which is per process. When running several
+# processes, switch to a shared backend such as
+# 'django.core.cache.backends.filebased.FileBasedCache' with a directory as
+# LOCATION, so invalidations reach every process.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+}
+
+ATTENDANCE_CACHE_TIMEOUT = 600
+
+
+# Where attendance is stored: 'table' keeps one Attendance row per student
+# per day, 'bitmap' one AttendanceBitmap per enrollment with two bits per
+# day of the semester. Move existing data with convert_attendance_storage
+# before switching.
+
+ATTENDANCE_STORAGE = os.environ.get('ATTENDANCE_STORAGE', 'table')
+
+
+# Request instrumentation, served to staff at /instrumentation/. When off,
+# the middleware removes itself at startup. Requests slower than
+# ATTENDANCE_SLOW_REQUEST_MS are logged with their SQL to the
+# 'attendance.slow_requests' logger.
+
+ATTENDANCE_INSTRUMENTATION = False
+ATTENDANCE_INSTRUMENTATION_WINDOW = 1000
+ATTENDANCE_SLOW_REQUEST_MS = None
+
+# Route home, attendance entry, the student attendance page and the poor
+# attendance alert to their native async views. asgi.py turns this on.
+ATTENDANCE_ASYNC_VIEWS = os.environ.get('ATTENDANCE_ASYNC_VIEWS') == '1'
+
+
+# Password validation
+# https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+# Processes that hash passwords in attendance.accounts.provision_users; None
+# for one per CPU.
+ACCOUNT_PROVISIONING_PROCESSES = None
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/5.1/topics/i18n/
+
+LANGUAGE_CODE = 'en-us'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/5.1/howto/static-files/
+
+STATIC_URL = 'static/'
+
+# collectstatic target, served by WhiteNoise in production
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# Uploaded files, such as student import jobs
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+LOGIN_REDIRECT_URL = '/'
+LOGOUT_REDIRECT_URL = '/'
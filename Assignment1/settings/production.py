@@ -0,0 +1,95 @@
+"""
+Production settings for Assignment1 project, selected with
+DJANGO_PROFILE=production. Everything not set here comes from base.py.
+
+Required environment: DJANGO_SECRET_KEY and DJANGO_ALLOWED_HOSTS (comma
+separated), plus the DATABASE_* variables described in base.py. Run
+collectstatic before starting the workers.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR, MIDDLEWARE, TEMPLATES
+
+# With DEBUG on, every query of a request is kept in connection.queries and
+# error pages expose the settings.
+DEBUG = False
+
+try:
+    SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+except KeyError:
+    raise ImproperlyConfigured('Set DJANGO_SECRET_KEY for the production profile.')
+
+ALLOWED_HOSTS = [host.strip() for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',') if host.strip()]
+
+# TLS is terminated by the platform's router, which sets X-Forwarded-Proto.
+SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
+SESSION_COOKIE_SECURE = os.environ.get('DJANGO_SECURE_COOKIES', '1') == '1'
+CSRF_COOKIE_SECURE = SESSION_COOKIE_SECURE
+
+
+# Templates are compiled once per process.
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'context_processors': [
+                processor for processor in TEMPLATES[0]['OPTIONS']['context_processors']
+                if processor != 'django.template.context_processors.debug'
+            ],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+
+# Static files are served by the workers through WhiteNoise, with hashed
+# names (ManifestStaticFilesStorage) and precompressed gzip copies, so they
+# can be cached forever by browsers and CDNs. WhiteNoise only adds brotli
+# copies when the Brotli package is installed, which requirements.txt leaves out.
+MIDDLEWARE = [
+    *MIDDLEWARE[:MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1],
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    *MIDDLEWARE[MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1:],
+]
+
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+}
+
+STATIC_ROOT = os.environ.get('DJANGO_STATIC_ROOT', BASE_DIR / 'staticfiles')
+
+
+# Several worker processes share one cache, so that a version bump in one
+# process invalidates the entries of all of them.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('DJANGO_CACHE_DIR', '/tmp/attendance-cache'),
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+}
+
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'root': {
+        'handlers': ['console'],
+        'level': os.environ.get('DJANGO_LOG_LEVEL', 'WARNING'),
+    },
+}
@@ -0,0 +1,13 @@
+"""
+Test settings for Assignment1 project, selected with DJANGO_PROFILE=test.
+manage.py test picks this profile unless DJANGO_PROFILE is set.
+"""
+
+from .base import *  # noqa: F401,F403
+
+# Tests create and log in many users; a deliberately slow hasher would
+# dominate the run. Never use this outside tests.
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# Hash passwords in the test process rather than a pool.
+ACCOUNT_PROVISIONING_PROCESSES = 1
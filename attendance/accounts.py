@@ -0,0 +1,69 @@
+import os
+from itertools import islice
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.contrib.auth.tokens import default_token_generator
+from django.db import transaction
+from django.urls import reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+
+def provisioning_processes():
+    return getattr(settings, 'ACCOUNT_PROVISIONING_PROCESSES', None) or os.cpu_count() or 1
+
+
+def _setup_worker():
+    # Spawned workers start without Django; forked ones already have it.
+    if not apps.ready:
+        django.setup()
+
+
+# Hash passwords on a pool of processes. Each hash costs the hasher's full
+# work factor (PBKDF2 runs a million iterations), so throughput only grows
+# with cores. Returns the encoded passwords in order; None gives an unusable
+# password without any hashing.
+def hash_passwords(passwords, processes=None, chunksize=8):
+    passwords = list(passwords)
+    processes = min(processes or provisioning_processes(), sum(password is not None for password in passwords))
+    if processes <= 1:
+        return [make_password(password) for password in passwords]
+    # Imported here: the student importer loads this module in every worker.
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(processes, initializer=_setup_worker) as pool:
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+
+
+# Bulk-create users from dicts of User field values. A 'password' entry is
+# the raw password, hashed with hash_passwords; accounts without one get an
+# unusable password, to be set by the user through password_setup_links.
+# Returns the created users.
+def provision_users(accounts, processes=None, batch_size=1000):
+    accounts = iter(accounts)
+    created = []
+    while batch := list(islice(accounts, batch_size)):
+        fields = [{key: value for key, value in account.items() if key != 'password'} for account in batch]
+        passwords = hash_passwords([account.get('password') for account in batch], processes)
+        with transaction.atomic():
+            created += User.objects.bulk_create([
+                User(**values, password=password) for values, password in zip(fields, passwords)
+            ])
+    return created
+
+
+# One-time links where each user picks their own password, instead of being
+# issued one. A link stops working once the password is set, or after
+# PASSWORD_RESET_TIMEOUT. Returns {user id: path}.
+def password_setup_links(users):
+    return {
+        user.pk: reverse('password_setup', kwargs={
+            'uidb64': urlsafe_base64_encode(force_bytes(user.pk)),
+            'token': default_token_generator.make_token(user),
+        })
+        for user in users
+    }
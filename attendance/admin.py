@@ -1,3 +1,44 @@
 from django.contrib import admin
+from django.contrib.admin import helpers
+from django.shortcuts import render
 
-# Register your models here.
+from .forms import CollegeDayGenerationForm
+from .models import Class, CollegeDay
+from .services import generate_college_days
+
+
+@admin.action(description='Generate college days from the semester dates')
+def generate_college_days_action(modeladmin, request, queryset):
+    if 'apply' in request.POST:
+        form = CollegeDayGenerationForm(request.POST)
+        if form.is_valid():
+            count = generate_college_days(queryset.select_related('semester'), form.cleaned_data['weekdays'])
+            modeladmin.message_user(request, f'Generated up to {count} college days for {queryset.count()} classes.')
+            return None
+    else:
+        form = CollegeDayGenerationForm()
+
+    return render(request, 'admin/attendance/generate_college_days.html', {
+        **modeladmin.admin_site.each_context(request),
+        'title': 'Generate college days',
+        'form': form,
+        'classes': queryset.select_related('course', 'semester'),
+        'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+        'opts': modeladmin.model._meta,
+    })
+
+
+@admin.register(Class)
+class ClassAdmin(admin.ModelAdmin):
+    list_display = ['__str__', 'semester', 'lecturer']
+    list_select_related = ['course', 'semester', 'lecturer']
+    list_filter = ['semester']
+    actions = [generate_college_days_action]
+
+
+@admin.register(CollegeDay)
+class CollegeDayAdmin(admin.ModelAdmin):
+    list_display = ['date', 'class_info']
+    list_select_related = ['class_info__course']
+    list_filter = ['class_info__semester']
+    date_hierarchy = 'date'
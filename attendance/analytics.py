@@ -0,0 +1,160 @@
+from dataclasses import dataclass
+
+import numpy as np
+from django.db import transaction
+
+from .models import AttendanceSnapshot, Enrollment
+from .services import default_absence_threshold
+from .storage import get_storage
+
+PERCENTILES = [10, 25, 50, 75, 90]
+
+
+@dataclass
+class SemesterArrays:
+    enrollment_ids: np.ndarray   # sorted ids of the semester's enrollments
+    class_ids: np.ndarray        # class of each enrollment
+    course_ids: np.ndarray       # course of each enrollment
+    thresholds: np.ndarray       # absence threshold of each enrollment
+    enrollment_index: np.ndarray  # per record: position in enrollment_ids
+    day: np.ndarray              # per record: days since the semester started
+    present: np.ndarray          # per record: 1 if present, 0 if absent
+
+
+# Load a semester's attendance as compact arrays, streaming every record from
+# the storage backend in chunks. Records dated outside the semester are left out, so
+# day numbers are never negative.
+def load_semester_arrays(semester, chunk_size=50000):
+    enrollments = list(
+        Enrollment.objects.filter(enrolled_class__semester=semester)
+        .order_by('id')
+        .values_list('id', 'enrolled_class_id', 'enrolled_class__course_id',
+                     'enrolled_class__course__absence_threshold')
+    )
+    default = semester.absence_threshold
+    if default is None:
+        default = default_absence_threshold()
+    enrollment_ids = np.array([row[0] for row in enrollments], dtype=np.int64)
+
+    rows = get_storage().attendance_rows(
+        ['enrollment_id', 'date', 'status'],
+        {'semester': semester, 'date_from': semester.start_date, 'date_to': semester.end_date},
+        chunk_size,
+    )
+    start = np.datetime64(semester.start_date, 'D')
+    ids, days, present = [], [], []
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            _append_chunk(chunk, start, ids, days, present)
+    _append_chunk(chunk, start, ids, days, present)
+
+    record_ids = np.concatenate(ids) if ids else np.empty(0, dtype=np.int64)
+    return SemesterArrays(
+        enrollment_ids=enrollment_ids,
+        class_ids=np.array([row[1] for row in enrollments], dtype=np.int64),
+        course_ids=np.array([row[2] for row in enrollments], dtype=np.int64),
+        thresholds=np.array([default if row[3] is None else row[3] for row in enrollments], dtype=np.float64),
+        enrollment_index=np.searchsorted(enrollment_ids, record_ids),
+        day=np.concatenate(days) if days else np.empty(0, dtype=np.int32),
+        present=np.concatenate(present) if present else np.empty(0, dtype=np.int8),
+    )
+
+
+def _append_chunk(chunk, start, ids, days, present):
+    if not chunk:
+        return
+    chunk_ids, chunk_dates, chunk_statuses = zip(*chunk)
+    ids.append(np.array(chunk_ids, dtype=np.int64))
+    days.append((np.array(chunk_dates, dtype='datetime64[D]') - start).astype(np.int32))
+    present.append(np.array([status == 'Present' for status in chunk_statuses], dtype=np.int8))
+    chunk.clear()
+
+
+# Attendance statistics per group (course or class) with vectorized
+# operations. group_of_enrollment maps every enrollment to a group number in
+# [0, group_count). Rates are fractions between 0 and 1.
+def group_statistics(arrays, group_of_enrollment, group_count):
+    enrollment_count = len(arrays.enrollment_ids)
+    totals = np.bincount(arrays.enrollment_index, minlength=enrollment_count)
+    presents = np.bincount(arrays.enrollment_index, weights=arrays.present, minlength=enrollment_count)
+    recorded = totals > 0
+    rates = np.divide(presents, totals, out=np.full(enrollment_count, np.nan), where=recorded)
+    at_risk = recorded & (1 - np.nan_to_num(rates, nan=1) > arrays.thresholds)
+
+    stats = {
+        'enrollment_count': np.bincount(group_of_enrollment, minlength=group_count),
+        'record_count': np.bincount(group_of_enrollment, weights=totals, minlength=group_count).astype(np.int64),
+        'at_risk_count': np.bincount(group_of_enrollment, weights=at_risk, minlength=group_count).astype(np.int64),
+    }
+    rated = np.bincount(group_of_enrollment, weights=recorded, minlength=group_count)
+    rate_sum = np.bincount(group_of_enrollment[recorded], weights=rates[recorded], minlength=group_count)
+    stats['mean_rate'] = np.divide(rate_sum, rated, out=np.full(group_count, np.nan), where=rated > 0)
+
+    # Percentiles: sort enrollments by (group, rate) once and take each
+    # group's slice.
+    order = np.lexsort((rates[recorded], group_of_enrollment[recorded]))
+    sorted_groups = group_of_enrollment[recorded][order]
+    sorted_rates = rates[recorded][order]
+    bounds = np.searchsorted(sorted_groups, np.arange(group_count + 1))
+    percentiles = np.full((group_count, len(PERCENTILES)), np.nan)
+    for group in np.flatnonzero(bounds[1:] > bounds[:-1]):
+        percentiles[group] = np.percentile(sorted_rates[bounds[group]:bounds[group + 1]], PERCENTILES)
+    stats['percentiles'] = percentiles
+
+    # Weekly attendance rate per group, as a (group, week) matrix.
+    week = arrays.day // 7
+    week_count = int(week.max()) + 1 if len(week) else 0
+    cell = group_of_enrollment[arrays.enrollment_index] * week_count + week
+    weekly_totals = np.bincount(cell, minlength=group_count * week_count)
+    weekly_presents = np.bincount(cell, weights=arrays.present, minlength=group_count * week_count)
+    stats['weekly_rates'] = np.divide(
+        weekly_presents, weekly_totals, out=np.full(group_count * week_count, np.nan), where=weekly_totals > 0,
+    ).reshape(group_count, week_count)
+    return stats
+
+
+def _nullable(value):
+    return None if np.isnan(value) else round(float(value), 4)
+
+
+def build_snapshots(semester, arrays, scope):
+    keys = arrays.course_ids if scope == AttendanceSnapshot.COURSE else arrays.class_ids
+    group_keys, group_of_enrollment = np.unique(keys, return_inverse=True)
+    stats = group_statistics(arrays, group_of_enrollment, len(group_keys))
+    course_of_group = dict(zip(keys.tolist(), arrays.course_ids.tolist()))
+
+    snapshots = []
+    for group, key in enumerate(group_keys.tolist()):
+        p10, p25, median, p75, p90 = (_nullable(value) for value in stats['percentiles'][group])
+        snapshots.append(AttendanceSnapshot(
+            semester=semester,
+            scope=scope,
+            course_id=int(course_of_group[key]),
+            class_info_id=key if scope == AttendanceSnapshot.CLASS else None,
+            enrollment_count=int(stats['enrollment_count'][group]),
+            record_count=int(stats['record_count'][group]),
+            mean_rate=_nullable(stats['mean_rate'][group]),
+            p10_rate=p10,
+            p25_rate=p25,
+            median_rate=median,
+            p75_rate=p75,
+            p90_rate=p90,
+            at_risk_count=int(stats['at_risk_count'][group]),
+            weekly_rates=[_nullable(rate) for rate in stats['weekly_rates'][group]],
+        ))
+    return snapshots
+
+
+# Recompute and replace a semester's course and class snapshots.
+def compute_semester_snapshots(semester):
+    arrays = load_semester_arrays(semester)
+    snapshots = []
+    if len(arrays.enrollment_ids):
+        snapshots = (build_snapshots(semester, arrays, AttendanceSnapshot.COURSE)
+                     + build_snapshots(semester, arrays, AttendanceSnapshot.CLASS))
+    with transaction.atomic():
+        AttendanceSnapshot.objects.filter(semester=semester).delete()
+        AttendanceSnapshot.objects.bulk_create(snapshots)
+    return snapshots
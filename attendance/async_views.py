@@ -0,0 +1,130 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.http import Http404
+from django.shortcuts import redirect, render
+from django.utils import timezone
+
+from .forms import AttendanceFilterForm, CollegeDayChoiceForm
+from .models import Class, Enrollment, Student
+from .outbox import aqueue_emails
+from .roles import aget_roles
+from .services import poor_attendance_emails
+from .storage import get_storage
+from .summaries import student_standings
+from .views import (
+    POOR_ATTENDANCE_EMAIL, attendance_page_size, history_cursor, history_page, lecturer_classes,
+)
+
+# Native async versions of the busiest views, routed instead of the ones in
+# views.py when ATTENDANCE_ASYNC_VIEWS is set (the default under asgi.py).
+# They behave the same; queries go through the async ORM, and only form
+# validation, template rendering of model choice fields and the locked
+# attendance write run in a worker thread.
+
+
+# The authenticated user, also set on request.user so templates and the auth
+# context processor do not load it again synchronously.
+async def request_user(request):
+    request.user = await request.auser()
+    return request.user
+
+
+# Home view
+@login_required
+async def home(request):
+    # Resolve request.roles here, so the template does not query.
+    await aget_roles(request)
+    await request_user(request)
+    return render(request, 'attendance/home.html')
+
+
+# Email Students with Poor Attendance
+@login_required(login_url='admin_login')
+async def email_students_with_poor_attendance(request):
+    await aqueue_emails(poor_attendance_emails(), *POOR_ATTENDANCE_EMAIL)
+
+    return redirect('student_list')
+
+
+# Lecturer Enter Attendance, as views.enter_attendance.
+@login_required(login_url='lecturer_login')
+async def enter_attendance(request, class_id):
+    user = await request_user(request)
+    try:
+        class_obj = await lecturer_classes(user).aget(pk=class_id)
+    except Class.DoesNotExist:
+        raise Http404('No Class matches the given query.')
+    enrolled_students = [
+        enrollment async for enrollment in
+        Enrollment.objects.filter(enrolled_class=class_obj).select_related('student').aiterator()
+    ]
+    today = timezone.localdate()
+    session_form = CollegeDayChoiceForm(request.POST or None, class_obj=class_obj)
+    sessions = session_form.fields['college_day'].queryset
+    has_sessions = await sessions.aexists()
+    error = None
+
+    if request.method == 'POST' and (not has_sessions or await sync_to_async(session_form.is_valid)()):
+        date = session_form.cleaned_data['college_day'].date if has_sessions else today
+        statuses = {
+            enrollment.pk: request.POST.get(f'attendance_{enrollment.pk}')
+            for enrollment in enrolled_students
+        }
+        try:
+            await get_storage().arecord(class_obj, date, statuses)
+        except ValueError as exc:
+            error = str(exc)
+        else:
+            return redirect('lecturer_dashboard')
+
+    if not session_form.is_bound and has_sessions:
+        session_form.initial['college_day'] = (
+            await sessions.filter(date__lte=today).order_by('-date').afirst() or await sessions.afirst()
+        )
+
+    return await sync_to_async(render)(request, 'attendance/enter_attendance.html', {
+        'class': class_obj,
+        'enrolled_students': enrolled_students,
+        'session_form': session_form if has_sessions else None,
+        'error': error,
+    })
+
+
+# Student View Attendance, as views.student_view_attendance.
+@login_required(login_url='student_login')
+async def student_view_attendance(request):
+    user = await request_user(request)
+    try:
+        student = await Student.objects.only('id').aget(user=user)
+    except Student.DoesNotExist:
+        raise Http404('No Student matches the given query.')
+    form = AttendanceFilterForm(request.GET or None, student=student)
+    valid = form.is_bound and await sync_to_async(form.is_valid)()
+    filters = form.cleaned_data if valid else {}
+    if not any(filters.values()):
+        semesters = form.fields['semester'].queryset
+        filters = {'semester': (
+            await semesters.filter(start_date__lte=timezone.localdate()).afirst() or await semesters.afirst()
+        )}
+        if not form.is_bound:
+            form = AttendanceFilterForm(initial=filters, student=student)
+
+    storage = get_storage()
+
+    page_size = attendance_page_size()
+    rows = await storage.astudent_history(student, filters, before=history_cursor(request), limit=page_size + 1)
+    page_obj = history_page(rows, page_size)
+
+    date_range = bool(filters.get('date_from') or filters.get('date_to'))
+    if date_range:
+        summaries = await storage.astudent_totals(student, filters)
+    else:
+        summaries = [summary async for summary in student_standings(student, filters)]
+
+    return await sync_to_async(render)(request, 'attendance/student_attendance.html', {
+        'form': form,
+        'summaries': summaries,
+        'date_range': date_range,
+        'attendance_records': page_obj.object_list,
+        'page_obj': page_obj,
+    })
@@ -0,0 +1,113 @@
+import io
+import sys
+import time
+from datetime import date
+from statistics import median
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from .models import Semester, Course, Lecturer, Class, Student, Enrollment
+
+
+# Shared helpers for the bench_* management commands. Everything a benchmark
+# creates is expected to run inside a transaction that is rolled back.
+def timed(func, repeat=1):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return median(timings), result
+
+
+def count_queries(func):
+    with CaptureQueriesContext(connection) as context:
+        func()
+    return len(context.captured_queries)
+
+
+# Grow the data set through each size in turn with grow(size) and count the
+# queries func() issues at every step. Raises AssertionError when the count
+# changes, which is what an N+1 pattern looks like.
+def assert_constant_queries(func, grow, sizes=(10, 10000)):
+    counts = {}
+    for size in sizes:
+        grow(size)
+        counts[size] = count_queries(func)
+    if len(set(counts.values())) > 1:
+        raise AssertionError(f'Query count grows with row count: {counts}')
+    return counts
+
+
+def make_class(prefix='bench'):
+    semester = Semester.objects.create(year=2024, name=f'{prefix} semester',
+                                       start_date=date(2024, 2, 26), end_date=date(2024, 6, 21))
+    course = Course.objects.create(code=f'{prefix.upper()}101', name=f'{prefix} course')
+    course.semesters.add(semester)
+    lecturer = Lecturer.objects.create(
+        staff_id=abs(hash(prefix)) % 10 ** 9,
+        user=User.objects.create(username=f'{prefix}-lecturer'),
+        full_name=f'{prefix} lecturer',
+    )
+    return Class.objects.create(number=1, course=course, semester=semester, lecturer=lecturer)
+
+
+def make_students(count, prefix='bench', start=0):
+    usernames = [f'{prefix}-student-{i}' for i in range(start, start + count)]
+    users = User.objects.bulk_create([User(username=username) for username in usernames])
+    if users and users[0].pk is None:
+        users = list(User.objects.filter(username__in=usernames).order_by('id'))
+    students = Student.objects.bulk_create([
+        Student(student_id=f'{prefix[:2]}{i:08d}', user=user, full_name=f'Student {i}')
+        for i, user in enumerate(users, start=start)
+    ])
+    if students and students[0].pk is None:
+        students = list(Student.objects.filter(user__in=users).order_by('id'))
+    return students
+
+
+def make_roster(count, prefix='bench'):
+    class_obj = make_class(prefix)
+    students = make_students(count, prefix)
+    Enrollment.objects.bulk_create(
+        [Enrollment(student=student, enrolled_class=class_obj) for student in students]
+    )
+    return class_obj
+
+
+# A new superuser and the key of a logged-in session for it, for requests
+# made without the test client.
+def login_session(username):
+    user = User.objects.create_superuser(username)
+    client = Client()
+    client.force_login(user)
+    return user, client.cookies[settings.SESSION_COOKIE_NAME].value
+
+
+# GET path through a WSGI handler the way a WSGI server would, reading and
+# closing the response so request_finished fires. Returns the status line.
+def wsgi_get(handler, path, session_key):
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'HTTP_HOST': 'localhost',
+        'HTTP_COOKIE': f'{settings.SESSION_COOKIE_NAME}={session_key}',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.url_scheme': 'http',
+        'wsgi.errors': sys.stderr,
+    }
+    response = {}
+    body = handler(environ, lambda status, headers: response.setdefault('status', status))
+    try:
+        for _ in body:
+            pass
+    finally:
+        body.close()
+    return response['status']
@@ -0,0 +1,77 @@
+from django.conf import settings
+
+TABLE = 'table'
+BITMAP = 'bitmap'
+
+# Two bits per day, four days per byte with the first day in the low bits.
+UNRECORDED, PRESENT, ABSENT = 0, 1, 2
+STATUS_CODES = {'Present': PRESENT, 'Absent': ABSENT}
+CODE_STATUSES = {PRESENT: 'Present', ABSENT: 'Absent'}
+
+# For every possible byte: the (slot, status) pairs it holds and its
+# (present, absent) counts, so decoding never looks at single bits.
+_BYTE_DAYS = [
+    tuple((slot, CODE_STATUSES[byte >> slot * 2 & 3]) for slot in range(4) if byte >> slot * 2 & 3 in CODE_STATUSES)
+    for byte in range(256)
+]
+_BYTE_COUNTS = [
+    (sum(status == 'Present' for _, status in days), sum(status == 'Absent' for _, status in days))
+    for days in _BYTE_DAYS
+]
+
+
+# Where attendance is read from and written to: 'table' (one Attendance row
+# per student per day) or 'bitmap' (one AttendanceBitmap per enrollment).
+def attendance_storage():
+    return getattr(settings, 'ATTENDANCE_STORAGE', TABLE)
+
+
+def day_index(start_date, date):
+    index = (date - start_date).days
+    if index < 0:
+        raise ValueError(f'{date} is before the semester starts on {start_date}')
+    return index
+
+
+def get_day(days, index):
+    byte, slot = divmod(index, 4)
+    if byte >= len(days):
+        return None
+    return CODE_STATUSES.get(days[byte] >> slot * 2 & 3)
+
+
+def set_day(days, index, status):
+    days = bytearray(days)
+    byte, slot = divmod(index, 4)
+    if byte >= len(days):
+        days.extend(bytes(byte + 1 - len(days)))
+    days[byte] = days[byte] & ~(3 << slot * 2) | STATUS_CODES.get(status, UNRECORDED) << slot * 2
+    return bytes(days)
+
+
+# {day index: status} to bitmap bytes, and back.
+def encode_days(statuses):
+    days = bytearray(max(statuses) // 4 + 1 if statuses else 0)
+    for index, status in statuses.items():
+        byte, slot = divmod(index, 4)
+        days[byte] |= STATUS_CODES.get(status, UNRECORDED) << slot * 2
+    return bytes(days)
+
+
+def decode_days(days):
+    for byte_index, byte in enumerate(days):
+        for slot, status in _BYTE_DAYS[byte]:
+            yield byte_index * 4 + slot, status
+
+
+# (present, absent, last recorded day index or None) for a bitmap.
+def count_days(days):
+    present = absent = 0
+    last = None
+    for byte_index, byte in enumerate(days):
+        byte_present, byte_absent = _BYTE_COUNTS[byte]
+        present += byte_present
+        absent += byte_absent
+        if _BYTE_DAYS[byte]:
+            last = byte_index * 4 + _BYTE_DAYS[byte][-1][0]
+    return present, absent, last
@@ -0,0 +1,120 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import QueryDict
+from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+# Cached fragments and query results, so the stats endpoint can list them.
+CACHE_NAMES = ('semester_list', 'course_list', 'lecturer_list', 'semesters')
+
+
+def cache_timeout():
+    return getattr(settings, 'ATTENDANCE_CACHE_TIMEOUT', 600)
+
+
+def version_key(model):
+    return f'attendance:version:{model._meta.model_name}'
+
+
+def stats_key(name, outcome):
+    return f'attendance:stats:{name}:{outcome}'
+
+
+# Every cached value is keyed by the current version of each model it was
+# built from. Bumping a model's version orphans exactly the entries that
+# depend on it; they expire on their own. A version that was evicted restarts
+# from the clock rather than from zero, so old entries are never reused.
+def versioned_key(name, models, *parts):
+    keys = [version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    stamp = '.'.join(str(versions[key]) for key in keys)
+    digest = hashlib.md5(':'.join(map(str, parts)).encode()).hexdigest()
+    return f'attendance:{name}:{stamp}:{digest}'
+
+
+def bump_versions(*models):
+    for model in models:
+        key = version_key(model)
+        if not cache.add(key, time.time_ns(), timeout=None):
+            try:
+                cache.incr(key)
+            except ValueError:
+                # Evicted between add and incr.
+                cache.set(key, time.time_ns(), timeout=None)
+
+
+# Bump once the current transaction commits, so no other request can cache
+# data from before the change under the new version.
+def invalidate(*models):
+    transaction.on_commit(lambda: bump_versions(*models))
+
+
+def record_outcome(name, outcome):
+    key = stats_key(name, outcome)
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def cached(name, models, build, *parts):
+    key = versioned_key(name, models, *parts)
+    value = cache.get(key)
+    if value is None:
+        record_outcome(name, 'misses')
+        value = build()
+        cache.set(key, value, cache_timeout())
+    else:
+        record_outcome(name, 'hits')
+    return value
+
+
+# Query results as a list, cached until one of the models changes.
+def cached_queryset(name, models, queryset, *parts):
+    return cached(name, models, lambda: list(queryset), *parts)
+
+
+def cache_stats():
+    keys = [stats_key(name, outcome) for name in CACHE_NAMES for outcome in ('hits', 'misses')]
+    values = cache.get_many(keys)
+    return {
+        name: {outcome: values.get(stats_key(name, outcome), 0) for outcome in ('hits', 'misses')}
+        for name in CACHE_NAMES
+    }
+
+
+# Serve a ListView's rendered list from the cache. The page template gets the
+# cached HTML as {{ fragment }}; fragment_template_name renders it from the
+# usual ListView context. Entries are keyed by the path, the page size and
+# the keyset cursor, so every page is cached separately. Other query
+# parameters are dropped, so they can neither add entries nor end up in the
+# cached pagination links.
+class CachedFragmentMixin:
+    cache_name = None
+    cache_models = ()
+    fragment_template_name = None
+    cache_parameters = ('before', 'after')
+
+    def get(self, request, *args, **kwargs):
+        query = QueryDict(mutable=True)
+        for name in self.cache_parameters:
+            if name in request.GET:
+                query[name] = request.GET[name]
+        request.GET = query
+        fragment = cached(self.cache_name, self.cache_models, self.render_fragment,
+                          request.path, self.get_paginate_by(None), query.urlencode())
+        return render(request, self.template_name, {'view': self, 'fragment': mark_safe(fragment)})
+
+    def render_fragment(self):
+        self.object_list = self.get_queryset()
+        return render_to_string(self.fragment_template_name, self.get_context_data(), self.request)
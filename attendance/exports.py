@@ -0,0 +1,72 @@
+import csv
+import io
+import tempfile
+
+from .storage import get_storage
+
+# Output column name and the lookup it is read from.
+EXPORT_COLUMNS = [
+    ('date', 'date'),
+    ('status', 'status'),
+    ('student_id', 'enrollment__student__student_id'),
+    ('student_name', 'enrollment__student__full_name'),
+    ('course_code', 'enrollment__enrolled_class__course__code'),
+    ('course_name', 'enrollment__enrolled_class__course__name'),
+    ('class_number', 'enrollment__enrolled_class__number'),
+    ('semester_year', 'enrollment__enrolled_class__semester__year'),
+    ('semester', 'enrollment__enrolled_class__semester__name'),
+]
+
+
+# Rows of the EXPORT_COLUMNS, streamed from the configured storage backend.
+def export_rows(semester=None, course=None, chunk_size=2000):
+    return get_storage().attendance_rows(
+        [lookup for _, lookup in EXPORT_COLUMNS], {'semester': semester, 'course': course}, chunk_size,
+    )
+
+
+# CSV text in blocks of rows, for StreamingHttpResponse.
+def iter_csv(rows, rows_per_block=1000):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in EXPORT_COLUMNS])
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % rows_per_block == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+# Write the rows to a temporary Parquet file one row group per chunk, so
+# memory stays bounded by chunk_size. Needs pandas and pyarrow.
+def write_parquet(rows, chunk_size=50000):
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    columns = [name for name, _ in EXPORT_COLUMNS]
+    output = tempfile.TemporaryFile()
+    writer = None
+    chunk = []
+
+    def flush():
+        nonlocal writer
+        frame = pd.DataFrame.from_records(chunk, columns=columns)
+        frame['date'] = pd.to_datetime(frame['date']).dt.date
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(output, table.schema)
+        writer.write_table(table)
+        chunk.clear()
+
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            flush()
+    if chunk or writer is None:
+        flush()
+    writer.close()
+    output.seek(0)
+    return output
@@ -0,0 +1,197 @@
+import re
+from itertools import islice
+
+from django import forms
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.urls import reverse
+from django.utils.formats import date_format
+
+from .importers import iter_student_rows
+from .models import Class, CollegeDay, Course, Enrollment, Semester, Student
+
+# Unknown student_ids listed in a bulk enrollment error.
+MAX_LISTED_IDS = 10
+
+
+def student_label(student):
+    return f'{student.full_name} ({student.student_id})'
+
+
+def class_label(class_obj):
+    return f'{class_obj.course.name} class {class_obj.number}, {class_obj.semester}'
+
+
+# A search box that looks choices up from a JSON endpoint as the user types,
+# instead of rendering every row as an <option>. The chosen pk is posted from
+# a hidden input, so it works with ModelChoiceField as is.
+class AutocompleteInput(forms.TextInput):
+    template_name = 'attendance/widgets/autocomplete.html'
+
+    class Media:
+        js = ['attendance/js/autocomplete.js']
+
+    def __init__(self, url_name, attrs=None):
+        super().__init__(attrs)
+        self.url_name = url_name
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['url'] = reverse(self.url_name)
+        context['widget']['label'] = self.label_for(value)
+        return context
+
+    # Only the selected object is loaded, to show its label again when a
+    # form is redisplayed.
+    def label_for(self, value):
+        choices = getattr(self, 'choices', None)
+        if value in (None, '') or choices is None:
+            return ''
+        try:
+            return choices.field.label_from_instance(choices.queryset.get(pk=value))
+        except (ObjectDoesNotExist, ValidationError, ValueError, TypeError):
+            return ''
+
+
+class StudentChoiceField(forms.ModelChoiceField):
+    widget = AutocompleteInput('student_autocomplete')
+
+    def __init__(self, **kwargs):
+        super().__init__(queryset=Student.objects.only('student_id', 'full_name'), **kwargs)
+
+    def label_from_instance(self, obj):
+        return student_label(obj)
+
+
+class ClassChoiceField(forms.ModelChoiceField):
+    widget = AutocompleteInput('class_autocomplete')
+
+    def __init__(self, **kwargs):
+        super().__init__(queryset=Class.objects.select_related('course', 'semester'), **kwargs)
+
+    def label_from_instance(self, obj):
+        return class_label(obj)
+
+
+class AttendanceFilterForm(forms.Form):
+    semester = forms.ModelChoiceField(queryset=Semester.objects.none(), required=False)
+    course = forms.ModelChoiceField(queryset=Course.objects.none(), required=False)
+    date_from = forms.DateField(required=False, widget=forms.DateInput(attrs={'type': 'date'}))
+    date_to = forms.DateField(required=False, widget=forms.DateInput(attrs={'type': 'date'}))
+
+    # Only offer the semesters and courses the student is enrolled in.
+    def __init__(self, *args, student, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['semester'].queryset = (
+            Semester.objects.filter(class__enrollment__student=student).distinct().order_by('-start_date')
+        )
+        self.fields['course'].queryset = (
+            Course.objects.filter(class__enrollment__student=student).distinct().order_by('name')
+        )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        date_from, date_to = cleaned_data.get('date_from'), cleaned_data.get('date_to')
+        if date_from and date_to and date_from > date_to:
+            raise forms.ValidationError('The start date must be before the end date.')
+        return cleaned_data
+
+
+class CollegeDayGenerationForm(forms.Form):
+    weekdays = forms.TypedMultipleChoiceField(
+        choices=list(enumerate(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'])),
+        coerce=int,
+        widget=forms.CheckboxSelectMultiple,
+        help_text='Days of the week the class meets.',
+    )
+
+
+# Picks the session of a class that attendance is being entered for.
+class CollegeDayChoiceForm(forms.Form):
+    college_day = forms.ModelChoiceField(queryset=CollegeDay.objects.none(), label='Session')
+
+    def __init__(self, *args, class_obj, **kwargs):
+        super().__init__(*args, **kwargs)
+        field = self.fields['college_day']
+        field.queryset = CollegeDay.objects.filter(class_info=class_obj).only('date').order_by('date')
+        field.label_from_instance = lambda college_day: date_format(college_day.date, 'D j M Y')
+
+
+class AttendanceExportForm(forms.Form):
+    FORMAT_CHOICES = [('csv', 'CSV'), ('parquet', 'Parquet')]
+
+    semester = forms.ModelChoiceField(queryset=Semester.objects.order_by('-start_date'), required=False)
+    course = forms.ModelChoiceField(queryset=Course.objects.order_by('name'), required=False)
+    format = forms.ChoiceField(choices=FORMAT_CHOICES, initial='csv')
+
+
+class EnrollmentForm(forms.ModelForm):
+    student = StudentChoiceField()
+    enrolled_class = ClassChoiceField()
+
+    class Meta:
+        model = Enrollment
+        fields = ['student', 'enrolled_class']
+
+
+# Enrolls a cohort in a class. The cohort is the union of pasted student_ids,
+# the student_id column of an uploaded CSV or Excel file, and the students of
+# another class; cleaned_data['students'] holds their Student pks.
+class BulkEnrollmentForm(forms.Form):
+    enrolled_class = ClassChoiceField(label='Class')
+    student_ids = forms.CharField(
+        required=False,
+        widget=forms.Textarea(attrs={'rows': 6}),
+        help_text='Student IDs separated by spaces, commas or new lines.',
+    )
+    file = forms.FileField(required=False, help_text='A CSV or Excel file with a student_id column.')
+    source_class = ClassChoiceField(required=False, label='Students of class')
+
+    def clean_file(self):
+        upload = self.cleaned_data['file']
+        if upload is None:
+            return []
+        if not upload.name.lower().endswith(('.csv', '.xlsx')):
+            raise ValidationError('Upload a .csv or .xlsx file.')
+        student_ids = []
+        try:
+            for _, row in iter_student_rows(upload, upload.name):
+                value = row.get('student_id')
+                if isinstance(value, float) and value.is_integer():
+                    value = int(value)
+                if value not in (None, ''):
+                    student_ids.append(str(value).strip())
+        except Exception as exc:
+            raise ValidationError(f'Could not read {upload.name}: {exc}')
+        return student_ids
+
+    def clean(self):
+        cleaned_data = super().clean()
+        student_ids = set(re.split(r'[\s,;]+', cleaned_data.get('student_ids', '').strip())) - {''}
+        student_ids.update(cleaned_data.get('file') or [])
+        source_class = cleaned_data.get('source_class')
+        if not student_ids and source_class is None:
+            if not self.errors:
+                raise ValidationError('Give student IDs, a file or a class to enroll students from.')
+            return cleaned_data
+
+        students = self.resolve_student_ids(student_ids)
+        unknown = sorted(student_ids - students.keys())
+        if unknown:
+            listed = ', '.join(unknown[:MAX_LISTED_IDS])
+            more = f' and {len(unknown) - MAX_LISTED_IDS} more' if len(unknown) > MAX_LISTED_IDS else ''
+            raise ValidationError(f'Unknown student IDs: {listed}{more}.')
+
+        pks = set(students.values())
+        if source_class is not None:
+            pks.update(Enrollment.objects.filter(enrolled_class=source_class).values_list('student_id', flat=True))
+        cleaned_data['students'] = pks
+        return cleaned_data
+
+    # {student_id: pk} for the known student_ids, looked up in chunks.
+    @staticmethod
+    def resolve_student_ids(student_ids, chunk_size=1000):
+        student_ids = iter(student_ids)
+        students = {}
+        while chunk := list(islice(student_ids, chunk_size)):
+            students.update(Student.objects.filter(student_id__in=chunk).values_list('student_id', 'pk'))
+        return students
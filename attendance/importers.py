@@ -0,0 +1,201 @@
+import csv
+import io
+from dataclasses import dataclass, field
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from .accounts import provision_users
+from .caching import invalidate
+from .models import Student, StudentImportJob
+
+STUDENT_COLUMNS = ('student_id', 'full_name', 'username')
+
+# Only the first errors of a job are kept for its report.
+MAX_JOB_ERRORS = 1000
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    updated: int = 0
+    skipped: int = 0
+    errors: list = field(default_factory=list)
+
+    @property
+    def processed(self):
+        return self.created + self.updated + self.skipped + len(self.errors)
+
+
+# Yield (row_number, row dict) pairs without loading the whole file. CSV files
+# are read line by line and workbooks through openpyxl's read-only mode.
+def iter_student_rows(file, filename):
+    if filename.lower().endswith('.csv'):
+        text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+        try:
+            for row_number, row in enumerate(csv.DictReader(text), start=2):
+                yield row_number, row
+        finally:
+            # Leave the underlying upload open for the caller.
+            text.detach()
+        return
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else '' for cell in next(rows, ())]
+        for row_number, values in enumerate(rows, start=2):
+            if any(value is not None for value in values):
+                yield row_number, dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def clean_student_row(row):
+    values = {}
+    for column in STUDENT_COLUMNS:
+        value = row.get(column)
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        values[column] = '' if value is None else str(value).strip()
+
+    missing = [column for column in STUDENT_COLUMNS if not values[column]]
+    if missing:
+        raise ValueError(f"Missing {', '.join(missing)}")
+    if len(values['student_id']) > Student._meta.get_field('student_id').max_length:
+        raise ValueError('student_id is too long')
+    if len(values['full_name']) > Student._meta.get_field('full_name').max_length:
+        raise ValueError('full_name is too long')
+    if len(values['username']) > User._meta.get_field('username').max_length:
+        raise ValueError('username is too long')
+    return values
+
+
+# Import students chunk by chunk. Each chunk is validated, then its Users and
+# Students are bulk-created in one transaction. Users get an unusable
+# password from provision_users, to be set through password_setup_links.
+# Existing student_ids are skipped, or have their full name updated when
+# update_existing is set. Rows repeating a student_id seen earlier in the
+# file are errors, whichever chunk the earlier row was in. progress, if
+# given, is called with the running result after every chunk.
+def import_students(file, filename, chunk_size=1000, update_existing=False, progress=None):
+    result = ImportResult()
+    existing_students = dict(Student.objects.values_list('student_id', 'id'))
+    taken_usernames = set(User.objects.values_list('username', flat=True))
+    seen_student_ids = set()
+
+    rows = iter_student_rows(file, filename)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+
+        new_rows = []
+        updates = []
+        for row_number, row in chunk:
+            try:
+                values = clean_student_row(row)
+            except ValueError as exc:
+                result.errors.append((row_number, str(exc)))
+                continue
+
+            if values['student_id'] in seen_student_ids:
+                result.errors.append((row_number, f"Student ID {values['student_id']} appears more than once"))
+                continue
+            seen_student_ids.add(values['student_id'])
+
+            if values['student_id'] in existing_students:
+                if update_existing:
+                    updates.append(Student(id=existing_students[values['student_id']], full_name=values['full_name']))
+                else:
+                    result.skipped += 1
+            elif values['username'] in taken_usernames:
+                result.errors.append((row_number, f"Username {values['username']} is already taken"))
+            else:
+                taken_usernames.add(values['username'])
+                new_rows.append(values)
+
+        with transaction.atomic():
+            users = provision_users([{'username': values['username']} for values in new_rows], batch_size=chunk_size)
+            students = Student.objects.bulk_create([
+                Student(student_id=values['student_id'], full_name=values['full_name'], user=user)
+                for values, user in zip(new_rows, users)
+            ])
+            Student.objects.bulk_update(updates, ['full_name'])
+            # Bulk writes skip the model signals that invalidate cached data.
+            if students or updates:
+                invalidate(Student)
+
+        result.created += len(students)
+        result.updated += len(updates)
+
+        if progress is not None:
+            progress(result)
+
+    return result
+
+
+def import_job_timeout():
+    return getattr(settings, 'IMPORT_JOB_TIMEOUT', 3600)
+
+
+# Mark jobs that have been running for longer than timeout seconds as failed;
+# their worker died before finishing them. Students imported until then stay,
+# so the file can simply be uploaded again. Returns the number of jobs.
+def fail_stale_import_jobs(timeout=None):
+    timeout = import_job_timeout() if timeout is None else timeout
+    now = timezone.now()
+    return StudentImportJob.objects.filter(
+        status=StudentImportJob.RUNNING, started_at__lt=now - timedelta(seconds=timeout)
+    ).update(
+        status=StudentImportJob.FAILED,
+        finished_at=now,
+        errors=[[None, f'The import did not finish within {timeout} seconds; its worker stopped.']],
+    )
+
+
+def claim_next_import_job():
+    with transaction.atomic():
+        job = (
+            StudentImportJob.objects.select_for_update(skip_locked=True)
+            .filter(status=StudentImportJob.QUEUED)
+            .order_by('created_at')
+            .first()
+        )
+        if job is not None:
+            job.status = StudentImportJob.RUNNING
+            job.started_at = timezone.now()
+            job.save(update_fields=['status', 'started_at'])
+    return job
+
+
+def run_import_job(job, chunk_size=1000):
+    def progress(result):
+        StudentImportJob.objects.filter(pk=job.pk).update(
+            rows_processed=result.processed,
+            rows_failed=len(result.errors),
+            created_count=result.created,
+            updated_count=result.updated,
+            skipped_count=result.skipped,
+        )
+
+    try:
+        with job.file.open('rb') as file:
+            result = import_students(file, job.original_name, chunk_size, job.update_existing, progress)
+    except Exception as exc:
+        job.refresh_from_db()
+        job.status = StudentImportJob.FAILED
+        job.errors = [[None, str(exc)]]
+    else:
+        job.refresh_from_db()
+        job.status = StudentImportJob.DONE
+        job.errors = [list(error) for error in result.errors[:MAX_JOB_ERRORS]]
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'errors', 'finished_at'])
+    return job
@@ -0,0 +1,166 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Template
+
+logger = logging.getLogger('attendance.slow_requests')
+
+METRICS = ('wall_ms', 'sql_ms', 'queries', 'template_ms')
+PERCENTILES = (50, 95, 99)
+
+_current = ContextVar('attendance_request_record', default=None)
+_lock = threading.Lock()
+_samples = defaultdict(lambda: deque(maxlen=instrumentation_window()))
+_duplicates = defaultdict(Counter)
+
+
+def instrumentation_enabled():
+    return getattr(settings, 'ATTENDANCE_INSTRUMENTATION', False)
+
+
+def instrumentation_window():
+    return getattr(settings, 'ATTENDANCE_INSTRUMENTATION_WINDOW', 1000)
+
+
+def slow_request_ms():
+    return getattr(settings, 'ATTENDANCE_SLOW_REQUEST_MS', None)
+
+
+# The statement with its IN lists collapsed, so the same query with different
+# parameters or list lengths has one fingerprint.
+def fingerprint(sql):
+    return re.sub(r'\((?:%s, )*%s\)', '(%s, ...)', sql)
+
+
+class RequestRecord:
+    def __init__(self):
+        self.queries = []
+        self.template_ms = 0.0
+        self.template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, (time.perf_counter() - start) * 1000))
+
+    def duplicates(self):
+        counts = Counter(fingerprint(sql) for sql, _ in self.queries)
+        return {sql: count for sql, count in counts.items() if count > 1}
+
+
+# Top-level template renders are timed through the request's record; included
+# templates are part of their parent's time.
+_template_render = Template.render
+
+
+def _timed_template_render(self, context):
+    record = _current.get()
+    if record is None:
+        return _template_render(self, context)
+    record.template_depth += 1
+    start = time.perf_counter()
+    try:
+        return _template_render(self, context)
+    finally:
+        record.template_depth -= 1
+        if not record.template_depth:
+            record.template_ms += (time.perf_counter() - start) * 1000
+
+
+def route_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return '<unresolved>'
+    return match.view_name or match.route
+
+
+# Linear interpolation between the closest ranks of sorted values.
+def percentile(values, p):
+    position = (len(values) - 1) * p / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def record_sample(route, sample, duplicates):
+    with _lock:
+        _samples[route].append(sample)
+        _duplicates[route].update(duplicates)
+
+
+# Rolling percentiles per route over the last ATTENDANCE_INSTRUMENTATION_WINDOW
+# requests, plus the queries most often repeated within one request.
+def instrumentation_report():
+    with _lock:
+        samples = {route: list(rows) for route, rows in _samples.items()}
+        duplicates = {route: counter.most_common(5) for route, counter in _duplicates.items()}
+
+    report = {}
+    for route, rows in sorted(samples.items()):
+        report[route] = {'requests': len(rows)}
+        for metric, values in zip(METRICS, zip(*rows)):
+            values = sorted(values)
+            report[route][metric] = {f'p{p}': round(percentile(values, p), 2) for p in PERCENTILES}
+        report[route]['duplicate_queries'] = [
+            {'sql': sql, 'repeats': count} for sql, count in duplicates.get(route, [])
+        ]
+    return report
+
+
+def reset_instrumentation():
+    with _lock:
+        _samples.clear()
+        _duplicates.clear()
+
+
+# Opt-in request instrumentation: query count, SQL time, duplicate queries,
+# template render time and wall time per URL name. Unless
+# ATTENDANCE_INSTRUMENTATION is set, Django drops the middleware at startup
+# and nothing is patched or wrapped.
+class InstrumentationMiddleware:
+    def __init__(self, get_response):
+        if not instrumentation_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        Template.render = _timed_template_render
+
+    def __call__(self, request):
+        record = RequestRecord()
+        token = _current.set(record)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(record))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        wall_ms = (time.perf_counter() - start) * 1000
+
+        route = route_name(request)
+        sql_ms = sum(duration for _, duration in record.queries)
+        duplicates = record.duplicates()
+        record_sample(route, (wall_ms, sql_ms, len(record.queries), record.template_ms), duplicates)
+
+        threshold = slow_request_ms()
+        if threshold is not None and wall_ms >= threshold:
+            self.log_slow_request(request, route, wall_ms, sql_ms, record)
+        return response
+
+    def log_slow_request(self, request, route, wall_ms, sql_ms, record):
+        slowest = sorted(record.queries, key=lambda query: query[1], reverse=True)[:10]
+        logger.warning(
+            'Slow request %s %s (%s): %.1f ms, %d queries in %.1f ms, templates %.1f ms\n%s',
+            request.method, request.path, route, wall_ms, len(record.queries), sql_ms, record.template_ms,
+            '\n'.join(f'  {duration:.1f} ms  {sql}' for sql, duration in slowest),
+        )
@@ -0,0 +1,74 @@
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from attendance.analytics import SemesterArrays, build_snapshots, load_semester_arrays
+from attendance.bench import make_roster
+from attendance.models import Attendance, AttendanceSnapshot, Enrollment
+
+
+class Command(BaseCommand):
+    help = ('Time the semester analytics. The statistics run on a synthetic semester of '
+            '--rows attendance records held in arrays; the database load runs on a '
+            'smaller roster created inside a transaction that is rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000000)
+        parser.add_argument('--classes', type=int, default=200)
+        parser.add_argument('--students', type=int, default=500)
+        parser.add_argument('--days', type=int, default=60)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            class_obj = make_roster(options['students'], prefix='analytics')
+            semester = class_obj.semester
+            semester.refresh_from_db()
+            enrollment_ids = list(Enrollment.objects.filter(enrolled_class=class_obj).values_list('id', flat=True))
+            for offset in range(options['days']):
+                day = semester.start_date + timedelta(days=offset)
+                Attendance.objects.bulk_create([
+                    Attendance(enrollment_id=enrollment_id, date=day,
+                               status='Absent' if (enrollment_id + offset) % 5 == 0 else 'Present')
+                    for enrollment_id in enrollment_ids
+                ])
+            rows = len(enrollment_ids) * options['days']
+
+            start = time.perf_counter()
+            load_semester_arrays(semester)
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f'load from database: {rows} rows in {elapsed:.2f} s ({rows / elapsed:,.0f} rows/s)')
+
+            arrays = self.synthetic_arrays(options['rows'], options['classes'])
+            for scope in (AttendanceSnapshot.COURSE, AttendanceSnapshot.CLASS):
+                start = time.perf_counter()
+                snapshots = build_snapshots(semester, arrays, scope)
+                elapsed = time.perf_counter() - start
+                self.stdout.write(
+                    f'{scope} statistics: {options["rows"]} rows, {len(snapshots)} groups in {elapsed:.2f} s'
+                )
+
+            transaction.set_rollback(True)
+
+    # A semester of 15 weeks where every enrollment has one record per weekday
+    # session and a personal attendance rate.
+    def synthetic_arrays(self, rows, classes):
+        rng = np.random.default_rng(0)
+        sessions = 75
+        enrollment_count = max(rows // sessions, 1)
+        class_ids = rng.integers(0, classes, enrollment_count)
+        enrollment_index = np.repeat(np.arange(enrollment_count), sessions)[:rows]
+        day = np.tile(np.arange(sessions) // 5 * 7 + np.arange(sessions) % 5, enrollment_count)[:rows]
+        rate = rng.beta(8, 2, enrollment_count)
+        present = (rng.random(len(enrollment_index)) < rate[enrollment_index]).astype(np.int8)
+        return SemesterArrays(
+            enrollment_ids=np.arange(enrollment_count, dtype=np.int64),
+            class_ids=class_ids,
+            course_ids=class_ids // 4,
+            thresholds=np.full(enrollment_count, 0.2),
+            enrollment_index=enrollment_index,
+            day=day.astype(np.int32),
+            present=present,
+        )
@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, Q
+
+from attendance.bench import make_roster, timed
+from attendance.bitmaps import count_days
+from attendance.models import Attendance, AttendanceBitmap, Enrollment
+from attendance.storage import BitmapStorage, TableStorage
+
+
+# Bytes used by a model's table and its indexes, where the database can say.
+def table_size(model):
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT pg_total_relation_size(%s)', [table])
+        elif connection.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT SUM(pgsize) FROM dbstat WHERE name = %s OR name IN "
+                "(SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = %s)",
+                [table, table],
+            )
+        else:
+            return None
+        return cursor.fetchone()[0] or 0
+
+
+class Command(BaseCommand):
+    help = ('Compare the Attendance table with bitmap storage: write time, size on disk and '
+            'read time for one class. All data is created inside a transaction that is rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=300)
+        parser.add_argument('--days', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            class_obj = make_roster(options['students'], prefix='storage')
+            class_obj.refresh_from_db()
+            enrollment_ids = list(Enrollment.objects.filter(enrolled_class=class_obj).values_list('id', flat=True))
+            student = class_obj.enrollment_set.select_related('student').first().student
+            days = [class_obj.semester.start_date + timedelta(days=offset) for offset in range(options['days'])]
+            filters = {'semester': class_obj.semester}
+            records = len(enrollment_ids) * len(days)
+
+            for label, storage, model in (('table', TableStorage(), Attendance),
+                                          ('bitmap', BitmapStorage(), AttendanceBitmap)):
+                size_before = table_size(model)
+                milliseconds, _ = timed(lambda: [
+                    storage.record(class_obj, day, {
+                        enrollment_id: 'Absent' if (enrollment_id + offset) % 7 == 0 else 'Present'
+                        for enrollment_id in enrollment_ids
+                    })
+                    for offset, day in enumerate(days)
+                ])
+                size = table_size(model)
+                size = f'{(size - size_before) / 1024:,.0f} KB' if size is not None else 'n/a'
+                self.stdout.write(f'{label}: {records} records written in {milliseconds:.0f} ms, {size}')
+
+                history, _ = timed(lambda: storage.student_history(student, filters), options['repeat'])
+                self.stdout.write(f'  student history page {history:.2f} ms')
+
+            table_counts, _ = timed(lambda: list(
+                Attendance.objects.filter(enrollment__enrolled_class=class_obj)
+                .values('enrollment_id')
+                .annotate(present=Count('id', filter=Q(status='Present')), absent=Count('id', filter=Q(status='Absent')))
+                .order_by()
+            ), options['repeat'])
+            bitmap_counts, _ = timed(lambda: [
+                count_days(bytes(days)) for days in
+                AttendanceBitmap.objects.filter(enrollment__enrolled_class=class_obj).values_list('days', flat=True)
+            ], options['repeat'])
+            self.stdout.write(f'class totals: table {table_counts:.1f} ms, bitmap {bitmap_counts:.1f} ms')
+
+            transaction.set_rollback(True)
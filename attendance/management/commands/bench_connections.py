@@ -0,0 +1,96 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.urls import reverse
+
+from attendance.bench import login_session, wsgi_get
+from attendance.instrumentation import percentile
+
+# Environment for each configuration; the settings read DATABASE_* at startup.
+MODES = [
+    ('new connection per request', {'DATABASE_CONN_MAX_AGE': '0', 'DATABASE_POOL': '0'}),
+    ('persistent connections', {'DATABASE_CONN_MAX_AGE': '600', 'DATABASE_POOL': '0'}),
+    ('connection pool', {'DATABASE_CONN_MAX_AGE': '0', 'DATABASE_POOL': '1'}),
+]
+
+
+class Command(BaseCommand):
+    help = ('Measure requests/sec through the WSGI handler with a new database connection per '
+            'request, with persistent connections and with the psycopg connection pool. Each '
+            'configuration runs in its own process so the DATABASE_* settings apply.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=4, help='Concurrent request threads.')
+        parser.add_argument('--seconds', type=float, default=5)
+        parser.add_argument('--worker', choices=[str(index) for index in range(len(MODES))],
+                            help='Run one configuration in this process and print its result as JSON.')
+
+    def handle(self, *args, **options):
+        if options['worker'] is not None:
+            self.stdout.write(json.dumps(self.run_worker(options['threads'], options['seconds'])))
+            return
+
+        for index, (label, overrides) in enumerate(MODES):
+            result = subprocess.run(
+                [sys.executable, '-m', 'django', 'bench_connections', '--worker', str(index),
+                 '--threads', str(options['threads']), '--seconds', str(options['seconds'])],
+                env={**os.environ, **overrides}, capture_output=True, text=True,
+            )
+            if result.returncode:
+                raise CommandError(f'{label} failed:\n{result.stderr}')
+            report = json.loads(result.stdout.strip().splitlines()[-1])
+            if overrides['DATABASE_POOL'] == '1' and not report['pool']:
+                self.stdout.write(f'{label:<28} skipped: needs PostgreSQL with psycopg 3 and psycopg_pool')
+                continue
+            self.stdout.write(
+                f'{label:<28} {report["requests_per_second"]:8.1f} req/s  '
+                f'p50 {report["p50_ms"]:6.2f} ms  p95 {report["p95_ms"]:6.2f} ms  '
+                f'({report["requests"]} requests, {report["vendor"]}, CONN_MAX_AGE={report["conn_max_age"]})'
+            )
+
+    # Log in a throwaway superuser and request a light page from several
+    # threads through a real WSGIHandler, so request_started/finished close
+    # or keep connections exactly as in production.
+    def run_worker(self, threads, seconds):
+        user, session_key = login_session(f'bench-connections-{os.getpid()}')
+        path = reverse('semester_list')
+        handler = WSGIHandler()
+
+        def run(deadline):
+            timings = []
+            try:
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    wsgi_get(handler, path, session_key)
+                    timings.append((time.perf_counter() - start) * 1000)
+            finally:
+                connections.close_all()
+            return timings
+
+        try:
+            connections.close_all()
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                timings = sorted(t for result in pool.map(run, [start + seconds] * threads) for t in result)
+            elapsed = time.perf_counter() - start
+        finally:
+            SessionStore(session_key).delete()
+            user.delete()
+
+        return {
+            'vendor': connection.vendor,
+            'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+            'pool': bool(connection.settings_dict['OPTIONS'].get('pool')),
+            'requests': len(timings),
+            'requests_per_second': len(timings) / elapsed,
+            'p50_ms': percentile(timings, 50),
+            'p95_ms': percentile(timings, 95),
+        }
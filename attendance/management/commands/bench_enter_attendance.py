@@ -0,0 +1,44 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from attendance.bench import make_roster, timed
+from attendance.models import Attendance, Enrollment
+from attendance.services import attendance_batch_size, record_attendance
+
+
+class Command(BaseCommand):
+    help = ('Compare per-row and bulk roster submission latency. '
+            'All data is created inside a transaction that is rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[50, 500, 5000])
+        parser.add_argument('--batch-size', type=int, default=None)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size'] or attendance_batch_size()
+        self.stdout.write(f'{"students":>9} {"per-row ms":>11} {"bulk ms":>9} {"resubmit ms":>12}')
+
+        for size in options['sizes']:
+            with transaction.atomic():
+                class_obj = make_roster(size, prefix=f'roster{size}')
+                enrollment_ids = list(
+                    Enrollment.objects.filter(enrolled_class=class_obj).values_list('id', flat=True)
+                )
+                present = {enrollment_id: 'Present' for enrollment_id in enrollment_ids}
+                absent = {enrollment_id: 'Absent' for enrollment_id in enrollment_ids}
+
+                def per_row():
+                    for enrollment_id in enrollment_ids:
+                        Attendance.objects.create(enrollment_id=enrollment_id,
+                                                  date=date(2024, 3, 1), status='Present')
+
+                per_row_ms, _ = timed(per_row)
+                bulk_ms, _ = timed(lambda: record_attendance(class_obj.id, date(2024, 3, 2),
+                                                             present, batch_size))
+                resubmit_ms, _ = timed(lambda: record_attendance(class_obj.id, date(2024, 3, 2),
+                                                                 absent, batch_size))
+                transaction.set_rollback(True)
+
+            self.stdout.write(f'{size:>9} {per_row_ms:>11.1f} {bulk_ms:>9.1f} {resubmit_ms:>12.1f}')
@@ -0,0 +1,67 @@
+import resource
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from attendance.bench import make_roster
+from attendance.exports import export_rows, iter_csv, write_parquet
+from attendance.models import Attendance, Enrollment
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+class Command(BaseCommand):
+    help = ('Measure attendance export throughput and peak memory for CSV and Parquet. '
+            'All data is created inside a transaction that is rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=1000)
+        parser.add_argument('--days', type=int, default=200)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            class_obj = make_roster(options['students'], prefix='export')
+            enrollment_ids = list(Enrollment.objects.filter(enrolled_class=class_obj).values_list('id', flat=True))
+            for offset in range(options['days']):
+                day = date(2024, 1, 1) + timedelta(days=offset)
+                Attendance.objects.bulk_create(
+                    [Attendance(enrollment_id=enrollment_id, date=day, status='Present')
+                     for enrollment_id in enrollment_ids]
+                )
+            total = len(enrollment_ids) * options['days']
+
+            def consume_csv():
+                return sum(len(block) for block in iter_csv(export_rows(semester=class_obj.semester)))
+
+            elapsed, peak, size = measure(consume_csv)
+            self.report('csv', total, elapsed, peak, size)
+
+            try:
+                elapsed, peak, output = measure(lambda: write_parquet(export_rows(semester=class_obj.semester)))
+            except ImportError:
+                self.stdout.write('parquet: skipped, pandas and pyarrow are not installed')
+            else:
+                self.report('parquet', total, elapsed, peak, output.seek(0, 2))
+                output.close()
+
+            transaction.set_rollback(True)
+
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        self.stdout.write(f'process peak RSS: {max_rss:.0f} MB')
+
+    def report(self, label, rows, elapsed, peak, size):
+        self.stdout.write(
+            f'{label}: {rows} rows in {elapsed:.2f} s ({rows / elapsed:,.0f} rows/s), '
+            f'{size / 2 ** 20:.1f} MB output, {peak / 2 ** 20:.1f} MB peak Python allocations'
+        )
@@ -0,0 +1,49 @@
+import random
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from attendance.bench import count_queries, make_roster, timed
+from attendance.models import Attendance, CollegeDay, Enrollment
+
+
+class Command(BaseCommand):
+    help = ('Time the lecturer attendance matrix for one class. '
+            'All data is created inside a transaction that is rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=300)
+        parser.add_argument('--days', type=int, default=60)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        try:
+            with transaction.atomic():
+                class_obj = make_roster(options['students'], prefix='matrix')
+                days = [date(2024, 2, 26) + timedelta(days=offset) for offset in range(options['days'])]
+                CollegeDay.objects.bulk_create([CollegeDay(date=day, class_info=class_obj) for day in days])
+                enrollment_ids = Enrollment.objects.filter(enrolled_class=class_obj).values_list('id', flat=True)
+                Attendance.objects.bulk_create([
+                    Attendance(enrollment_id=enrollment_id, date=day,
+                               status=random.choice(['Present', 'Present', 'Absent']))
+                    for enrollment_id in enrollment_ids for day in days
+                ], batch_size=5000)
+
+                client = Client()
+                client.force_login(class_obj.lecturer.user)
+                url = reverse('class_attendance_matrix', args=[class_obj.pk])
+                queries = count_queries(lambda: client.get(url))
+                milliseconds, response = timed(lambda: client.get(url), options['repeat'])
+                transaction.set_rollback(True)
+        finally:
+            teardown_test_environment()
+
+        self.stdout.write(
+            f'{options["students"]} students x {options["days"]} days: '
+            f'{milliseconds:.1f} ms, {queries} queries, status {response.status_code}'
+        )
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from attendance.bench import make_students, timed
+from attendance.models import Student
+from attendance.pagination import keyset_filter
+from attendance.views import StudentListView
+
+
+class Command(BaseCommand):
+    help = ('Time the student list query at page 1 and a deep page using keyset cursors, '
+            'next to the equivalent OFFSET query. All data is rolled back afterwards.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=60000)
+        parser.add_argument('--page', type=int, default=1000)
+        parser.add_argument('--page-size', type=int, default=50)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        page_size = options['page_size']
+        deep_offset = (options['page'] - 1) * page_size
+        repeat = options['repeat']
+        fields = list(StudentListView.keyset_ordering)
+
+        # Both variants are timed as bare querysets over the view's ordering,
+        # so the numbers differ only in how the page is located.
+        with transaction.atomic():
+            make_students(options['students'], prefix='pagination')
+            ordered = Student.objects.order_by(*fields)
+            last_before_deep_page = list(ordered.values_list(*fields)[deep_offset - 1])
+
+            def keyset_page(after):
+                queryset = ordered if after is None else ordered.filter(keyset_filter(fields, after, 'gt'))
+                return list(queryset[:page_size])
+
+            results = [
+                ('keyset page 1', timed(lambda: keyset_page(None), repeat)[0]),
+                (f'keyset page {options["page"]}',
+                 timed(lambda: keyset_page(last_before_deep_page), repeat)[0]),
+                ('OFFSET page 1', timed(lambda: list(ordered[:page_size]), repeat)[0]),
+                (f'OFFSET page {options["page"]}',
+                 timed(lambda: list(ordered[deep_offset:deep_offset + page_size]), repeat)[0]),
+            ]
+            transaction.set_rollback(True)
+
+        for label, milliseconds in results:
+            self.stdout.write(f'{label:<20} {milliseconds:8.2f} ms')
@@ -0,0 +1,93 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from statistics import median
+
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from attendance.bench import login_session
+
+# Run in a fresh interpreter for each profile: time loading the WSGI
+# application, then serve requests through it and report the peak RSS.
+WORKER = '''
+import json, resource, sys, time
+start = time.perf_counter()
+from Assignment1.wsgi import application
+startup_ms = (time.perf_counter() - start) * 1000
+startup_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+from attendance.bench import wsgi_get
+session_key, requests, paths = sys.argv[1], int(sys.argv[2]), sys.argv[3:]
+start = time.perf_counter()
+for index in range(requests):
+    status = wsgi_get(application, paths[index % len(paths)], session_key)
+    if not status.startswith('200'):
+        sys.exit(f'{paths[index % len(paths)]}: {status}')
+request_ms = (time.perf_counter() - start) * 1000 / max(requests, 1)
+
+print(json.dumps({
+    'startup_ms': startup_ms,
+    'startup_kb': startup_kb,
+    'request_ms': request_ms,
+    'peak_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}))
+'''
+
+
+class Command(BaseCommand):
+    help = ('Compare the base and production settings profiles: time to load the WSGI '
+            'application, RSS after startup, and peak RSS and mean latency after serving a '
+            'number of requests as a logged-in admin. Each profile runs in new processes.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Processes per profile; the median of each figure is reported.')
+
+    def handle(self, *args, **options):
+        paths = [reverse(name) for name in ('home', 'semester_list', 'course_list', 'class_list',
+                                            'lecturer_list', 'student_list', 'enrollment_list')]
+        user, session_key = login_session(f'bench-profiles-{os.getpid()}')
+        try:
+            with tempfile.TemporaryDirectory() as workdir:
+                # The production profile serves hashed static names from a
+                # manifest, so collect the files first. The session was
+                # signed with this process's key.
+                production = {
+                    'DJANGO_PROFILE': 'production',
+                    'DJANGO_SECRET_KEY': settings.SECRET_KEY,
+                    'DJANGO_ALLOWED_HOSTS': 'localhost',
+                    'DJANGO_STATIC_ROOT': os.path.join(workdir, 'static'),
+                    'DJANGO_CACHE_DIR': os.path.join(workdir, 'cache'),
+                }
+                collectstatic = [sys.executable, '-m', 'django', 'collectstatic', '--noinput', '-v', '0']
+                self.run('collectstatic', collectstatic, production)
+
+                for profile, env in (('base', {'DJANGO_PROFILE': 'base'}), ('production', production)):
+                    runs = [
+                        json.loads(self.run(profile, [sys.executable, '-c', WORKER, session_key,
+                                                      str(options['requests']), *paths], env))
+                        for _ in range(options['repeat'])
+                    ]
+                    result = {key: median(run[key] for run in runs) for key in runs[0]}
+                    self.stdout.write(
+                        f'{profile:<11} startup {result["startup_ms"]:7.1f} ms  '
+                        f'RSS {result["startup_kb"] / 1024:6.1f} MB after startup, '
+                        f'{result["peak_kb"] / 1024:6.1f} MB after {options["requests"]} requests  '
+                        f'{result["request_ms"]:6.2f} ms/request'
+                    )
+        finally:
+            SessionStore(session_key).delete()
+            user.delete()
+
+    def run(self, label, command, env):
+        result = subprocess.run(command, cwd=settings.BASE_DIR, env={**os.environ, **env},
+                                capture_output=True, text=True)
+        if result.returncode:
+            raise CommandError(f'{label} failed:\n{result.stderr}')
+        return result.stdout
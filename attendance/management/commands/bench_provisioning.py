@@ -0,0 +1,56 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+
+from attendance.accounts import password_setup_links, provision_users
+
+
+class Command(BaseCommand):
+    help = ('Measure bulk account provisioning: passwords hashed with the configured hasher '
+            'on 1, 2, 4, ... processes, unusable passwords with set-password links, and the '
+            'test profile hasher. All accounts are rolled back afterwards.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--accounts', type=int, default=64,
+                            help='Accounts per hashed run; the other runs create 100 times as many.')
+        parser.add_argument('--max-processes', type=int, default=os.cpu_count() or 1)
+
+    def handle(self, *args, **options):
+        count = options['accounts']
+        processes = 1
+        while processes <= options['max_processes']:
+            elapsed = self.provision(count, processes, with_passwords=True)
+            self.report(f'hashed passwords, {processes} process{"es" if processes > 1 else ""}',
+                        count, elapsed, processes)
+            processes *= 2
+
+        elapsed = self.provision(count * 100, 1, with_passwords=False, links=True)
+        self.report('unusable passwords + setup links', count * 100, elapsed, 1)
+
+        with override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']):
+            elapsed = self.provision(count * 100, 1, with_passwords=True)
+        self.report('test profile hasher (MD5)', count * 100, elapsed, 1)
+
+    def provision(self, count, processes, with_passwords, links=False):
+        accounts = [
+            {'username': f'bench-provisioning-{i}', 'password': f'initial-{i}' if with_passwords else None}
+            for i in range(count)
+        ]
+        with transaction.atomic():
+            start = time.perf_counter()
+            users = provision_users(accounts, processes=processes)
+            if links:
+                password_setup_links(users)
+            elapsed = time.perf_counter() - start
+            transaction.set_rollback(True)
+        return elapsed
+
+    def report(self, label, count, elapsed, processes):
+        cores = min(processes, os.cpu_count() or 1)
+        self.stdout.write(
+            f'{label:<36} {count:6d} accounts in {elapsed:7.2f} s  '
+            f'{count / elapsed:10.1f} accounts/s  {count / elapsed / cores:10.1f} per core'
+        )
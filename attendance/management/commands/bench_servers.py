@@ -0,0 +1,158 @@
+import asyncio
+import os
+import re
+import subprocess
+import sys
+import time
+from importlib.util import find_spec
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from attendance.instrumentation import percentile
+from attendance.models import Class, CollegeDay, Enrollment
+from attendance.synthetic import delete_institution, generate_institution
+
+CSRF_TOKEN = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+class Command(BaseCommand):
+    help = ('Load test attendance submission under sync gunicorn workers and under uvicorn with '
+            'the async views: every lecturer opens the attendance form, then all of them submit '
+            'their roster at the same moment, as at the start of a period. The generated data '
+            'is committed so the servers can see it, and deleted afterwards.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lecturers', type=int, default=500)
+        parser.add_argument('--students-per-class', type=int, default=30)
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Processes for each server.')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--timeout', type=float, default=120, help='Seconds before a request fails.')
+
+    def handle(self, *args, **options):
+        try:
+            import httpx
+        except ImportError:
+            raise CommandError('bench_servers needs httpx installed.')
+
+        servers = [
+            ('gunicorn (sync views)', 'gunicorn', {'ATTENDANCE_ASYNC_VIEWS': '0'},
+             ['-m', 'gunicorn', 'Assignment1.wsgi:application', '--bind', f'127.0.0.1:{options["port"]}',
+              '--workers', str(options['workers']), '--backlog', '2048', '--timeout', '0',
+              '--log-level', 'warning']),
+            ('uvicorn (async views)', 'uvicorn', {'ATTENDANCE_ASYNC_VIEWS': '1'},
+             ['-m', 'uvicorn', 'Assignment1.asgi:application', '--port', str(options['port']),
+              '--workers', str(options['workers']), '--backlog', '2048', '--log-level', 'warning']),
+        ]
+
+        prefix = f'benchservers{os.getpid()}'
+        lecturers = options['lecturers']
+        self.stdout.write(f'Generating {lecturers} classes with {options["students_per_class"]} students each...')
+        generate_institution(
+            prefix=prefix, semesters=1, courses=lecturers, classes_per_course=1, lecturers=lecturers,
+            students=lecturers * options['students_per_class'] // 4, enrollments_per_student=4,
+            attendance_rows=0,
+        )
+        lecturer_forms = []
+        try:
+            lecturer_forms = self.lecturer_forms(prefix)
+            for label, module, env, args in servers:
+                if find_spec(module) is None:
+                    self.stdout.write(f'{label:<24} skipped, {module} is not installed')
+                    continue
+                result = self.run_server(httpx, args, env, lecturer_forms, options)
+                self.stdout.write(
+                    f'{label:<24} {result["ok"]}/{lecturers} submitted in {result["elapsed"]:.2f} s '
+                    f'({result["ok"] / result["elapsed"]:.1f} req/s)  p50 {result["p50"]:.0f} ms  '
+                    f'p95 {result["p95"]:.0f} ms  max {result["max"]:.0f} ms'
+                )
+        finally:
+            session_keys = [session_key for session_key, _, _ in lecturer_forms]
+            Session.objects.filter(session_key__in=session_keys).delete()
+            delete_institution(prefix)
+
+    # A session key, the form URL and the POST data of each lecturer's class,
+    # for its first session.
+    def lecturer_forms(self, prefix):
+        forms = []
+        classes = (
+            Class.objects.filter(course__name__startswith=f'{prefix} course ').select_related('lecturer__user')
+        )
+        sessions = dict(
+            CollegeDay.objects.filter(class_info__in=classes).values_list('class_info', 'pk')
+            .order_by('class_info', '-date')
+        )
+        enrollments = {}
+        for class_id, enrollment_id in Enrollment.objects.filter(enrolled_class__in=classes).values_list(
+            'enrolled_class', 'id'
+        ):
+            enrollments.setdefault(class_id, []).append(enrollment_id)
+
+        for class_obj in classes:
+            client = Client()
+            client.force_login(class_obj.lecturer.user)
+            data = {'college_day': sessions[class_obj.pk]}
+            data.update({
+                f'attendance_{enrollment_id}': 'Present' if index % 5 else 'Absent'
+                for index, enrollment_id in enumerate(enrollments.get(class_obj.pk, []))
+            })
+            forms.append((client.cookies[settings.SESSION_COOKIE_NAME].value,
+                          reverse('enter_attendance', args=[class_obj.pk]), data))
+        return forms
+
+    def run_server(self, httpx, args, env, lecturer_forms, options):
+        server = subprocess.Popen([sys.executable, *args], cwd=settings.BASE_DIR, env={**os.environ, **env})
+        base_url = f'http://127.0.0.1:{options["port"]}'
+        try:
+            self.wait_until_ready(httpx, server, base_url)
+            return asyncio.run(self.submit_all(httpx, base_url, lecturer_forms, options['timeout']))
+        finally:
+            server.terminate()
+            server.wait()
+
+    def wait_until_ready(self, httpx, server, base_url):
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f'Server exited with status {server.returncode}.')
+            try:
+                httpx.get(base_url + reverse('home'))
+                return
+            except httpx.TransportError:
+                time.sleep(0.2)
+        raise CommandError('Server did not start within 30 seconds.')
+
+    # Every lecturer loads the form (which sets the CSRF cookie), waits for
+    # the others, and then submits. Only the submissions are timed.
+    async def submit_all(self, httpx, base_url, lecturer_forms, timeout):
+        ready = asyncio.Barrier(len(lecturer_forms))
+        limits = httpx.Limits(max_connections=None)
+
+        async def lecturer(session_key, url, data):
+            async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits,
+                                         cookies={settings.SESSION_COOKIE_NAME: session_key}) as client:
+                form = await client.get(url)
+                token = CSRF_TOKEN.search(form.text)
+                await ready.wait()
+                start = time.perf_counter()
+                try:
+                    response = await client.post(url, data={**data, 'csrfmiddlewaretoken': token and token[1]})
+                except httpx.TransportError:
+                    ok = False
+                else:
+                    ok = response.status_code == 302
+                return ok, start, time.perf_counter()
+
+        results = await asyncio.gather(*(lecturer(*form) for form in lecturer_forms))
+        timings = sorted((end - start) * 1000 for _, start, end in results)
+        return {
+            'ok': sum(ok for ok, _, _ in results),
+            'elapsed': max(end for _, _, end in results) - min(start for _, start, _ in results),
+            'p50': percentile(timings, 50),
+            'p95': percentile(timings, 95),
+            'max': timings[-1],
+        }
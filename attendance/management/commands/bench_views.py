@@ -0,0 +1,132 @@
+import json
+import platform
+import tempfile
+import time
+import tracemalloc
+
+import django
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from django.utils import timezone
+
+from attendance.instrumentation import percentile
+from attendance.models import Class, CollegeDay, Enrollment, Student
+from attendance.synthetic import generate_institution
+
+
+class Command(BaseCommand):
+    help = ('Drive the main views through the test client and report p50/p95 latency, query '
+            'counts and peak Python memory per view as JSON. Runs on a synthetic institution, '
+            'or on the existing data with --existing. Everything is rolled back afterwards.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--existing', action='store_true',
+                            help='Use the data already in the database instead of generating it.')
+        parser.add_argument('--students', type=int, default=500)
+        parser.add_argument('--attendance-rows', type=int, default=50000)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        try:
+            with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+                with transaction.atomic():
+                    if not options['existing']:
+                        generate_institution(prefix='benchviews', students=options['students'],
+                                             attendance_rows=options['attendance_rows'])
+                    report = self.run_scenarios(options['repeat'])
+                    transaction.set_rollback(True)
+        finally:
+            teardown_test_environment()
+
+        report = {
+            'database': connection.vendor,
+            'django': django.get_version(),
+            'python': platform.python_version(),
+            'created': timezone.now().isoformat(),
+            'repeat': options['repeat'],
+            'views': report,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                file.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    def run_scenarios(self, repeat):
+        class_obj = (
+            Class.objects.annotate(students=Count('enrollment'), sessions=Count('collegeday', distinct=True))
+            .filter(sessions__gt=0).order_by('-students').select_related('lecturer__user').first()
+        )
+        student = Student.objects.filter(enrollment__enrolled_class=class_obj).select_related('user').first()
+        session = CollegeDay.objects.filter(class_info=class_obj).order_by('date').first()
+        enrollment_ids = Enrollment.objects.filter(enrolled_class=class_obj).values_list('id', flat=True)
+
+        admin = Client()
+        admin.force_login(User.objects.create_superuser('bench-views-admin'))
+        lecturer = Client()
+        lecturer.force_login(class_obj.lecturer.user)
+        student_client = Client()
+        student_client.force_login(student.user)
+
+        attendance = {'college_day': session.pk}
+        attendance.update({f'attendance_{enrollment_id}': 'Present' for enrollment_id in enrollment_ids})
+        upload = '\n'.join(['student_id,full_name,username'] + [
+            f'BV{i:08d},Uploaded Student {i},bench-views-upload-{i}' for i in range(100)
+        ]).encode()
+
+        scenarios = [
+            ('home (admin)', lambda: admin.get(reverse('home'))),
+            ('home (student)', lambda: student_client.get(reverse('home'))),
+            ('semester list', lambda: admin.get(reverse('semester_list'))),
+            ('course list', lambda: admin.get(reverse('course_list'))),
+            ('class list', lambda: admin.get(reverse('class_list'))),
+            ('lecturer list', lambda: admin.get(reverse('lecturer_list'))),
+            ('student list', lambda: admin.get(reverse('student_list'))),
+            ('enrollment list', lambda: admin.get(reverse('enrollment_list'))),
+            ('lecturer dashboard', lambda: lecturer.get(reverse('lecturer_dashboard'))),
+            ('enter attendance (form)', lambda: lecturer.get(reverse('enter_attendance', args=[class_obj.pk]))),
+            ('enter attendance (submit)',
+             lambda: lecturer.post(reverse('enter_attendance', args=[class_obj.pk]), attendance)),
+            ('attendance matrix', lambda: lecturer.get(reverse('class_attendance_matrix', args=[class_obj.pk]))),
+            ('student attendance', lambda: student_client.get(reverse('view_attendance'))),
+            ('upload students',
+             lambda: admin.post(reverse('upload_students'),
+                                {'file': SimpleUploadedFile('students.csv', upload, 'text/csv')})),
+            ('email poor attendance', lambda: admin.get(reverse('email_poor_attendance'))),
+        ]
+        return {name: self.measure(request, repeat) for name, request in scenarios}
+
+    def measure(self, request, repeat):
+        response = request()  # warm up caches and connections
+        with CaptureQueriesContext(connection) as context:
+            request()
+        queries = len(context.captured_queries)
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            request()
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+
+        tracemalloc.start()
+        request()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        return {
+            'status': response.status_code,
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'queries': queries,
+            'peak_kb': round(peak / 1024),
+        }
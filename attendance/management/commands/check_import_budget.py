@@ -0,0 +1,96 @@
+import json
+import re
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Libraries only some commands and views need. They are imported inside the
+# functions that use them, never while a worker boots.
+HEAVY_MODULES = ('numpy', 'pandas', 'pyarrow', 'openpyxl')
+
+# What a worker does before its first request: load the WSGI application and
+# the URLconf, which imports every view module. The peak RSS comes from
+# VmHWM where there is one: on Linux ru_maxrss survives exec, so it would
+# report the parent's peak whenever that is larger.
+WORKER = '''
+import json, resource, sys
+from Assignment1.wsgi import application
+from django.urls import get_resolver
+get_resolver().url_patterns
+
+def peak_rss_kb():
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+print(json.dumps({
+    'rss_kb': peak_rss_kb(),
+    'heavy': [name for name in sys.argv[1:] if name in sys.modules],
+}))
+'''
+
+IMPORT_TIME = re.compile(r'^import time:\s+(\d+) \|\s+\d+ \|\s+(\S+)$')
+
+
+class Command(BaseCommand):
+    help = ('Boot the WSGI application in a fresh interpreter under python -X importtime and '
+            'fail when the total import time or the peak RSS is over budget, or when one of '
+            f'{", ".join(HEAVY_MODULES)} is imported at startup.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-import-ms', type=float, default=600)
+        parser.add_argument('--max-rss-mb', type=float, default=80)
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Boots to measure; the fastest is compared with the budget.')
+        parser.add_argument('--top', type=int, default=10, help='Slowest modules to list.')
+
+    def handle(self, *args, **options):
+        runs = [self.boot() for _ in range(options['repeat'])]
+        total_us, rss_kb, heavy, modules = min(runs, key=lambda run: run[0])
+
+        self.stdout.write(f'Import time {total_us / 1000:.1f} ms, peak RSS {rss_kb / 1024:.1f} MB')
+        for self_us, name in sorted(modules, reverse=True)[:options['top']]:
+            self.stdout.write(f'  {self_us / 1000:8.1f} ms  {name}')
+
+        failures = []
+        if total_us / 1000 > options['max_import_ms']:
+            failures.append(f'Import time {total_us / 1000:.1f} ms is over the '
+                            f'{options["max_import_ms"]:.0f} ms budget.')
+        if rss_kb / 1024 > options['max_rss_mb']:
+            failures.append(f'Peak RSS {rss_kb / 1024:.1f} MB is over the {options["max_rss_mb"]:.0f} MB budget.')
+        if heavy:
+            failures.append(f'Imported at startup: {", ".join(heavy)}. Import them where they are used.')
+        if failures:
+            raise CommandError('\n'.join(failures))
+        self.stdout.write(self.style.SUCCESS('Within budget.'))
+
+    # Returns the summed self time of every import in microseconds, the peak
+    # RSS in KB, the heavy modules loaded, and (self time, name) of every
+    # module imported.
+    def boot(self):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', WORKER, *HEAVY_MODULES],
+            cwd=settings.BASE_DIR, capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(f'Boot failed:\n{result.stderr}')
+
+        total_us = 0
+        modules = []
+        for line in result.stderr.splitlines():
+            match = IMPORT_TIME.match(line)
+            if match is None:
+                continue
+            self_us, name = int(match[1]), match[2]
+            total_us += self_us
+            modules.append((self_us, name))
+
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        return total_us, report['rss_kb'], report['heavy'], modules
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from attendance.analytics import compute_semester_snapshots
+from attendance.models import Semester
+
+
+class Command(BaseCommand):
+    help = ('Recompute the per-course and per-class attendance snapshots read by the '
+            'attendance report, for one semester or for all of them.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--semester', type=int, help='Semester id. Defaults to every semester.')
+
+    def handle(self, *args, **options):
+        semesters = Semester.objects.order_by('start_date')
+        if options['semester'] is not None:
+            semesters = semesters.filter(pk=options['semester'])
+            if not semesters:
+                raise CommandError(f"Semester {options['semester']} does not exist.")
+
+        for semester in semesters:
+            snapshots = compute_semester_snapshots(semester)
+            self.stdout.write(f'{semester}: {len(snapshots)} snapshots')
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from attendance.bitmaps import BITMAP, TABLE, attendance_storage
+from attendance.storage import bitmaps_to_rows, rows_to_bitmaps
+from attendance.summaries import enrollment_ids_in_range, refresh_summaries, summary_chunks
+
+
+class Command(BaseCommand):
+    help = ('Copy attendance between the Attendance table and the compact AttendanceBitmap '
+            'storage, in chunks of enrollments. Switch ATTENDANCE_STORAGE to the target '
+            'before using --delete to remove the source copy.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--to', choices=[BITMAP, TABLE], required=True)
+        parser.add_argument('--delete', action='store_true',
+                            help='Delete the converted data from the source storage.')
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help='Number of enrollment ids handled per transaction.')
+
+    def handle(self, *args, **options):
+        if options['delete'] and attendance_storage() != options['to']:
+            raise CommandError(
+                f"--delete needs ATTENDANCE_STORAGE = '{options['to']}', otherwise the live "
+                f"attendance would be removed."
+            )
+
+        converted = skipped = 0
+        for low, high in summary_chunks(options['chunk_size']):
+            if options['to'] == BITMAP:
+                chunk_converted, chunk_skipped = rows_to_bitmaps(low, high, options['delete'])
+                converted += chunk_converted
+                skipped += chunk_skipped
+            else:
+                converted += bitmaps_to_rows(low, high, options['delete'])
+            # Summaries follow the live storage, which this chunk may have changed.
+            if attendance_storage() == options['to']:
+                refresh_summaries(enrollment_ids_in_range(low, high))
+
+        self.stdout.write(self.style.SUCCESS(f"Copied {converted} attendance records to {options['to']} storage."))
+        if skipped:
+            self.stdout.write(self.style.WARNING(
+                f'{skipped} records dated before their semester starts were left in the Attendance table '
+                f'and are not part of bitmap storage.'
+            ))
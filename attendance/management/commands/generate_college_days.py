@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from attendance.models import Class
+from attendance.services import WEEKDAYS, generate_college_days
+
+
+class Command(BaseCommand):
+    help = 'Create the college days of classes from their semester dates and a weekly pattern.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--class', dest='classes', type=int, nargs='+', default=[],
+                            help='Class ids to generate days for.')
+        parser.add_argument('--semester', type=int, help='Generate days for every class in this semester.')
+        parser.add_argument('--weekdays', nargs='+', choices=WEEKDAYS, required=True,
+                            help='Days of the week the classes meet, e.g. mon wed.')
+
+    def handle(self, *args, **options):
+        if not options['classes'] and options['semester'] is None:
+            raise CommandError('Give --class or --semester.')
+
+        classes = Class.objects.select_related('semester')
+        if options['classes']:
+            classes = classes.filter(pk__in=options['classes'])
+        if options['semester'] is not None:
+            classes = classes.filter(semester=options['semester'])
+
+        weekdays = [WEEKDAYS.index(day) for day in options['weekdays']]
+        count = generate_college_days(classes, weekdays)
+        self.stdout.write(self.style.SUCCESS(f'Generated up to {count} college days.'))
@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from attendance.synthetic import generate_institution
+
+
+class Command(BaseCommand):
+    help = ('Fill the database with a synthetic institution for load testing: semesters, '
+            'courses, classes, lecturers, students, enrollments, college days and attendance.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prefix', default='synth',
+                            help='Prefix for names, usernames and codes. Use a new one for each run.')
+        parser.add_argument('--semesters', type=int, default=2)
+        parser.add_argument('--courses', type=int, default=20)
+        parser.add_argument('--classes-per-course', type=int, default=2)
+        parser.add_argument('--lecturers', type=int, default=20)
+        parser.add_argument('--students', type=int, default=1000)
+        parser.add_argument('--enrollments-per-student', type=int, default=4,
+                            help='Classes each student takes per semester.')
+        parser.add_argument('--sessions-per-week', type=int, default=2)
+        parser.add_argument('--attendance-rows', type=int, default=100000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--password', help='Password for every generated user. Unusable if omitted.')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        institution = generate_institution(
+            prefix=options['prefix'],
+            semesters=options['semesters'],
+            courses=options['courses'],
+            classes_per_course=options['classes_per_course'],
+            lecturers=options['lecturers'],
+            students=options['students'],
+            enrollments_per_student=options['enrollments_per_student'],
+            sessions_per_week=options['sessions_per_week'],
+            attendance_rows=options['attendance_rows'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            password=options['password'],
+            progress=lambda message: self.stdout.write(f'{time.perf_counter() - start:7.1f} s  {message}'),
+        )
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {institution.attendance} attendance rows in {elapsed:.1f} s '
+            f'({institution.attendance / elapsed:,.0f} rows/s).'
+        ))
@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from attendance.summaries import (
+    enrollment_ids_in_range, refresh_summaries, summary_chunks, summary_mismatches,
+)
+
+
+def rebuild_chunk(bounds):
+    try:
+        enrollment_ids = enrollment_ids_in_range(*bounds)
+        with transaction.atomic():
+            refresh_summaries(enrollment_ids)
+        return len(enrollment_ids)
+    finally:
+        connections.close_all()
+
+
+def verify_chunk(bounds):
+    try:
+        return summary_mismatches(*bounds)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = ('Recompute AttendanceSummary from the raw attendance rows in parallel chunks '
+            'of enrollments, then check that every summary matches.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Chunks processed at once, each on its own connection. '
+                                 'Use 1 on SQLite, which allows a single writer.')
+        parser.add_argument('--check', action='store_true',
+                            help='Only verify the existing summaries.')
+
+    def handle(self, *args, **options):
+        chunks = summary_chunks(options['chunk_size'])
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            if not options['check']:
+                rebuilt = sum(pool.map(rebuild_chunk, chunks))
+                self.stdout.write(f'Rebuilt {rebuilt} summaries in {len(chunks)} chunks.')
+            mismatches = [enrollment_id for chunk in pool.map(verify_chunk, chunks)
+                          for enrollment_id in chunk]
+
+        if mismatches:
+            raise CommandError(
+                f'{len(mismatches)} summaries do not match their attendance rows, '
+                f'e.g. enrollments {mismatches[:10]}'
+            )
+        self.stdout.write(self.style.SUCCESS('All attendance summaries are consistent.'))
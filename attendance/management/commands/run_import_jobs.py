@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from attendance.importers import claim_next_import_job, fail_stale_import_jobs, run_import_job
+
+
+class Command(BaseCommand):
+    help = 'Run queued student import jobs, polling the database for new ones.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--poll-interval', type=float, default=2,
+                            help='Seconds to wait when no job is queued.')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit once there are no queued jobs.')
+        parser.add_argument('--job-timeout', type=float, default=None,
+                            help='Seconds after which a running job is taken to have lost its worker '
+                                 'and is marked as failed (default: IMPORT_JOB_TIMEOUT, 3600).')
+
+    def handle(self, *args, **options):
+        while True:
+            stale = fail_stale_import_jobs(options['job_timeout'])
+            if stale:
+                self.stderr.write(f'Marked {stale} stalled import job{"s" if stale > 1 else ""} as failed.')
+            job = claim_next_import_job()
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            job = run_import_job(job, options['chunk_size'])
+            self.stdout.write(
+                f'Job {job.pk} {job.status}: {job.rows_processed} rows, '
+                f'{job.rows_failed} failed, {job.throughput():.0f} rows/s'
+            )
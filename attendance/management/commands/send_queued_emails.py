@@ -0,0 +1,54 @@
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand, CommandError
+
+from attendance.outbox import deliver_pending
+
+
+class Command(BaseCommand):
+    help = 'Send queued emails in batches over a single mail connection.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--rate', type=float, default=0,
+                            help='Maximum messages per second (0 for no limit).')
+        parser.add_argument('--max-attempts', type=int, default=None)
+        parser.add_argument('--poll-interval', type=float, default=5,
+                            help='Seconds to wait when the queue is empty.')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit once the queue has no due messages.')
+
+    def handle(self, *args, **options):
+        connection = get_connection()
+        total = 0
+        try:
+            while True:
+                start = time.monotonic()
+                try:
+                    handled = deliver_pending(connection, options['batch_size'], options['max_attempts'])
+                except OSError as exc:
+                    # The mail server is unreachable or refused the login;
+                    # the batch was released and is retried later.
+                    if options['once']:
+                        raise CommandError(f'Could not connect to the mail server: {exc}')
+                    self.stderr.write(f'Could not connect to the mail server: {exc}')
+                    connection.close()
+                    time.sleep(options['poll_interval'])
+                    continue
+                total += handled
+
+                if not handled:
+                    if options['once']:
+                        break
+                    # Drop the idle SMTP connection; it is reopened on the next batch.
+                    connection.close()
+                    time.sleep(options['poll_interval'])
+                elif options['rate']:
+                    remaining = handled / options['rate'] - (time.monotonic() - start)
+                    if remaining > 0:
+                        time.sleep(remaining)
+        finally:
+            connection.close()
+
+        self.stdout.write(self.style.SUCCESS(f'Handled {total} queued emails.'))
@@ -0,0 +1,65 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:13
+
+from django.db import migrations, models, transaction
+from django.db.models import Count, Max, Min
+
+
+# Collapse duplicate (enrollment, date) rows, keeping the most recently
+# inserted one, in short transactions over ranges of enrollment ids.
+def merge_duplicates(apps, schema_editor, chunk_size=1000):
+    Attendance = apps.get_model('attendance', 'Attendance')
+    bounds = Attendance.objects.aggregate(low=Min('enrollment_id'), high=Max('enrollment_id'))
+    if bounds['high'] is None:
+        return
+
+    for low in range(bounds['low'], bounds['high'] + 1, chunk_size):
+        with transaction.atomic():
+            duplicates = (
+                Attendance.objects.filter(enrollment_id__gte=low, enrollment_id__lt=low + chunk_size)
+                .values('enrollment_id', 'date')
+                .annotate(rows=Count('id'), keep=Max('id'))
+                .filter(rows__gt=1)
+                .order_by()
+            )
+            keep_ids = set()
+            groups = set()
+            for group in duplicates:
+                keep_ids.add(group['keep'])
+                groups.add((group['enrollment_id'], group['date']))
+            if not groups:
+                continue
+
+            stale_ids = [
+                pk for pk, enrollment_id, date in Attendance.objects.filter(
+                    enrollment_id__in={enrollment_id for enrollment_id, _ in groups}
+                ).values_list('id', 'enrollment_id', 'date')
+                if (enrollment_id, date) in groups and pk not in keep_ids
+            ]
+            Attendance.objects.filter(id__in=stale_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    # Duplicates are merged in short per-chunk transactions before the
+    # constraint is added, rather than in one long migration transaction.
+    atomic = False
+
+    dependencies = [
+        ('attendance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['date', 'status'], name='attendance_date_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['enrollment', 'status'], name='attendance_enroll_status_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='attendance',
+            constraint=models.UniqueConstraint(fields=('enrollment', 'date'), name='unique_attendance_per_day'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Q
+
+
+# A frozen copy of the summary rebuild as of this migration: one summary per
+# enrollment, counted from its Attendance rows in chunks of enrollment ids.
+def populate_summaries(apps, schema_editor, chunk_size=1000):
+    Enrollment = apps.get_model('attendance', 'Enrollment')
+    Attendance = apps.get_model('attendance', 'Attendance')
+    AttendanceSummary = apps.get_model('attendance', 'AttendanceSummary')
+    bounds = Enrollment.objects.aggregate(low=Min('pk'), high=Max('pk'))
+    if bounds['high'] is None:
+        return
+
+    for low in range(bounds['low'], bounds['high'] + 1, chunk_size):
+        enrollment_ids = list(
+            Enrollment.objects.filter(pk__gte=low, pk__lt=low + chunk_size).values_list('pk', flat=True)
+        )
+        totals = {
+            row['enrollment_id']: row
+            for row in Attendance.objects.filter(enrollment_id__in=enrollment_ids)
+            .values('enrollment_id')
+            .annotate(
+                present=Count('id', filter=Q(status='Present')),
+                absent=Count('id', filter=Q(status='Absent')),
+                latest=Max('date'),
+            )
+            .order_by()
+        }
+
+        summaries = []
+        for enrollment_id in enrollment_ids:
+            row = totals.get(enrollment_id, {})
+            present = row.get('present', 0)
+            absent = row.get('absent', 0)
+            summaries.append(AttendanceSummary(
+                enrollment_id=enrollment_id,
+                present_count=present,
+                absent_count=absent,
+                last_date=row.get('latest'),
+                percentage=present * 100 / (present + absent) if present + absent else None,
+            ))
+        AttendanceSummary.objects.bulk_create(summaries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0005_student_import_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceSummary',
+            fields=[
+                ('enrollment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='attendance.enrollment')),
+                ('present_count', models.PositiveIntegerField(default=0)),
+                ('absent_count', models.PositiveIntegerField(default=0)),
+                ('last_date', models.DateField(blank=True, null=True)),
+                ('percentage', models.FloatField(blank=True, null=True)),
+            ],
+        ),
+        migrations.RunPython(populate_summaries, migrations.RunPython.noop),
+    ]
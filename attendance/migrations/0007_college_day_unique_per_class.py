@@ -0,0 +1,58 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:23
+
+from django.db import migrations, models, transaction
+from django.db.models import Count, Max, Min
+
+
+# Collapse duplicate (class, date) college days, keeping the most recently
+# inserted one, in short transactions over ranges of class ids. Nothing
+# references a college day, so the extra rows can simply be deleted.
+def merge_duplicates(apps, schema_editor, chunk_size=1000):
+    CollegeDay = apps.get_model('attendance', 'CollegeDay')
+    bounds = CollegeDay.objects.aggregate(low=Min('class_info_id'), high=Max('class_info_id'))
+    if bounds['high'] is None:
+        return
+
+    for low in range(bounds['low'], bounds['high'] + 1, chunk_size):
+        with transaction.atomic():
+            duplicates = (
+                CollegeDay.objects.filter(class_info_id__gte=low, class_info_id__lt=low + chunk_size)
+                .values('class_info_id', 'date')
+                .annotate(rows=Count('id'), keep=Max('id'))
+                .filter(rows__gt=1)
+                .order_by()
+            )
+            keep_ids = set()
+            groups = set()
+            for group in duplicates:
+                keep_ids.add(group['keep'])
+                groups.add((group['class_info_id'], group['date']))
+            if not groups:
+                continue
+
+            stale_ids = [
+                pk for pk, class_id, date in CollegeDay.objects.filter(
+                    class_info_id__in={class_id for class_id, _ in groups}
+                ).values_list('id', 'class_info_id', 'date')
+                if (class_id, date) in groups and pk not in keep_ids
+            ]
+            CollegeDay.objects.filter(id__in=stale_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    # Duplicates are merged in short per-chunk transactions before the
+    # constraint is added, rather than in one long migration transaction.
+    atomic = False
+
+    dependencies = [
+        ('attendance', '0006_attendance_summary'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='collegeday',
+            constraint=models.UniqueConstraint(fields=('class_info', 'date'), name='unique_college_day_per_class'),
+        ),
+    ]
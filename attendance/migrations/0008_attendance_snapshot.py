@@ -0,0 +1,38 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0007_college_day_unique_per_class'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('course', 'Course'), ('class', 'Class')], max_length=10)),
+                ('enrollment_count', models.PositiveIntegerField()),
+                ('record_count', models.PositiveIntegerField()),
+                ('mean_rate', models.FloatField(null=True)),
+                ('p10_rate', models.FloatField(null=True)),
+                ('p25_rate', models.FloatField(null=True)),
+                ('median_rate', models.FloatField(null=True)),
+                ('p75_rate', models.FloatField(null=True)),
+                ('p90_rate', models.FloatField(null=True)),
+                ('at_risk_count', models.PositiveIntegerField()),
+                ('weekly_rates', models.JSONField(default=list)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('class_info', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='attendance.class')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='attendance.course')),
+                ('semester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='attendance.semester')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['semester', 'scope'], name='snapshot_semester_scope_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0008_attendance_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceBitmap',
+            fields=[
+                ('enrollment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='bitmap', serialize=False, to='attendance.enrollment')),
+                ('days', models.BinaryField(default=bytes)),
+            ],
+        ),
+    ]
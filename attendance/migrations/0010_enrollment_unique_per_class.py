@@ -0,0 +1,124 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:59
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models, transaction
+from django.db.models import Count, Max, Min, Q
+
+# Frozen copy of the bitmap codec as of this migration: two bits per day,
+# four days per byte with the first day in the low bits.
+PRESENT, ABSENT = 1, 2
+STATUS_CODES = {'Present': PRESENT, 'Absent': ABSENT}
+CODE_STATUSES = {PRESENT: 'Present', ABSENT: 'Absent'}
+
+
+def decode_days(days):
+    return {
+        byte_index * 4 + slot: CODE_STATUSES[byte >> slot * 2 & 3]
+        for byte_index, byte in enumerate(days)
+        for slot in range(4)
+        if byte >> slot * 2 & 3 in CODE_STATUSES
+    }
+
+
+def encode_days(statuses):
+    days = bytearray(max(statuses) // 4 + 1 if statuses else 0)
+    for index, status in statuses.items():
+        byte, slot = divmod(index, 4)
+        days[byte] |= STATUS_CODES[status] << slot * 2
+    return bytes(days)
+
+
+# The kept enrollment's summary, counted from the storage that
+# ATTENDANCE_STORAGE selects: its merged bitmap days or its Attendance rows.
+def rebuild_summary(apps, enrollment_id, days):
+    Attendance = apps.get_model('attendance', 'Attendance')
+    AttendanceSummary = apps.get_model('attendance', 'AttendanceSummary')
+    Enrollment = apps.get_model('attendance', 'Enrollment')
+
+    if getattr(settings, 'ATTENDANCE_STORAGE', 'table') == 'bitmap':
+        start_date = Enrollment.objects.values_list('enrolled_class__semester__start_date', flat=True).get(
+            pk=enrollment_id
+        )
+        statuses = list(days.values())
+        present, absent = statuses.count('Present'), statuses.count('Absent')
+        last_date = start_date + timedelta(days=max(days)) if days else None
+    else:
+        totals = Attendance.objects.filter(enrollment_id=enrollment_id).aggregate(
+            present=Count('id', filter=Q(status='Present')),
+            absent=Count('id', filter=Q(status='Absent')),
+            latest=Max('date'),
+        )
+        present, absent, last_date = totals['present'], totals['absent'], totals['latest']
+
+    AttendanceSummary.objects.update_or_create(enrollment_id=enrollment_id, defaults={
+        'present_count': present,
+        'absent_count': absent,
+        'last_date': last_date,
+        'percentage': present * 100 / (present + absent) if present + absent else None,
+    })
+
+
+# Collapse duplicate (student, class) enrollments into the oldest one, one
+# student and class per transaction. Attendance rows and bitmap days of the
+# duplicates move onto it for days it has nothing recorded for, newest
+# duplicate first; its summary is rebuilt and the duplicates are deleted.
+def merge_duplicates(apps, schema_editor):
+    Enrollment = apps.get_model('attendance', 'Enrollment')
+    Attendance = apps.get_model('attendance', 'Attendance')
+    AttendanceBitmap = apps.get_model('attendance', 'AttendanceBitmap')
+    duplicates = list(
+        Enrollment.objects.values('student_id', 'enrolled_class_id')
+        .annotate(rows=Count('id'), keep=Min('id'))
+        .filter(rows__gt=1)
+        .order_by()
+    )
+
+    for group in duplicates:
+        keep = group['keep']
+        with transaction.atomic():
+            stale_ids = list(
+                Enrollment.objects.filter(student_id=group['student_id'], enrolled_class_id=group['enrolled_class_id'])
+                .exclude(pk=keep)
+                .order_by('-pk')
+                .values_list('pk', flat=True)
+            )
+
+            dates = set(Attendance.objects.filter(enrollment_id=keep).values_list('date', flat=True))
+            moved = []
+            for pk, date in Attendance.objects.filter(enrollment_id__in=stale_ids).order_by('-pk').values_list('pk', 'date'):
+                if date not in dates:
+                    dates.add(date)
+                    moved.append(pk)
+            Attendance.objects.filter(pk__in=moved).update(enrollment_id=keep)
+
+            bitmaps = dict(AttendanceBitmap.objects.filter(enrollment_id__in=[keep, *stale_ids])
+                           .values_list('enrollment_id', 'days'))
+            days = {}
+            for pk in [*reversed(stale_ids), keep]:
+                days.update(decode_days(bytes(bitmaps.get(pk, b''))))
+            if bitmaps:
+                AttendanceBitmap.objects.update_or_create(enrollment_id=keep, defaults={'days': encode_days(days)})
+
+            Enrollment.objects.filter(pk__in=stale_ids).delete()
+            rebuild_summary(apps, keep, days)
+
+
+class Migration(migrations.Migration):
+
+    # Duplicates are merged one student and class per transaction before the
+    # constraint is added, rather than in one long migration transaction.
+    atomic = False
+
+    dependencies = [
+        ('attendance', '0009_attendance_bitmap'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='enrollment',
+            constraint=models.UniqueConstraint(fields=('student', 'enrolled_class'), name='unique_enrollment_per_class'),
+        ),
+    ]
@@ -1,5 +1,12 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
+
+# Share of sessions a student may miss before being flagged for poor
+# attendance. Courses override semesters, which override the
+# ATTENDANCE_ABSENCE_THRESHOLD setting.
+absence_threshold_validators = [MinValueValidator(0), MaxValueValidator(1)]
 
 # Semester Model
 class Semester(models.Model):
@@ -7,6 +14,7 @@ class Semester(models.Model):
     name = models.CharField(max_length=100)
     start_date = models.DateField()
     end_date = models.DateField()
+    absence_threshold = models.FloatField(null=True, blank=True, validators=absence_threshold_validators)
 
     def __str__(self):
         return f"{self.year} - {self.name}"
@@ -16,6 +24,7 @@ class Course(models.Model):
     code = models.CharField(max_length=100)
     name = models.CharField(max_length=100)
     semesters = models.ManyToManyField(Semester, related_name='courses')
+    absence_threshold = models.FloatField(null=True, blank=True, validators=absence_threshold_validators)
 
     def __str__(self):
         return f"{self.name} ({self.code})"
@@ -53,6 +62,11 @@ class Enrollment(models.Model):
     student = models.ForeignKey(Student, on_delete=models.CASCADE)
     enrolled_class = models.ForeignKey(Class, on_delete=models.CASCADE)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'enrolled_class'], name='unique_enrollment_per_class'),
+        ]
+
     def __str__(self):
         return f"{self.student.full_name} enrolled in Class {self.enrolled_class.number}"
 
@@ -62,13 +76,151 @@ class Attendance(models.Model):
     date = models.DateField()
     status = models.CharField(max_length=10, choices=[('Present', 'Present'), ('Absent', 'Absent')])
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['enrollment', 'date'], name='unique_attendance_per_day'),
+        ]
+        indexes = [
+            models.Index(fields=['date', 'status'], name='attendance_date_status_idx'),
+            models.Index(fields=['enrollment', 'status'], name='attendance_enroll_status_idx'),
+        ]
+
     def __str__(self):
         return f"{self.enrollment.student.full_name} - {self.date} - {self.status}"
 
-# CollegeDay Model (New)
+# Running attendance totals per enrollment, kept up to date by
+# the attendance storage writers and the Attendance save/delete signals
+class AttendanceSummary(models.Model):
+    enrollment = models.OneToOneField(Enrollment, on_delete=models.CASCADE, primary_key=True,
+                                      related_name='summary')
+    present_count = models.PositiveIntegerField(default=0)
+    absent_count = models.PositiveIntegerField(default=0)
+    last_date = models.DateField(null=True, blank=True)
+    percentage = models.FloatField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.enrollment_id}: {self.present_count} present, {self.absent_count} absent"
+
+# Compact attendance for one enrollment: two bits per day of the semester,
+# counted from the semester's start date. Used instead of Attendance rows when
+# ATTENDANCE_STORAGE is 'bitmap'; see attendance.bitmaps for the encoding.
+class AttendanceBitmap(models.Model):
+    enrollment = models.OneToOneField(Enrollment, on_delete=models.CASCADE, primary_key=True,
+                                      related_name='bitmap')
+    days = models.BinaryField(default=bytes)
+
+    def __str__(self):
+        return f"{self.enrollment_id}: {len(self.days) * 4} days"
+
+# CollegeDay Model: the scheduled sessions of a class. A class meets at most
+# once a day, so (class, date) identifies the session attendance is taken for.
 class CollegeDay(models.Model):
     date = models.DateField()
     class_info = models.ForeignKey(Class, on_delete=models.CASCADE)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['class_info', 'date'], name='unique_college_day_per_class'),
+        ]
+
     def __str__(self):
         return f"College Day {self.date} for Class {self.class_info.number}"
+
+# Outgoing email queue, drained by the send_queued_emails command
+class OutgoingEmail(models.Model):
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(PENDING, 'Pending'), (SENT, 'Sent'), (FAILED, 'Failed')]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.EmailField()
+    recipient = models.EmailField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outgoing_email_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} to {self.recipient} ({self.status})"
+
+# Background student import, run by the run_import_jobs command
+class StudentImportJob(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(QUEUED, 'Queued'), (RUNNING, 'Running'), (DONE, 'Done'), (FAILED, 'Failed')]
+
+    file = models.FileField(upload_to='imports/')
+    original_name = models.CharField(max_length=255)
+    update_existing = models.BooleanField(default=False)
+    created_by = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    rows_processed = models.PositiveIntegerField(default=0)
+    rows_failed = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='import_job_queue_idx'),
+        ]
+
+    def throughput(self):
+        if not self.started_at:
+            return 0
+        elapsed = ((self.finished_at or timezone.now()) - self.started_at).total_seconds()
+        return self.rows_processed / elapsed if elapsed > 0 else 0
+
+    def __str__(self):
+        return f"Import of {self.original_name} ({self.status})"
+
+# Precomputed attendance statistics for a course or class in a semester,
+# written by the compute_attendance_analytics command
+class AttendanceSnapshot(models.Model):
+    COURSE = 'course'
+    CLASS = 'class'
+    SCOPE_CHOICES = [(COURSE, 'Course'), (CLASS, 'Class')]
+
+    semester = models.ForeignKey(Semester, on_delete=models.CASCADE, related_name='snapshots')
+    scope = models.CharField(max_length=10, choices=SCOPE_CHOICES)
+    course = models.ForeignKey(Course, on_delete=models.CASCADE)
+    class_info = models.ForeignKey(Class, null=True, blank=True, on_delete=models.CASCADE)
+    enrollment_count = models.PositiveIntegerField()
+    record_count = models.PositiveIntegerField()
+    mean_rate = models.FloatField(null=True)
+    p10_rate = models.FloatField(null=True)
+    p25_rate = models.FloatField(null=True)
+    median_rate = models.FloatField(null=True)
+    p75_rate = models.FloatField(null=True)
+    p90_rate = models.FloatField(null=True)
+    at_risk_count = models.PositiveIntegerField()
+    weekly_rates = models.JSONField(default=list)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['semester', 'scope'], name='snapshot_semester_scope_idx'),
+        ]
+
+    def week_over_week(self):
+        rates = [rate for rate in self.weekly_rates if rate is not None]
+        return rates[-1] - rates[-2] if len(rates) >= 2 else None
+
+    def __str__(self):
+        target = self.class_info or self.course
+        return f"{target} in {self.semester}"
@@ -0,0 +1,122 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+
+def outbox_retry_delay():
+    return getattr(settings, 'OUTBOX_RETRY_DELAY', 60)
+
+
+def outbox_max_attempts():
+    return getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 5)
+
+
+def outbox_claim_timeout():
+    return getattr(settings, 'OUTBOX_CLAIM_TIMEOUT', 600)
+
+
+# Recipients with a message of this subject still waiting to be sent.
+def pending_recipients(subject):
+    return OutgoingEmail.objects.filter(status=OutgoingEmail.PENDING, subject=subject).values_list(
+        'recipient', flat=True
+    )
+
+
+def _new_emails(recipients, pending, subject, body, from_email):
+    emails = []
+    skip = set(pending)
+    for recipient in recipients:
+        if recipient not in skip:
+            skip.add(recipient)
+            emails.append(OutgoingEmail(subject=subject, body=body, from_email=from_email, recipient=recipient))
+    return emails
+
+
+# Queue one message per recipient. Recipients who already have this subject
+# pending are skipped, so queueing the same notice twice emails nobody twice.
+# Sending is left to send_queued_emails so the calling request only pays for
+# the inserts.
+def queue_emails(recipients, subject, body, from_email=None, batch_size=1000):
+    from_email = from_email or settings.DEFAULT_FROM_EMAIL
+    emails = _new_emails(recipients, pending_recipients(subject), subject, body, from_email)
+    OutgoingEmail.objects.bulk_create(emails, batch_size=batch_size)
+    return len(emails)
+
+
+# queue_emails for async views. recipients may be a queryset, which is read
+# through the async ORM.
+async def aqueue_emails(recipients, subject, body, from_email=None, batch_size=1000):
+    from_email = from_email or settings.DEFAULT_FROM_EMAIL
+    if isinstance(recipients, QuerySet):
+        recipients = [recipient async for recipient in recipients]
+    pending = [recipient async for recipient in pending_recipients(subject)]
+    emails = _new_emails(recipients, pending, subject, body, from_email)
+    await OutgoingEmail.objects.abulk_create(emails, batch_size=batch_size)
+    return len(emails)
+
+
+# Claim up to batch_size due messages in a short transaction. Their
+# next_attempt_at moves OUTBOX_CLAIM_TIMEOUT seconds ahead, so other workers
+# skip them while they are sent, and they come due again if this one dies.
+def claim_pending(batch_size):
+    with transaction.atomic():
+        batch = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutgoingEmail.PENDING, next_attempt_at__lte=timezone.now())
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        OutgoingEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+            next_attempt_at=timezone.now() + timedelta(seconds=outbox_claim_timeout())
+        )
+    return batch
+
+
+# Send up to batch_size due messages over one open connection, outside any
+# transaction. Each result is saved as soon as its message is handled, so a
+# crash re-sends at most the message in flight. Failed messages are retried
+# with exponential backoff until max_attempts, after which they are marked as
+# failed. When the connection cannot be opened the batch is released for a
+# later retry without using up an attempt, and the error is raised. Returns
+# the number of messages handled.
+def deliver_pending(connection=None, batch_size=100, max_attempts=None):
+    max_attempts = max_attempts or outbox_max_attempts()
+    connection = connection or get_connection()
+
+    batch = claim_pending(batch_size)
+    if not batch:
+        return 0
+
+    try:
+        connection.open()
+    except Exception as exc:
+        OutgoingEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+            next_attempt_at=timezone.now() + timedelta(seconds=outbox_retry_delay()),
+            last_error=str(exc),
+        )
+        raise
+
+    for email in batch:
+        message = EmailMessage(email.subject, email.body, email.from_email, [email.recipient],
+                               connection=connection)
+        email.attempts += 1
+        try:
+            connection.send_messages([message])
+        except Exception as exc:
+            email.last_error = str(exc)
+            if email.attempts >= max_attempts:
+                email.status = OutgoingEmail.FAILED
+            else:
+                delay = outbox_retry_delay() * 2 ** (email.attempts - 1)
+                email.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+        else:
+            email.status = OutgoingEmail.SENT
+            email.sent_at = timezone.now()
+        email.save(update_fields=['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'])
+
+    return len(batch)
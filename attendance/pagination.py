@@ -0,0 +1,100 @@
+import base64
+import json
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+@dataclass
+class KeysetPage:
+    object_list: list
+    next_cursor: str = None
+    previous_cursor: str = None
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values, cls=DjangoJSONEncoder).encode()).decode()
+
+
+# The cursor's list of values, or None unless it holds exactly length
+# scalars. Cursors come from the query string, so anything can arrive here.
+def decode_cursor(cursor, length):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(values, list) or len(values) != length:
+        return None
+    if not all(isinstance(value, (str, int, float)) and not isinstance(value, bool) for value in values):
+        return None
+    return values
+
+
+# Rows strictly after (or before) the cursor values in keyset order, e.g. for
+# ('name', 'pk'): name > v0 OR (name = v0 AND pk > v1).
+def keyset_filter(fields, values, lookup):
+    condition = Q()
+    for index, field in enumerate(fields):
+        equal = dict(zip(fields[:index], values))
+        condition |= Q(**equal, **{f'{field}__{lookup}': values[index]})
+    return condition
+
+
+# Seek pagination for ListViews. Pages are fetched with a WHERE on the last
+# seen key instead of OFFSET, so page 1000 costs the same as page 1. The
+# ordering fields must end in a unique column (pk by default).
+class KeysetPaginationMixin:
+    keyset_ordering = ('pk',)
+
+    def get_paginate_by(self, queryset):
+        return self.paginate_by or getattr(settings, 'ATTENDANCE_PAGE_SIZE', 50)
+
+    def paginate_queryset(self, queryset, page_size):
+        fields = list(self.keyset_ordering)
+        after = decode_cursor(self.request.GET.get('after', ''), len(fields))
+        before = decode_cursor(self.request.GET.get('before', ''), len(fields))
+        try:
+            page = self.keyset_page(queryset, page_size, fields, after, before)
+        except (ValidationError, ValueError):
+            # Values of the wrong type for their field: start over.
+            page = self.keyset_page(queryset, page_size, fields, None, None)
+        return None, page, page.object_list, page.has_other_pages()
+
+    def keyset_page(self, queryset, page_size, fields, after, before):
+        if before is not None:
+            rows = list(
+                queryset.filter(keyset_filter(fields, before, 'lt'))
+                .order_by(*[f'-{field}' for field in fields])[:page_size + 1]
+            )
+            has_previous = len(rows) > page_size
+            rows = rows[:page_size][::-1]
+            has_next = True
+        else:
+            if after is not None:
+                queryset = queryset.filter(keyset_filter(fields, after, 'gt'))
+            rows = list(queryset.order_by(*fields)[:page_size + 1])
+            has_next = len(rows) > page_size
+            rows = rows[:page_size]
+            has_previous = after is not None
+
+        page = KeysetPage(rows)
+        if rows and has_next:
+            page.next_cursor = encode_cursor(self.keyset_values(rows[-1]))
+        if rows and has_previous:
+            page.previous_cursor = encode_cursor(self.keyset_values(rows[0]))
+        return page
+
+    def keyset_values(self, obj):
+        return [getattr(obj, field) for field in self.keyset_ordering]
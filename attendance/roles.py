@@ -0,0 +1,84 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+
+LECTURER_GROUP = 'Lecturers'
+STUDENT_GROUP = 'Students'
+
+
+def role_cache_key(user_id):
+    return f'attendance:roles:{user_id}'
+
+
+# Names of the user's groups, loaded with one query and cached per user until
+# their membership changes.
+def get_user_groups(user):
+    if not user.is_authenticated:
+        return frozenset()
+    key = role_cache_key(user.pk)
+    groups = cache.get(key)
+    if groups is None:
+        groups = frozenset(user.groups.values_list('name', flat=True))
+        cache.set(key, groups, getattr(settings, 'ROLE_CACHE_TIMEOUT', 3600))
+    return groups
+
+
+async def aget_user_groups(user):
+    if not user.is_authenticated:
+        return frozenset()
+    key = role_cache_key(user.pk)
+    groups = await cache.aget(key)
+    if groups is None:
+        groups = frozenset([name async for name in user.groups.values_list('name', flat=True)])
+        await cache.aset(key, groups, getattr(settings, 'ROLE_CACHE_TIMEOUT', 3600))
+    return groups
+
+
+class Roles:
+    def __init__(self, user, groups=None):
+        if groups is None:
+            groups = get_user_groups(user)
+        self.is_admin = user.is_superuser
+        self.is_lecturer = LECTURER_GROUP in groups
+        self.is_student = STUDENT_GROUP in groups
+
+
+def get_roles(request):
+    if not hasattr(request, '_cached_roles'):
+        request._cached_roles = Roles(request.user)
+    return request._cached_roles
+
+
+async def aget_roles(request):
+    if not hasattr(request, '_cached_roles'):
+        user = await request.auser()
+        request._cached_roles = Roles(user, await aget_user_groups(user))
+    return request._cached_roles
+
+
+# Adds a lazy request.roles, resolved at most once per request. Must come
+# after AuthenticationMiddleware. Async views resolve it with aget_roles
+# first; the middleware itself never touches the database, so it runs in
+# whichever mode the handler is in.
+class RoleMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        request.roles = SimpleLazyObject(lambda: get_roles(request))
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        return await self.get_response(request)
+
+
+def invalidate_roles(user_ids):
+    cache.delete_many([role_cache_key(user_id) for user_id in user_ids])
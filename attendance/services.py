@@ -0,0 +1,131 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Coalesce
+
+from .caching import invalidate
+from .models import Attendance, CollegeDay, Enrollment
+from .summaries import apply_summary_deltas, lock_summaries, status_delta
+
+ATTENDANCE_STATUSES = {'Present', 'Absent'}
+
+
+def attendance_batch_size():
+    return getattr(settings, 'ATTENDANCE_BATCH_SIZE', 500)
+
+
+WEEKDAYS = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+
+
+def default_absence_threshold():
+    return getattr(settings, 'ATTENDANCE_ABSENCE_THRESHOLD', 0.2)
+
+
+# Record a whole roster in one transaction. Rows are upserted on the
+# (enrollment, date) unique constraint, so submitting the same roster twice
+# for a date updates the existing rows instead of inserting duplicates. The
+# enrollments' AttendanceSummary rows are adjusted by the change in counts.
+def record_attendance(class_id, date, statuses, batch_size=None):
+    batch_size = batch_size or attendance_batch_size()
+    records = [
+        Attendance(enrollment_id=enrollment_id, date=date, status=status)
+        for enrollment_id, status in statuses.items()
+        if status in ATTENDANCE_STATUSES
+    ]
+
+    with transaction.atomic():
+        lock_summaries([record.enrollment_id for record in records])
+        previous = dict(
+            Attendance.objects.filter(enrollment__enrolled_class=class_id, date=date)
+            .values_list('enrollment_id', 'status')
+        )
+        Attendance.objects.bulk_create(
+            records,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['enrollment', 'date'],
+            update_fields=['status'],
+        )
+        apply_summary_deltas(date, {
+            record.enrollment_id: status_delta(previous.get(record.enrollment_id), record.status)
+            for record in records
+        })
+
+    return len(records)
+
+
+# Enroll students in a class. The class's current enrollments are read with
+# one query and only the missing ones are bulk-created; ignore_conflicts
+# covers a student enrolled by someone else in the meantime. Returns the
+# number of (new, already enrolled) students.
+def enroll_students(class_id, student_ids, batch_size=None):
+    student_ids = set(student_ids)
+    enrolled = set(Enrollment.objects.filter(enrolled_class=class_id).values_list('student_id', flat=True))
+    new = sorted(student_ids - enrolled)
+    with transaction.atomic():
+        Enrollment.objects.bulk_create(
+            [Enrollment(student_id=student_id, enrolled_class_id=class_id) for student_id in new],
+            batch_size=batch_size or attendance_batch_size(),
+            ignore_conflicts=True,
+        )
+        # Bulk writes skip the model signals that invalidate cached data.
+        if new:
+            invalidate(Enrollment)
+    return len(new), len(student_ids & enrolled)
+
+
+# Enrollments whose share of absences is above the threshold of their course,
+# falling back to the semester and then the ATTENDANCE_ABSENCE_THRESHOLD
+# setting. Counts come from AttendanceSummary, which both storage backends
+# keep up to date, and the threshold comparison is done in one query.
+def poor_attendance_enrollments(default_threshold=None):
+    if default_threshold is None:
+        default_threshold = default_absence_threshold()
+    return (
+        Enrollment.objects.annotate(
+            sessions=F('summary__present_count') + F('summary__absent_count'),
+            absences=F('summary__absent_count'),
+            threshold=Coalesce(
+                'enrolled_class__course__absence_threshold',
+                'enrolled_class__semester__absence_threshold',
+                Value(default_threshold),
+                output_field=FloatField(),
+            ),
+        )
+        .filter(sessions__gt=0, absences__gt=F('threshold') * F('sessions'))
+        .order_by()
+    )
+
+
+# Distinct email addresses of students with at least one poor enrollment, so a
+# student enrolled in several flagged classes is only contacted once.
+def poor_attendance_emails(default_threshold=None):
+    flagged = poor_attendance_enrollments(default_threshold).values('student_id')
+    return (
+        User.objects.filter(student__id__in=flagged)
+        .exclude(email='')
+        .values_list('email', flat=True)
+        .distinct()
+        .order_by()
+    )
+
+
+# Create the college days of each class from its semester's start and end
+# dates, on the given weekdays (0 is Monday). Everything goes into a single
+# bulk_create; days that already exist are left alone, so this can be re-run.
+def generate_college_days(classes, weekdays):
+    weekdays = set(weekdays)
+    college_days = []
+    for class_obj in classes:
+        semester = class_obj.semester
+        day = semester.start_date
+        while day <= semester.end_date:
+            if day.weekday() in weekdays:
+                college_days.append(CollegeDay(class_info=class_obj, date=day))
+            day += timedelta(days=1)
+
+    CollegeDay.objects.bulk_create(college_days, batch_size=attendance_batch_size(), ignore_conflicts=True)
+    return len(college_days)
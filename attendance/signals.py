@@ -0,0 +1,71 @@
+from django.contrib.auth.models import Group, User
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .bitmaps import TABLE, attendance_storage
+from .caching import invalidate
+from .models import Attendance, Class, Course, Enrollment, Lecturer, Semester, Student
+from .roles import invalidate_roles
+from .summaries import refresh_summaries
+
+
+# Single-row saves and deletes (admin edits, queryset deletes) recompute the
+# affected enrollment's summary. Roster submissions bypass these signals and
+# apply their deltas in services.record_attendance. In bitmap storage the
+# table is not the source of the summaries, so its changes are ignored.
+@receiver(post_save, sender=Attendance)
+def refresh_summary_on_save(sender, instance, **kwargs):
+    if attendance_storage() == TABLE:
+        refresh_summaries([instance.enrollment_id])
+
+
+@receiver(post_delete, sender=Attendance)
+def refresh_summary_on_delete(sender, instance, origin=None, **kwargs):
+    # Rows removed by a cascade from their enrollment take the summary with them.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is Attendance and attendance_storage() == TABLE:
+        refresh_summaries([instance.enrollment_id])
+
+
+# Cached roles are dropped whenever group membership changes, from either side
+# of the relation, or a group is renamed or deleted.
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_roles_on_membership_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate_roles([instance.pk])
+    elif action == 'pre_clear':
+        invalidate_roles(instance.user_set.values_list('pk', flat=True))
+    elif action in ('post_add', 'post_remove'):
+        invalidate_roles(pk_set)
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def invalidate_roles_on_group_change(sender, instance, **kwargs):
+    invalidate_roles(instance.user_set.values_list('pk', flat=True))
+
+
+# Cached lists and query results are keyed by model versions; any change to
+# one of these models moves its version on.
+@receiver(post_save, sender=Semester)
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=Class)
+@receiver(post_save, sender=Lecturer)
+@receiver(post_save, sender=Student)
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Semester)
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Class)
+@receiver(post_delete, sender=Lecturer)
+@receiver(post_delete, sender=Student)
+@receiver(post_delete, sender=Enrollment)
+def invalidate_cache_on_change(sender, **kwargs):
+    invalidate(sender)
+
+
+@receiver(m2m_changed, sender=Course.semesters.through)
+def invalidate_cache_on_course_semesters(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate(Course, Semester)
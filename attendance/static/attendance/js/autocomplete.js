@@ -0,0 +1,28 @@
+// Fills the datalist of each autocomplete search box from its JSON endpoint
+// as the user types, and copies the id of the chosen entry into the hidden
+// input before it.
+document.querySelectorAll('input[data-autocomplete-url]').forEach(function (input) {
+    var hidden = input.previousElementSibling;
+    var choices = document.getElementById(input.getAttribute('list'));
+    var ids = {};
+    var timer;
+
+    input.addEventListener('input', function () {
+        hidden.value = ids[input.value] || '';
+        clearTimeout(timer);
+        timer = setTimeout(function () {
+            fetch(input.dataset.autocompleteUrl + '?q=' + encodeURIComponent(input.value)).then(function (response) {
+                return response.json();
+            }).then(function (data) {
+                choices.replaceChildren();
+                data.results.forEach(function (result) {
+                    var option = document.createElement('option');
+                    option.value = result.text;
+                    choices.appendChild(option);
+                    ids[result.text] = result.id;
+                });
+                hidden.value = ids[input.value] || '';
+            });
+        }, 200);
+    });
+});
@@ -0,0 +1,307 @@
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Q
+from django.db.models.functions import Cast, NullIf
+
+from .bitmaps import BITMAP, attendance_storage, day_index, decode_days, encode_days, get_day, set_day
+from .models import Attendance, AttendanceBitmap, CollegeDay, Enrollment
+from .pagination import keyset_filter
+from .services import ATTENDANCE_STATUSES, attendance_batch_size, record_attendance
+from .summaries import apply_summary_deltas, lock_summaries, status_delta, summary_percentage
+
+
+# Attendance reads and writes used by the views, with one implementation per
+# ATTENDANCE_STORAGE backend. Student history filters are the cleaned data of
+# AttendanceFilterForm: semester, course, date_from and date_to, any of them
+# empty. History rows are dicts with id, date, status and course_name, newest
+# first, where (date, id) is unique and usable as a keyset cursor. Class
+# cells map (enrollment id, date) to the status recorded for every student of
+# a class. Student totals are dicts with enrollment_id, course_name,
+# class_number, present_count, absent_count and percentage for each
+# enrollment with attendance matching the filters. attendance_rows streams every record matching the same filters as
+# tuples of the given fields: date, status or any lookup from an Attendance
+# row through its enrollment, such as enrollment__student__student_id.
+#
+# The a-prefixed methods are the async equivalents used by the async views.
+# Writes hold row locks in a transaction, which the async ORM cannot do, so
+# arecord runs record in a worker thread.
+class TableStorage:
+    def record(self, class_obj, date, statuses):
+        return record_attendance(class_obj.pk, date, statuses)
+
+    async def arecord(self, class_obj, date, statuses):
+        return await sync_to_async(self.record)(class_obj, date, statuses)
+
+    def class_cells(self, class_id):
+        return {
+            (enrollment_id, date): status
+            for enrollment_id, date, status in Attendance.objects.filter(
+                enrollment__enrolled_class=class_id
+            ).values_list('enrollment_id', 'date', 'status').iterator()
+        }
+
+    def filter_records(self, records, filters):
+        if filters.get('semester'):
+            records = records.filter(enrollment__enrolled_class__semester=filters['semester'])
+        if filters.get('course'):
+            records = records.filter(enrollment__enrolled_class__course=filters['course'])
+        if filters.get('date_from'):
+            records = records.filter(date__gte=filters['date_from'])
+        if filters.get('date_to'):
+            records = records.filter(date__lte=filters['date_to'])
+        return records
+
+    def student_rows(self, student, filters):
+        return self.filter_records(Attendance.objects.filter(enrollment__student=student), filters)
+
+    # iterator() reads through a server-side cursor on PostgreSQL, so only
+    # chunk_size rows are held in memory at a time.
+    def attendance_rows(self, fields, filters, chunk_size=2000):
+        records = self.filter_records(Attendance.objects.all(), filters)
+        return records.order_by('id').values_list(*fields).iterator(chunk_size=chunk_size)
+
+    def history_rows(self, student, filters, before, limit):
+        records = self.student_rows(student, filters).order_by('-date', '-id')
+        if before is not None:
+            records = records.filter(keyset_filter(['date', 'id'], before, 'lt'))
+        return records.values(
+            'id', 'date', 'status', course_name=F('enrollment__enrolled_class__course__name')
+        )[:limit]
+
+    def student_history(self, student, filters, before=None, limit=50):
+        return list(self.history_rows(student, filters, before, limit).iterator())
+
+    async def astudent_history(self, student, filters, before=None, limit=50):
+        return [row async for row in self.history_rows(student, filters, before, limit)]
+
+    def totals_rows(self, student, filters):
+        return (
+            self.student_rows(student, filters)
+            .values('enrollment_id', course_name=F('enrollment__enrolled_class__course__name'),
+                    class_number=F('enrollment__enrolled_class__number'))
+            .annotate(present_count=Count('id', filter=Q(status='Present')),
+                      absent_count=Count('id', filter=Q(status='Absent')))
+            .annotate(percentage=Cast('present_count', FloatField()) * 100
+                      / NullIf(F('present_count') + F('absent_count'), 0))
+            .order_by('course_name', 'enrollment_id')
+        )
+
+    def student_totals(self, student, filters):
+        return list(self.totals_rows(student, filters))
+
+    async def astudent_totals(self, student, filters):
+        return [row async for row in self.totals_rows(student, filters)]
+
+
+# Bitmap rows are keyed by enrollment, so history ids are enrollment ids.
+class BitmapStorage:
+    def record(self, class_obj, date, statuses, batch_size=None):
+        index = day_index(class_obj.semester.start_date, date)
+        statuses = {
+            enrollment_id: status for enrollment_id, status in statuses.items()
+            if status in ATTENDANCE_STATUSES
+        }
+
+        with transaction.atomic():
+            # The summary row locks also serialize writers of these bitmaps.
+            lock_summaries(list(statuses))
+            existing = dict(
+                AttendanceBitmap.objects.filter(enrollment_id__in=list(statuses))
+                .values_list('enrollment_id', 'days')
+            )
+            bitmaps = []
+            deltas = {}
+            for enrollment_id, status in statuses.items():
+                days = bytes(existing.get(enrollment_id, b''))
+                deltas[enrollment_id] = status_delta(get_day(days, index), status)
+                bitmaps.append(AttendanceBitmap(enrollment_id=enrollment_id, days=set_day(days, index, status)))
+            AttendanceBitmap.objects.bulk_create(
+                bitmaps,
+                batch_size=batch_size or attendance_batch_size(),
+                update_conflicts=True,
+                unique_fields=['enrollment'],
+                update_fields=['days'],
+            )
+            apply_summary_deltas(date, deltas)
+
+        return len(statuses)
+
+    async def arecord(self, class_obj, date, statuses, batch_size=None):
+        return await sync_to_async(self.record)(class_obj, date, statuses, batch_size)
+
+    def class_cells(self, class_id):
+        return {
+            (enrollment_id, start_date + timedelta(days=index)): status
+            for enrollment_id, days, start_date in AttendanceBitmap.objects.filter(
+                enrollment__enrolled_class=class_id
+            ).values_list('enrollment_id', 'days', 'enrollment__enrolled_class__semester__start_date')
+            for index, status in decode_days(bytes(days))
+        }
+
+    def student_bitmaps(self, student, filters):
+        bitmaps = AttendanceBitmap.objects.filter(enrollment__student=student)
+        if filters.get('semester'):
+            bitmaps = bitmaps.filter(enrollment__enrolled_class__semester=filters['semester'])
+        if filters.get('course'):
+            bitmaps = bitmaps.filter(enrollment__enrolled_class__course=filters['course'])
+        return bitmaps.values_list(
+            'enrollment_id', 'days', 'enrollment__enrolled_class__semester__start_date',
+            'enrollment__enrolled_class__course__code', 'enrollment__enrolled_class__course__name',
+            'enrollment__enrolled_class__number',
+        )
+
+    # Bitmaps are read chunk_size enrollments at a time and decoded one by
+    # one, ordered by enrollment and then date.
+    def attendance_rows(self, fields, filters, chunk_size=2000):
+        bitmaps = AttendanceBitmap.objects.all()
+        if filters.get('semester'):
+            bitmaps = bitmaps.filter(enrollment__enrolled_class__semester=filters['semester'])
+        if filters.get('course'):
+            bitmaps = bitmaps.filter(enrollment__enrolled_class__course=filters['course'])
+        related = [field for field in fields if field not in ('date', 'status')]
+        rows = bitmaps.order_by('enrollment_id').values_list(
+            'days', 'enrollment__enrolled_class__semester__start_date', *related,
+        ).iterator(chunk_size=chunk_size)
+        for days, start_date, *values in rows:
+            values = dict(zip(related, values))
+            for index, status in decode_days(bytes(days)):
+                date = start_date + timedelta(days=index)
+                if filters.get('date_from') and date < filters['date_from']:
+                    continue
+                if filters.get('date_to') and date > filters['date_to']:
+                    continue
+                values.update(date=date, status=status)
+                yield tuple(values[field] for field in fields)
+
+    async def astudent_bitmaps(self, student, filters):
+        return [row async for row in self.student_bitmaps(student, filters)]
+
+    def student_rows(self, student, filters, bitmaps=None):
+        if bitmaps is None:
+            bitmaps = self.student_bitmaps(student, filters)
+        for enrollment_id, days, start_date, course_code, course_name, class_number in bitmaps:
+            for index, status in decode_days(bytes(days)):
+                date = start_date + timedelta(days=index)
+                if filters.get('date_from') and date < filters['date_from']:
+                    continue
+                if filters.get('date_to') and date > filters['date_to']:
+                    continue
+                yield {'id': enrollment_id, 'date': date, 'status': status,
+                       'course_code': course_code, 'course_name': course_name, 'class_number': class_number}
+
+    def student_history(self, student, filters, before=None, limit=50, bitmaps=None):
+        rows = self.student_rows(student, filters, bitmaps)
+        if before is not None:
+            before = (before[0], before[1])
+            rows = (row for row in rows if (row['date'].isoformat(), row['id']) < before)
+        return sorted(rows, key=lambda row: (row['date'], row['id']), reverse=True)[:limit]
+
+    async def astudent_history(self, student, filters, before=None, limit=50):
+        bitmaps = await self.astudent_bitmaps(student, filters)
+        return self.student_history(student, filters, before, limit, bitmaps)
+
+    def student_totals(self, student, filters, bitmaps=None):
+        totals = {}
+        for row in self.student_rows(student, filters, bitmaps):
+            total = totals.setdefault(row['id'], {
+                'enrollment_id': row['id'], 'course_name': row['course_name'],
+                'class_number': row['class_number'], 'present_count': 0, 'absent_count': 0,
+            })
+            total['present_count' if row['status'] == 'Present' else 'absent_count'] += 1
+        for total in totals.values():
+            total['percentage'] = summary_percentage(total['present_count'], total['absent_count'])
+        return sorted(totals.values(), key=lambda total: (total['course_name'], total['enrollment_id']))
+
+    async def astudent_totals(self, student, filters):
+        return self.student_totals(student, filters, await self.astudent_bitmaps(student, filters))
+
+
+def get_storage():
+    return BitmapStorage() if attendance_storage() == BITMAP else TableStorage()
+
+
+# Student x college day attendance grid for one class. The cells come from
+# the storage backend in a single query and are pivoted in Python. Classes
+# without a calendar fall back to the dates attendance was recorded on.
+def attendance_matrix(class_id):
+    marks = {'Present': 'P', 'Absent': 'A'}
+    days = sorted(set(CollegeDay.objects.filter(class_info=class_id).values_list('date', flat=True)))
+    cells = {key: marks[status] for key, status in get_storage().class_cells(class_id).items()}
+    if not days:
+        days = sorted({date for _, date in cells})
+
+    enrollments = (
+        Enrollment.objects.filter(enrolled_class=class_id)
+        .values_list('id', 'student__student_id', 'student__full_name')
+        .order_by('student__full_name')
+    )
+    rows = [
+        (student_id, full_name, [cells.get((enrollment_id, date), '') for date in days])
+        for enrollment_id, student_id, full_name in enrollments
+    ]
+    return days, rows
+
+
+# Copy the attendance of enrollments with ids in [low, high) from Attendance
+# rows into bitmaps, in one transaction. Days already in a bitmap win over
+# the table. Rows dated before their semester starts cannot be stored in a
+# bitmap and are left in place. Returns (converted, skipped) row counts.
+def rows_to_bitmaps(low, high, delete=False):
+    statuses = {}
+    converted = skipped = 0
+    rows = Attendance.objects.filter(enrollment_id__gte=low, enrollment_id__lt=high).values_list(
+        'enrollment_id', 'date', 'status', 'enrollment__enrolled_class__semester__start_date',
+    )
+    for enrollment_id, date, status, start_date in rows.iterator():
+        index = (date - start_date).days
+        if index < 0:
+            skipped += 1
+            continue
+        statuses.setdefault(enrollment_id, {})[index] = status
+        converted += 1
+
+    with transaction.atomic():
+        existing = AttendanceBitmap.objects.select_for_update().filter(enrollment_id__in=list(statuses))
+        for enrollment_id, days in existing.values_list('enrollment_id', 'days'):
+            statuses[enrollment_id].update(decode_days(bytes(days)))
+        AttendanceBitmap.objects.bulk_create(
+            [AttendanceBitmap(enrollment_id=enrollment_id, days=encode_days(days))
+             for enrollment_id, days in statuses.items()],
+            batch_size=attendance_batch_size(),
+            update_conflicts=True,
+            unique_fields=['enrollment'],
+            update_fields=['days'],
+        )
+        if delete:
+            Attendance.objects.filter(
+                enrollment_id__gte=low, enrollment_id__lt=high,
+                date__gte=F('enrollment__enrolled_class__semester__start_date'),
+            ).delete()
+    return converted, skipped
+
+
+# Copy bitmaps of enrollments with ids in [low, high) back into Attendance
+# rows, in one transaction. Returns the number of rows written.
+def bitmaps_to_rows(low, high, delete=False):
+    bitmaps = AttendanceBitmap.objects.filter(enrollment_id__gte=low, enrollment_id__lt=high)
+    records = [
+        Attendance(enrollment_id=enrollment_id, date=start_date + timedelta(days=index), status=status)
+        for enrollment_id, days, start_date in bitmaps.values_list(
+            'enrollment_id', 'days', 'enrollment__enrolled_class__semester__start_date',
+        )
+        for index, status in decode_days(bytes(days))
+    ]
+
+    with transaction.atomic():
+        Attendance.objects.bulk_create(
+            records,
+            batch_size=attendance_batch_size(),
+            update_conflicts=True,
+            unique_fields=['enrollment', 'date'],
+            update_fields=['status'],
+        )
+        if delete:
+            bitmaps.delete()
+    return len(records)
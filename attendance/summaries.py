@@ -0,0 +1,169 @@
+from datetime import timedelta
+
+from django.apps import apps as global_apps
+from django.db.models import Count, DateField, F, FloatField, Max, Min, Q, Value
+from django.db.models.functions import Cast, Coalesce, Greatest, NullIf
+
+from .bitmaps import BITMAP, attendance_storage, count_days
+from .models import AttendanceBitmap, AttendanceSummary
+
+SUMMARY_FIELDS = ['present_count', 'absent_count', 'last_date', 'percentage']
+
+
+def summary_percentage(present, absent):
+    total = present + absent
+    return present * 100 / total if total else None
+
+
+# Change in (present, absent) counts when a row goes from old to new status.
+# Either status may be None for a row that is being created or deleted.
+def status_delta(old, new):
+    return (
+        (new == 'Present') - (old == 'Present'),
+        (new == 'Absent') - (old == 'Absent'),
+    )
+
+
+# Create any missing summary rows and lock them for the rest of the
+# transaction, so concurrent submissions for the same roster apply their
+# deltas one after the other.
+def lock_summaries(enrollment_ids):
+    AttendanceSummary.objects.bulk_create(
+        [AttendanceSummary(enrollment_id=enrollment_id) for enrollment_id in enrollment_ids],
+        ignore_conflicts=True,
+    )
+    list(AttendanceSummary.objects.select_for_update()
+         .filter(enrollment_id__in=enrollment_ids).values_list('pk', flat=True))
+
+
+# Add per-enrollment (present, absent) deltas for one date. Enrollments that
+# share a delta are updated with one UPDATE, so a roster costs a handful of
+# statements rather than one per student.
+def apply_summary_deltas(date, deltas):
+    groups = {}
+    for enrollment_id, delta in deltas.items():
+        if delta != (0, 0):
+            groups.setdefault(delta, []).append(enrollment_id)
+
+    date = Value(date, output_field=DateField())
+    for (present, absent), enrollment_ids in groups.items():
+        AttendanceSummary.objects.filter(enrollment_id__in=enrollment_ids).update(
+            present_count=F('present_count') + present,
+            absent_count=F('absent_count') + absent,
+            last_date=Greatest(Coalesce('last_date', date), date),
+            percentage=Cast(F('present_count') + present, FloatField()) * 100
+            / NullIf(F('present_count') + F('absent_count') + (present + absent), 0),
+        )
+
+
+# Summaries for the given enrollments computed from the raw attendance rows
+# with one grouped query, or from their bitmaps in bitmap storage. The apps
+# argument lets migrations pass their historical models.
+def build_summaries(enrollment_ids, apps=global_apps):
+    if apps is global_apps and attendance_storage() == BITMAP:
+        return build_bitmap_summaries(enrollment_ids)
+    Attendance = apps.get_model('attendance', 'Attendance')
+    AttendanceSummary = apps.get_model('attendance', 'AttendanceSummary')
+    totals = {
+        row['enrollment_id']: row
+        for row in Attendance.objects.filter(enrollment_id__in=enrollment_ids)
+        .values('enrollment_id')
+        .annotate(
+            present=Count('id', filter=Q(status='Present')),
+            absent=Count('id', filter=Q(status='Absent')),
+            latest=Max('date'),
+        )
+        .order_by()
+    }
+
+    summaries = []
+    for enrollment_id in enrollment_ids:
+        row = totals.get(enrollment_id, {})
+        present = row.get('present', 0)
+        absent = row.get('absent', 0)
+        summaries.append(AttendanceSummary(
+            enrollment_id=enrollment_id,
+            present_count=present,
+            absent_count=absent,
+            last_date=row.get('latest'),
+            percentage=summary_percentage(present, absent),
+        ))
+    return summaries
+
+
+def build_bitmap_summaries(enrollment_ids):
+    bitmaps = {
+        enrollment_id: (bytes(days), start_date)
+        for enrollment_id, days, start_date in AttendanceBitmap.objects.filter(enrollment_id__in=enrollment_ids)
+        .values_list('enrollment_id', 'days', 'enrollment__enrolled_class__semester__start_date')
+    }
+
+    summaries = []
+    for enrollment_id in enrollment_ids:
+        days, start_date = bitmaps.get(enrollment_id, (b'', None))
+        present, absent, last = count_days(days)
+        summaries.append(AttendanceSummary(
+            enrollment_id=enrollment_id,
+            present_count=present,
+            absent_count=absent,
+            last_date=start_date + timedelta(days=last) if last is not None else None,
+            percentage=summary_percentage(present, absent),
+        ))
+    return summaries
+
+
+def refresh_summaries(enrollment_ids, apps=global_apps):
+    AttendanceSummary = apps.get_model('attendance', 'AttendanceSummary')
+    AttendanceSummary.objects.bulk_create(
+        build_summaries(enrollment_ids, apps),
+        update_conflicts=True,
+        unique_fields=['enrollment'],
+        update_fields=SUMMARY_FIELDS,
+    )
+
+
+# [low, high) enrollment id ranges covering the whole Enrollment table.
+def summary_chunks(chunk_size, apps=global_apps):
+    Enrollment = apps.get_model('attendance', 'Enrollment')
+    bounds = Enrollment.objects.aggregate(low=Min('pk'), high=Max('pk'))
+    if bounds['high'] is None:
+        return []
+    return [(low, low + chunk_size) for low in range(bounds['low'], bounds['high'] + 1, chunk_size)]
+
+
+def enrollment_ids_in_range(low, high, apps=global_apps):
+    Enrollment = apps.get_model('attendance', 'Enrollment')
+    return list(Enrollment.objects.filter(pk__gte=low, pk__lt=high).values_list('pk', flat=True))
+
+
+# Enrollment ids in [low, high) whose stored summary differs from the raw rows.
+def summary_mismatches(low, high):
+    enrollment_ids = enrollment_ids_in_range(low, high)
+    stored = {
+        row[0]: row[1:]
+        for row in AttendanceSummary.objects.filter(enrollment_id__in=enrollment_ids)
+        .values_list('enrollment_id', 'present_count', 'absent_count', 'last_date')
+    }
+    return [
+        summary.enrollment_id
+        for summary in build_summaries(enrollment_ids)
+        if stored.get(summary.enrollment_id)
+        != (summary.present_count, summary.absent_count, summary.last_date)
+    ]
+
+
+# A student's whole-enrollment standing in each enrollment, narrowed to the
+# semester and course of the history filters, read from the summaries in one
+# query however much attendance lies behind them. Rows have the keys of the
+# storage backends' student totals.
+def student_standings(student, filters):
+    summaries = AttendanceSummary.objects.filter(enrollment__student=student)
+    if filters.get('semester'):
+        summaries = summaries.filter(enrollment__enrolled_class__semester=filters['semester'])
+    if filters.get('course'):
+        summaries = summaries.filter(enrollment__enrolled_class__course=filters['course'])
+    return summaries.values(
+        'enrollment_id', 'present_count', 'absent_count', 'percentage',
+        course_name=F('enrollment__enrolled_class__course__name'),
+        class_number=F('enrollment__enrolled_class__number'),
+    ).order_by('course_name', 'enrollment_id')
@@ -0,0 +1,189 @@
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from itertools import combinations, islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, User
+from django.db import transaction
+from django.db.models import Max
+
+from .bitmaps import BITMAP, attendance_storage, encode_days
+from .caching import invalidate
+from .models import Attendance, AttendanceBitmap, Class, Course, Enrollment, Lecturer, Semester, Student
+from .roles import LECTURER_GROUP, STUDENT_GROUP
+from .services import generate_college_days
+from .summaries import refresh_summaries
+
+
+@dataclass
+class Institution:
+    semesters: list
+    courses: list
+    classes: list
+    lecturers: list
+    students: int = 0
+    enrollments: int = 0
+    college_days: int = 0
+    attendance: int = 0
+
+
+# Create a synthetic institution with bulk inserts: semesters of 16 weeks,
+# courses offered in every semester, classes taught by the lecturers in turn,
+# and students enrolled in enrollments_per_student classes of different
+# courses each semester. Every class meets sessions_per_week weekdays, and
+# attendance is written for each session until attendance_rows is reached.
+# Each student attends with their own probability, so some fall below the
+# absence threshold. Attendance goes to the ATTENDANCE_STORAGE backend.
+# Users get the given password, or an unusable one, and are added to the
+# lecturer and student groups.
+def generate_institution(prefix='synth', semesters=2, courses=20, classes_per_course=2, lecturers=20,
+                         students=1000, enrollments_per_student=4, sessions_per_week=2,
+                         attendance_rows=100000, seed=0, batch_size=5000, password=None, progress=None):
+    rng = random.Random(seed)
+    progress = progress or (lambda message: None)
+    password = make_password(password)
+
+    with transaction.atomic():
+        lecturer_group, _ = Group.objects.get_or_create(name=LECTURER_GROUP)
+        student_group, _ = Group.objects.get_or_create(name=STUDENT_GROUP)
+
+        start = date(2024, 2, 26)
+        semester_objs = Semester.objects.bulk_create([
+            Semester(year=(start + timedelta(weeks=20 * i)).year, name=f'{prefix} semester {i + 1}',
+                     start_date=start + timedelta(weeks=20 * i),
+                     end_date=start + timedelta(weeks=20 * i + 16, days=-3))
+            for i in range(semesters)
+        ])
+        course_objs = Course.objects.bulk_create([
+            Course(code=f'{prefix[:4].upper()}{i + 1:03d}', name=f'{prefix} course {i + 1}')
+            for i in range(courses)
+        ])
+        Course.semesters.through.objects.bulk_create([
+            Course.semesters.through(course_id=course.pk, semester_id=semester.pk)
+            for course in course_objs for semester in semester_objs
+        ])
+
+        first_staff_id = (Lecturer.objects.aggregate(last=Max('staff_id'))['last'] or 0) + 1
+        lecturer_users = User.objects.bulk_create([
+            User(username=f'{prefix}-lecturer-{i}', password=password) for i in range(lecturers)
+        ])
+        lecturer_objs = Lecturer.objects.bulk_create([
+            Lecturer(staff_id=first_staff_id + i, user=user, full_name=f'Lecturer {i}')
+            for i, user in enumerate(lecturer_users)
+        ])
+        User.groups.through.objects.bulk_create([
+            User.groups.through(user_id=user.pk, group_id=lecturer_group.pk) for user in lecturer_users
+        ])
+
+        class_objs = Class.objects.bulk_create([
+            Class(number=number + 1, course=course, semester=semester,
+                  lecturer=lecturer_objs[index % len(lecturer_objs)])
+            for index, (semester, course, number) in enumerate(
+                (semester, course, number)
+                for semester in semester_objs for course in course_objs for number in range(classes_per_course)
+            )
+        ])
+        institution = Institution(semester_objs, course_objs, class_objs, lecturer_objs)
+        progress(f'{len(semester_objs)} semesters, {len(course_objs)} courses, '
+                 f'{len(lecturer_objs)} lecturers, {len(class_objs)} classes')
+
+        student_ids = []
+        for low in range(0, students, batch_size):
+            users = User.objects.bulk_create([
+                User(username=f'{prefix}-student-{i}', password=password)
+                for i in range(low, min(low + batch_size, students))
+            ])
+            student_ids += [student.pk for student in Student.objects.bulk_create([
+                Student(student_id=f'{prefix[:2].upper()}{i:08d}', user=user, full_name=f'Student {i}')
+                for i, user in enumerate(users, start=low)
+            ])]
+            User.groups.through.objects.bulk_create([
+                User.groups.through(user_id=user.pk, group_id=student_group.pk) for user in users
+            ])
+        institution.students = len(student_ids)
+        progress(f'{institution.students} students')
+
+        # Classes of each (semester, course), to pick from when enrolling.
+        offered = {}
+        for class_obj in class_objs:
+            offered.setdefault(class_obj.semester_id, {}).setdefault(class_obj.course_id, []).append(class_obj)
+        roster = {class_obj.pk: [] for class_obj in class_objs}
+        per_student = min(enrollments_per_student, courses)
+        for semester in semester_objs:
+            for low in range(0, len(student_ids), batch_size):
+                enrollments = [
+                    Enrollment(student_id=student_id, enrolled_class=rng.choice(offered[semester.pk][course.pk]))
+                    for student_id in student_ids[low:low + batch_size]
+                    for course in rng.sample(course_objs, per_student)
+                ]
+                for enrollment in Enrollment.objects.bulk_create(enrollments):
+                    roster[enrollment.enrolled_class_id].append(enrollment.pk)
+                institution.enrollments += len(enrollments)
+        progress(f'{institution.enrollments} enrollments')
+
+        # Each class meets on one of the weekday patterns, e.g. Mon and Wed.
+        patterns = list(combinations(range(5), sessions_per_week))
+        schedule = {}
+        for class_obj in class_objs:
+            schedule.setdefault(rng.choice(patterns), []).append(class_obj)
+        sessions = {}
+        for weekdays, pattern_classes in schedule.items():
+            institution.college_days += generate_college_days(pattern_classes, weekdays)
+            for class_obj in pattern_classes:
+                semester = class_obj.semester
+                sessions[class_obj.pk] = [
+                    semester.start_date + timedelta(days=offset)
+                    for offset in range((semester.end_date - semester.start_date).days + 1)
+                    if (semester.start_date + timedelta(days=offset)).weekday() in weekdays
+                ]
+        progress(f'{institution.college_days} college days')
+
+        def attendance():
+            for class_obj in class_objs:
+                rates = [(enrollment_id, rng.betavariate(9, 1.2)) for enrollment_id in roster[class_obj.pk]]
+                for day in sessions[class_obj.pk]:
+                    for enrollment_id, rate in rates:
+                        yield (enrollment_id, day, class_obj.semester.start_date,
+                               'Present' if rng.random() < rate else 'Absent')
+
+        # In bitmap storage each enrollment's days are collected and written
+        # as one bitmap at the end.
+        bitmap_days = {} if attendance_storage() == BITMAP else None
+        rows = islice(attendance(), attendance_rows)
+        while batch := list(islice(rows, batch_size)):
+            if bitmap_days is None:
+                Attendance.objects.bulk_create([
+                    Attendance(enrollment_id=enrollment_id, date=day, status=status)
+                    for enrollment_id, day, _, status in batch
+                ])
+            else:
+                for enrollment_id, day, start_date, status in batch:
+                    bitmap_days.setdefault(enrollment_id, {})[(day - start_date).days] = status
+            institution.attendance += len(batch)
+            if institution.attendance % (batch_size * 100) == 0:
+                progress(f'{institution.attendance} attendance rows')
+        if bitmap_days:
+            AttendanceBitmap.objects.bulk_create(
+                [AttendanceBitmap(enrollment_id=enrollment_id, days=encode_days(days))
+                 for enrollment_id, days in bitmap_days.items()],
+                batch_size=batch_size,
+            )
+        progress(f'{institution.attendance} attendance rows')
+
+        enrollment_ids = [enrollment_id for ids in roster.values() for enrollment_id in ids]
+        for low in range(0, len(enrollment_ids), 1000):
+            refresh_summaries(enrollment_ids[low:low + 1000])
+        invalidate(Semester, Course, Class, Lecturer, Student, Enrollment)
+
+    return institution
+
+
+# Remove everything generate_institution created with this prefix, for
+# benchmarks that have to commit their data so other processes can see it.
+def delete_institution(prefix):
+    with transaction.atomic():
+        Semester.objects.filter(name__startswith=f'{prefix} semester ').delete()
+        Course.objects.filter(name__startswith=f'{prefix} course ').delete()
+        User.objects.filter(username__startswith=f'{prefix}-lecturer-').delete()
+        User.objects.filter(username__startswith=f'{prefix}-student-').delete()
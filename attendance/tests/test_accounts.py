@@ -0,0 +1,46 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from attendance.accounts import hash_passwords, password_setup_links, provision_users
+
+
+class ProvisionUsersTests(TestCase):
+    def test_creates_users_in_batches(self):
+        users = provision_users(
+            [{'username': f'user{i}', 'email': f'user{i}@example.com'} for i in range(5)], batch_size=2,
+        )
+
+        self.assertEqual([user.username for user in users], [f'user{i}' for i in range(5)])
+        self.assertTrue(all(user.pk for user in users))
+        self.assertEqual(User.objects.get(username='user3').email, 'user3@example.com')
+
+    def test_passwords(self):
+        provision_users([{'username': 'with-password', 'password': 's3cret-pass'}, {'username': 'without'}])
+
+        self.assertTrue(User.objects.get(username='with-password').check_password('s3cret-pass'))
+        self.assertFalse(User.objects.get(username='without').has_usable_password())
+
+    def test_hashing_on_a_process_pool(self):
+        hashed = hash_passwords(['one', None, 'two', 'three'], processes=2, chunksize=1)
+
+        user = User(username='pool')
+        for encoded, raw in zip(hashed, ['one', None, 'two', 'three']):
+            user.password = encoded
+            self.assertEqual(user.has_usable_password(), raw is not None)
+            if raw is not None:
+                self.assertTrue(user.check_password(raw))
+
+    def test_password_setup_links(self):
+        [user] = provision_users([{'username': 'newcomer'}])
+        link = password_setup_links([user])[user.pk]
+
+        response = self.client.get(link, follow=True)
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(response.redirect_chain[-1][0],
+                                    {'new_password1': 'A-long-new-pass-42', 'new_password2': 'A-long-new-pass-42'})
+
+        self.assertRedirects(response, reverse('password_setup_done'), fetch_redirect_response=False)
+        user.refresh_from_db()
+        self.assertTrue(user.check_password('A-long-new-pass-42'))
+        self.assertEqual(self.client.get(link).context['validlink'], False)
@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+from django.test import TestCase
+
+from attendance.analytics import compute_semester_snapshots, load_semester_arrays
+from attendance.bench import make_roster
+from attendance.models import Attendance, AttendanceSnapshot, Enrollment
+
+
+class AnalyticsTests(TestCase):
+    def setUp(self):
+        self.class_obj = make_roster(2)
+        self.semester = self.class_obj.semester
+        self.first, self.second = (
+            Enrollment.objects.filter(enrolled_class=self.class_obj).order_by('id').values_list('id', flat=True)
+        )
+
+    def attend(self, enrollment_id, statuses):
+        Attendance.objects.bulk_create([
+            Attendance(enrollment_id=enrollment_id, date=self.semester.start_date + timedelta(days=day), status=status)
+            for day, status in statuses.items()
+        ])
+
+    def test_records_outside_the_semester_are_left_out(self):
+        self.attend(self.first, {-3: 'Absent', 8: 'Present'})
+
+        arrays = load_semester_arrays(self.semester)
+
+        self.assertEqual(arrays.day.tolist(), [8])
+        self.assertEqual(arrays.present.tolist(), [1])
+
+    def test_snapshots(self):
+        self.class_obj.course.absence_threshold = 0.5
+        self.class_obj.course.save()
+        self.attend(self.first, {0: 'Present', 1: 'Present', 7: 'Absent'})
+        self.attend(self.second, {0: 'Absent', 1: 'Absent'})
+
+        compute_semester_snapshots(self.semester)
+
+        course = AttendanceSnapshot.objects.get(semester=self.semester, scope=AttendanceSnapshot.COURSE)
+        self.assertEqual((course.enrollment_count, course.record_count, course.at_risk_count), (2, 5, 1))
+        self.assertEqual(course.mean_rate, 0.3333)
+        self.assertEqual(course.median_rate, 0.3333)
+        self.assertEqual(course.weekly_rates, [0.5, 0.0])
+        self.assertEqual(
+            AttendanceSnapshot.objects.get(semester=self.semester, scope=AttendanceSnapshot.CLASS).class_info_id,
+            self.class_obj.pk,
+        )
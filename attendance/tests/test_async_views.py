@@ -0,0 +1,100 @@
+from datetime import date
+from importlib import import_module, reload
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import clear_url_caches, resolve, reverse
+
+from attendance import async_views
+from attendance.bench import make_class, make_roster
+from attendance.models import Attendance, CollegeDay, Enrollment, OutgoingEmail
+from attendance.roles import LECTURER_GROUP
+from attendance.services import record_attendance
+
+
+# attendance.urls picks the hot views when it is imported, so the URLconfs
+# are reloaded with ATTENDANCE_ASYNC_VIEWS on, and again after the tests.
+def route_async_views(enabled):
+    with override_settings(ATTENDANCE_ASYNC_VIEWS=enabled):
+        reload(import_module('attendance.urls'))
+        reload(import_module(settings.ROOT_URLCONF))
+    clear_url_caches()
+
+
+class AsyncViewTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        route_async_views(True)
+        cls.addClassCleanup(route_async_views, False)
+
+    def setUp(self):
+        cache.clear()
+        self.class_obj = make_roster(2)
+        self.enrollment_ids = list(
+            Enrollment.objects.filter(enrolled_class=self.class_obj).order_by('id').values_list('id', flat=True)
+        )
+        self.lecturer = self.class_obj.lecturer.user
+        self.lecturer.groups.add(Group.objects.create(name=LECTURER_GROUP))
+        present, absent = self.enrollment_ids
+        record_attendance(self.class_obj.pk, date(2024, 3, 5), {present: 'Present', absent: 'Absent'})
+        User.objects.filter(student__enrollment=absent).update(email='absent@example.com')
+
+    def test_hot_views_are_routed_to_async_views(self):
+        for name, args in [('home', []), ('enter_attendance', [self.class_obj.pk]),
+                           ('view_attendance', []), ('email_poor_attendance', [])]:
+            with self.subTest(name=name):
+                view = resolve(reverse(name, args=args)).func
+                self.assertIs(view, getattr(async_views, view.__name__))
+
+    async def test_home_shows_the_user_roles(self):
+        await self.async_client.aforce_login(self.lecturer)
+
+        response = await self.async_client.get(reverse('home'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['request'].roles.is_lecturer)
+
+    async def test_enter_attendance(self):
+        college_day = await CollegeDay.objects.acreate(class_info=self.class_obj, date=date(2024, 3, 4))
+        await self.async_client.aforce_login(self.lecturer)
+        url = reverse('enter_attendance', args=[self.class_obj.pk])
+
+        self.assertEqual((await self.async_client.get(url)).status_code, 200)
+        response = await self.async_client.post(url, {
+            'college_day': college_day.pk,
+            **{f'attendance_{enrollment_id}': 'Absent' for enrollment_id in self.enrollment_ids},
+        })
+
+        self.assertRedirects(response, reverse('lecturer_dashboard'), fetch_redirect_response=False)
+        self.assertEqual(await Attendance.objects.filter(status='Absent', date=date(2024, 3, 4)).acount(), 2)
+
+    async def test_enter_attendance_of_another_lecturers_class(self):
+        other = await sync_to_async(make_class)('other')
+        await self.async_client.aforce_login(self.lecturer)
+
+        response = await self.async_client.get(reverse('enter_attendance', args=[other.pk]))
+
+        self.assertEqual(response.status_code, 404)
+
+    async def test_student_view_attendance(self):
+        student_user = await User.objects.aget(student__enrollment__id=self.enrollment_ids[0])
+        await self.async_client.aforce_login(student_user)
+
+        response = await self.async_client.get(reverse('view_attendance'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['status'] for row in response.context['attendance_records']], ['Present'])
+        self.assertEqual([row['present_count'] for row in response.context['summaries']], [1])
+
+    async def test_email_poor_attendance(self):
+        await self.async_client.aforce_login(await User.objects.acreate(username='admin', is_superuser=True))
+
+        response = await self.async_client.get(reverse('email_poor_attendance'))
+
+        self.assertRedirects(response, reverse('student_list'), fetch_redirect_response=False)
+        self.assertEqual([email async for email in OutgoingEmail.objects.values_list('recipient', flat=True)],
+                         ['absent@example.com'])
@@ -0,0 +1,82 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from attendance.caching import cache_stats
+from attendance.models import Course, Semester
+
+
+class CachedFragmentTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_superuser(username='admin'))
+        self.semester = Semester.objects.create(year=2024, name='Autumn',
+                                                start_date=date(2024, 7, 22), end_date=date(2024, 11, 15))
+        self.course = Course.objects.create(code='CS101', name='Programming')
+        self.course.semesters.add(self.semester)
+        # The fixtures above schedule invalidations that never run in a
+        # TestCase; start every test from a freshly cached page instead.
+        cache.clear()
+
+    def get_courses(self, **params):
+        response = self.client.get(reverse('course_list'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode()
+
+    def test_second_request_is_a_hit(self):
+        self.assertIn('Programming', self.get_courses())
+        self.assertIn('Programming', self.get_courses())
+        self.assertEqual(cache_stats()['course_list'], {'hits': 1, 'misses': 1})
+
+    def test_unknown_parameters_share_the_entry(self):
+        self.get_courses()
+        content = self.get_courses(sort='name', utm_source='mail')
+        self.assertEqual(cache_stats()['course_list'], {'hits': 1, 'misses': 1})
+        self.assertNotIn('utm_source', content)
+
+    def test_cursor_is_cached_separately(self):
+        self.get_courses()
+        self.get_courses(after='1')
+        self.assertEqual(cache_stats()['course_list'], {'hits': 0, 'misses': 2})
+
+    def test_created_course_is_listed_after_commit(self):
+        self.get_courses()
+        with self.captureOnCommitCallbacks(execute=True):
+            Course.objects.create(code='CS102', name='Data Structures')
+        self.assertIn('Data Structures', self.get_courses())
+        self.assertEqual(cache_stats()['course_list']['misses'], 2)
+
+    def test_edited_course_is_listed_after_commit(self):
+        self.get_courses()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('course_update', args=[self.course.pk]), {
+                'code': 'CS101', 'name': 'Intro to Programming', 'semesters': [self.semester.pk],
+            })
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('Intro to Programming', self.get_courses())
+
+    def test_semester_change_invalidates_the_course_list(self):
+        self.assertIn('2024 - Autumn', self.get_courses())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.semester.name = 'Spring'
+            self.semester.save()
+        self.assertIn('2024 - Spring', self.get_courses())
+
+    def test_semester_link_invalidates_the_course_list(self):
+        spring = Semester.objects.create(year=2025, name='Spring',
+                                         start_date=date(2025, 2, 24), end_date=date(2025, 6, 20))
+        cache.clear()
+        self.get_courses()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course.semesters.add(spring)
+        self.assertIn('2025 - Spring', self.get_courses())
+
+    def test_uncommitted_change_keeps_the_cached_page(self):
+        self.get_courses()
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            Course.objects.create(code='CS102', name='Data Structures')
+        self.assertTrue(callbacks)
+        self.assertNotIn('Data Structures', self.get_courses())
@@ -0,0 +1,49 @@
+from datetime import date
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from attendance.bench import make_class
+from attendance.models import CollegeDay
+from attendance.services import generate_college_days
+
+
+class GenerateCollegeDaysTests(TestCase):
+    def setUp(self):
+        self.class_obj = make_class()
+
+    def days(self):
+        return list(CollegeDay.objects.filter(class_info=self.class_obj).order_by('date').values_list('date', flat=True))
+
+    def test_days_on_the_weekdays_of_the_semester(self):
+        generate_college_days([self.class_obj], [0, 2])
+
+        days = self.days()
+        self.assertEqual(len(days), 34)
+        self.assertEqual((days[0], days[-1]), (date(2024, 2, 26), date(2024, 6, 19)))
+        self.assertEqual({day.weekday() for day in days}, {0, 2})
+
+    def test_rerunning_keeps_existing_days(self):
+        CollegeDay.objects.create(class_info=self.class_obj, date=date(2024, 3, 2))
+        generate_college_days([self.class_obj], [0])
+        generate_college_days([self.class_obj], [0])
+        self.assertEqual(len(self.days()), 18)
+
+        generate_college_days([self.class_obj], [0, 4])
+
+        days = self.days()
+        self.assertEqual(len(days), 35)
+        self.assertEqual(len(set(days)), 35)
+        self.assertIn(date(2024, 3, 2), days)
+
+    def test_command(self):
+        other = make_class('other')
+
+        call_command('generate_college_days', semester=self.class_obj.semester_id, weekdays=['tue'], stdout=StringIO())
+        call_command('generate_college_days', '--class', str(other.pk), '--weekdays', 'thu', stdout=StringIO())
+
+        self.assertEqual({day.weekday() for day in self.days()}, {1})
+        self.assertEqual(CollegeDay.objects.filter(class_info=other, date__week_day=5).count(), 17)
+        with self.assertRaises(CommandError):
+            call_command('generate_college_days', weekdays=['mon'], stdout=StringIO())
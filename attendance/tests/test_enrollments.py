@@ -0,0 +1,100 @@
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+
+from attendance.bench import count_queries, make_class, make_roster, make_students
+from attendance.forms import student_label
+from attendance.models import Enrollment, Student
+from attendance.services import enroll_students
+
+
+class EnrollStudentsTests(TestCase):
+    def setUp(self):
+        self.class_obj = make_roster(2)
+        self.enrolled = list(
+            Enrollment.objects.filter(enrolled_class=self.class_obj).values_list('student_id', flat=True)
+        )
+        self.new = [student.pk for student in make_students(3, prefix='new')]
+
+    def test_enrolls_only_missing_students(self):
+        self.assertEqual(enroll_students(self.class_obj.pk, self.new + self.enrolled + self.new[:1]), (3, 2))
+        self.assertEqual(enroll_students(self.class_obj.pk, self.new), (0, 3))
+
+        self.assertEqual(Enrollment.objects.filter(enrolled_class=self.class_obj).count(), 5)
+
+    def test_query_count_does_not_grow_with_the_cohort(self):
+        more = [student.pk for student in make_students(40, prefix='more')]
+
+        small = count_queries(lambda: enroll_students(self.class_obj.pk, self.new[:1], batch_size=100))
+
+        self.assertEqual(count_queries(lambda: enroll_students(self.class_obj.pk, more, batch_size=100)), small)
+
+
+class BulkEnrollTests(TestCase):
+    def setUp(self):
+        self.class_obj = make_class('target')
+        self.source = make_roster(2, prefix='source')
+        self.students = make_students(3, prefix='new')
+        self.client.force_login(User.objects.create_superuser('enroll-admin'))
+
+    def post(self, **data):
+        return self.client.post(reverse('bulk_enroll'), {'enrolled_class': self.class_obj.pk, **data})
+
+    def enrolled(self):
+        return set(Enrollment.objects.filter(enrolled_class=self.class_obj).values_list('student__student_id', flat=True))
+
+    def test_enrolls_pasted_ids_file_and_class(self):
+        first, second, third = (student.student_id for student in self.students)
+        upload = SimpleUploadedFile('cohort.csv', f'student_id\n{second}\n{third}\n'.encode())
+
+        response = self.post(student_ids=f'{first}, {second}', file=upload, source_class=self.source.pk)
+
+        self.assertEqual(response.context['result']['created'], 5)
+        self.assertEqual(self.enrolled(), {first, second, third, 'so00000000', 'so00000001'})
+        response = self.post(student_ids=first)
+        self.assertEqual((response.context['result']['created'], response.context['result']['existing']), (0, 1))
+
+    def test_unknown_student_ids(self):
+        response = self.post(student_ids=f'{self.students[0].student_id} X1 X2')
+
+        self.assertFormError(response.context['form'], None, 'Unknown student IDs: X1, X2.')
+        self.assertEqual(self.enrolled(), set())
+
+    def test_needs_students(self):
+        response = self.post()
+
+        self.assertFormError(response.context['form'], None,
+                             'Give student IDs, a file or a class to enroll students from.')
+
+
+class AutocompleteTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('autocomplete-admin'))
+
+    def results(self, url_name, q):
+        response = self.client.get(reverse(url_name), {'q': q})
+        self.assertEqual(response.status_code, 200)
+        return [result['text'] for result in response.json()['results']]
+
+    def test_students_by_id_prefix_or_name(self):
+        students = make_students(25, prefix='auto')
+        Student.objects.filter(pk=students[3].pk).update(full_name='Grace Hopper')
+
+        self.assertEqual(self.results('student_autocomplete', 'hopper'), ['Grace Hopper (au00000003)'])
+        self.assertEqual(self.results('student_autocomplete', 'au0000001'),
+                         [student_label(student) for student in students[10:20]])
+        self.assertEqual(len(self.results('student_autocomplete', '')), 20)
+
+    def test_classes_match_every_word(self):
+        make_class('autoclass')
+        make_class('other')
+
+        self.assertEqual(len(self.results('class_autocomplete', 'autoclass 1')), 1)
+        self.assertEqual(len(self.results('class_autocomplete', 'autoclass 2')), 0)
+        self.assertEqual(len(self.results('class_autocomplete', '2024')), 2)
+
+    def test_needs_staff(self):
+        self.client.force_login(User.objects.create_user('not-staff'))
+
+        self.assertEqual(self.client.get(reverse('student_autocomplete')).status_code, 302)
@@ -0,0 +1,70 @@
+import sys
+from datetime import date
+from io import BytesIO
+from unittest import mock, skipUnless
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from attendance.bench import make_roster
+from attendance.exports import EXPORT_COLUMNS, iter_csv
+from attendance.models import Enrollment
+from attendance.services import record_attendance
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.class_obj = make_roster(2)
+        other_class = make_roster(1, prefix='other')
+        for class_obj in (self.class_obj, other_class):
+            enrollment_ids = Enrollment.objects.filter(enrolled_class=class_obj).values_list('id', flat=True)
+            record_attendance(class_obj.pk, date(2024, 3, 4), {enrollment_id: 'Present' for enrollment_id in enrollment_ids})
+        self.client.force_login(User.objects.create_superuser('export-admin'))
+
+    def export(self, **params):
+        return self.client.get(reverse('export_attendance'), {'semester': self.class_obj.semester_id, **params})
+
+    def test_csv_is_streamed(self):
+        response = self.export(format='csv')
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="attendance.csv"')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], ','.join(name for name, _ in EXPORT_COLUMNS))
+        self.assertEqual(sorted(line.split(',')[2] for line in lines[1:]), ['be00000000', 'be00000001'])
+
+    def test_csv_blocks(self):
+        rows = [(date(2024, 3, day), 'Present') for day in range(1, 6)]
+
+        blocks = list(iter_csv(rows, rows_per_block=2))
+
+        self.assertEqual(len(blocks), 3)
+        self.assertEqual(''.join(blocks).splitlines()[1:], [f'2024-03-0{day},Present' for day in range(1, 6)])
+
+    @skipUnless(pq, 'needs pyarrow')
+    def test_parquet(self):
+        response = self.export(format='parquet')
+
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="attendance.parquet"')
+        table = pq.read_table(BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(table.column_names, [name for name, _ in EXPORT_COLUMNS])
+        self.assertEqual(sorted(table.column('student_id').to_pylist()), ['be00000000', 'be00000001'])
+        self.assertEqual(set(table.column('date').to_pylist()), {date(2024, 3, 4)})
+
+    def test_parquet_without_pandas(self):
+        with mock.patch.dict(sys.modules, {'pandas': None}):
+            response = self.export(format='parquet')
+
+        self.assertEqual(response.status_code, 501)
+
+    def test_needs_staff(self):
+        self.client.force_login(User.objects.create_user('not-staff'))
+
+        self.assertEqual(self.export(format='csv').status_code, 302)
+
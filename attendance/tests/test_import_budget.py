@@ -0,0 +1,23 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+
+from attendance.management.commands.check_import_budget import HEAVY_MODULES, Command
+
+
+class ImportBudgetTests(SimpleTestCase):
+    def test_worker_boots_within_budget(self):
+        out = StringIO()
+        call_command('check_import_budget', stdout=out)
+        self.assertIn('Within budget.', out.getvalue())
+
+    def test_heavy_modules_are_not_imported_at_startup(self):
+        total_us, rss_kb, heavy, modules = Command().boot()
+        self.assertEqual(heavy, [])
+        self.assertTrue(modules)
+        self.assertFalse({name for _, name in modules} & set(HEAVY_MODULES))
+
+    def test_over_budget_fails(self):
+        with self.assertRaisesMessage(CommandError, 'over the 1 ms budget'):
+            call_command('check_import_budget', max_import_ms=1, repeat=1, stdout=StringIO())
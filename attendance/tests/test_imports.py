@@ -0,0 +1,187 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from attendance.bench import make_students
+from attendance.importers import fail_stale_import_jobs, import_students
+from attendance.models import Student, StudentImportJob
+
+
+def csv_file(*rows):
+    return BytesIO('\n'.join(['student_id,full_name,username', *rows]).encode())
+
+
+def xlsx_file(*rows):
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(['student_id', 'full_name', 'username'])
+    for row in rows:
+        sheet.append(row)
+    output = BytesIO()
+    workbook.save(output)
+    output.seek(0)
+    return output
+
+
+class ImportStudentsTests(TestCase):
+    def students(self):
+        return sorted(Student.objects.values_list('student_id', 'full_name', 'user__username'))
+
+    def test_csv_in_several_chunks(self):
+        progress = []
+        result = import_students(
+            csv_file(*[f'S{i},Student {i},user{i}' for i in range(5)]), 'students.csv', chunk_size=2,
+            progress=lambda result: progress.append((result.processed, result.created)),
+        )
+
+        self.assertEqual((result.created, result.skipped, result.errors), (5, 0, []))
+        self.assertEqual(progress, [(2, 2), (4, 4), (5, 5)])
+        self.assertEqual(self.students(), [(f'S{i}', f'Student {i}', f'user{i}') for i in range(5)])
+        self.assertFalse(User.objects.get(username='user0').has_usable_password())
+
+    def test_xlsx_in_several_chunks(self):
+        file = xlsx_file([1001, 'Ada Lovelace', 'ada'], [None, None, None], [1002.0, ' Alan Turing ', 'alan'],
+                         ['S3', 'Grace Hopper', 'grace'])
+
+        result = import_students(file, 'Students.XLSX', chunk_size=2)
+
+        self.assertEqual((result.created, result.errors), (3, []))
+        self.assertEqual(self.students(), [('1001', 'Ada Lovelace', 'ada'), ('1002', 'Alan Turing', 'alan'),
+                                           ('S3', 'Grace Hopper', 'grace')])
+
+    def test_duplicates_in_the_file(self):
+        result = import_students(csv_file(
+            'S1,First,one',
+            'S1,Same chunk,two',
+            'S2,Second,three',
+            'S1,Later chunk,four',
+            'S3,Taken username,three',
+        ), 'students.csv', chunk_size=3)
+
+        self.assertEqual(result.created, 2)
+        self.assertEqual(result.errors, [
+            (3, 'Student ID S1 appears more than once'),
+            (5, 'Student ID S1 appears more than once'),
+            (6, 'Username three is already taken'),
+        ])
+        self.assertEqual(self.students(), [('S1', 'First', 'one'), ('S2', 'Second', 'three')])
+
+    def test_duplicates_of_the_database(self):
+        [existing] = make_students(1, prefix='db')
+        User.objects.create(username='taken')
+
+        result = import_students(csv_file(
+            f'{existing.student_id},New Name,someone',
+            'S2,Student,taken',
+            'S3,Student,db-student-0',
+        ), 'students.csv')
+
+        self.assertEqual((result.created, result.updated, result.skipped), (0, 0, 1))
+        self.assertEqual(result.errors, [(3, 'Username taken is already taken'),
+                                         (4, 'Username db-student-0 is already taken')])
+        existing.refresh_from_db()
+        self.assertEqual(existing.full_name, 'Student 0')
+
+    def test_update_existing(self):
+        [existing] = make_students(1, prefix='db')
+
+        result = import_students(csv_file(f'{existing.student_id},New Name,ignored', 'S2,Student 2,new'),
+                                 'students.csv', update_existing=True)
+
+        self.assertEqual((result.created, result.updated, result.skipped), (1, 1, 0))
+        existing.refresh_from_db()
+        self.assertEqual(existing.full_name, 'New Name')
+        self.assertFalse(User.objects.filter(username='ignored').exists())
+
+    def test_error_report(self):
+        result = import_students(csv_file(
+            'S1,,one',
+            ',,',
+            'S123456789012,Too Long,two',
+            'S4,Student 4,' + 'u' * 200,
+            'S5,Student 5,five',
+        ), 'students.csv', chunk_size=2)
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual(result.processed, 5)
+        self.assertEqual(result.errors, [
+            (2, 'Missing full_name'),
+            (3, 'Missing student_id, full_name, username'),
+            (4, 'student_id is too long'),
+            (5, 'username is too long'),
+        ])
+
+
+class StaleImportJobTests(TestCase):
+    def job(self, status, minutes_ago):
+        return StudentImportJob.objects.create(
+            file='imports/students.csv', original_name='students.csv', status=status,
+            started_at=timezone.now() - timedelta(minutes=minutes_ago),
+        )
+
+    def test_fails_jobs_running_past_the_timeout(self):
+        stalled = self.job(StudentImportJob.RUNNING, 120)
+        running = self.job(StudentImportJob.RUNNING, 5)
+        done = self.job(StudentImportJob.DONE, 120)
+
+        self.assertEqual(fail_stale_import_jobs(timeout=3600), 1)
+
+        stalled.refresh_from_db()
+        self.assertEqual(stalled.status, StudentImportJob.FAILED)
+        self.assertIsNotNone(stalled.finished_at)
+        self.assertEqual(len(stalled.errors), 1)
+        running.refresh_from_db()
+        done.refresh_from_db()
+        self.assertEqual((running.status, done.status), (StudentImportJob.RUNNING, StudentImportJob.DONE))
+
+
+# Uploads are stored under a temporary MEDIA_ROOT.
+class ImportJobTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, media_root)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=media_root))
+
+    def test_upload_is_imported_by_the_worker(self):
+        self.client.force_login(User.objects.create_superuser('import-admin'))
+        upload = SimpleUploadedFile('students.csv', (
+            b'student_id,full_name,username\n'
+            b'S1,Ada Lovelace,ada\n'
+            b',Missing Id,nobody\n'
+            b'S2,Alan Turing,alan\n'
+        ))
+        response = self.client.post(reverse('upload_students'), {'file': upload})
+        job = response.context['job']
+        self.assertEqual(job.status, StudentImportJob.QUEUED)
+
+        call_command('run_import_jobs', once=True, chunk_size=2, stdout=StringIO())
+
+        status = self.client.get(reverse('import_job_status', args=[job.pk])).json()
+        self.assertEqual(status['status'], StudentImportJob.DONE)
+        self.assertEqual((status['rows_processed'], status['rows_failed'], status['created']), (3, 1, 2))
+        self.assertEqual(status['errors'], [[3, 'Missing student_id']])
+        self.assertEqual(sorted(Student.objects.values_list('student_id', 'user__username')),
+                         [('S1', 'ada'), ('S2', 'alan')])
+
+    def test_unreadable_file_fails_the_job(self):
+        job = StudentImportJob.objects.create(file=SimpleUploadedFile('students.xlsx', b'not a workbook'),
+                                              original_name='students.xlsx')
+
+        call_command('run_import_jobs', once=True, stdout=StringIO())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, StudentImportJob.FAILED)
+        self.assertEqual(len(job.errors), 1)
+        self.assertIsNotNone(job.finished_at)
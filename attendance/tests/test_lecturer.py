@@ -0,0 +1,60 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from attendance.bench import count_queries, make_roster, make_students
+from attendance.models import CollegeDay, Enrollment
+from attendance.services import record_attendance
+
+
+class LecturerMatrixTests(TestCase):
+    def setUp(self):
+        self.class_obj = make_roster(2)
+        self.other_class = make_roster(1, prefix='other')
+        self.first, self.second = (
+            Enrollment.objects.filter(enrolled_class=self.class_obj).order_by('id').values_list('id', flat=True)
+        )
+        CollegeDay.objects.bulk_create([
+            CollegeDay(class_info=self.class_obj, date=date(2024, 3, day)) for day in (4, 6)
+        ])
+        record_attendance(self.class_obj.pk, date(2024, 3, 4), {self.first: 'Present', self.second: 'Absent'})
+        self.client.force_login(self.class_obj.lecturer.user)
+
+    def matrix(self, class_obj):
+        return self.client.get(reverse('class_attendance_matrix', args=[class_obj.pk]))
+
+    def test_matrix_of_own_class(self):
+        response = self.matrix(self.class_obj)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['days'], [date(2024, 3, 4), date(2024, 3, 6)])
+        self.assertEqual([cells for _, _, cells in response.context['rows']], [['P', ''], ['A', '']])
+
+    def test_other_lecturers_class_is_not_found(self):
+        self.assertEqual(self.matrix(self.other_class).status_code, 404)
+        self.assertEqual(
+            self.client.get(reverse('enter_attendance', args=[self.other_class.pk])).status_code, 404,
+        )
+
+    def test_admin_sees_any_class(self):
+        self.client.force_login(User.objects.create_superuser('matrix-admin'))
+
+        self.assertEqual(self.matrix(self.other_class).status_code, 200)
+
+    def test_dashboard_lists_own_classes(self):
+        response = self.client.get(reverse('lecturer_dashboard'))
+
+        self.assertEqual([class_obj.pk for class_obj in response.context['classes']], [self.class_obj.pk])
+        self.assertEqual(response.context['classes'][0].student_count, 2)
+
+    def test_matrix_query_count_does_not_grow_with_the_roster(self):
+        self.matrix(self.class_obj)
+        small = count_queries(lambda: self.matrix(self.class_obj))
+        Enrollment.objects.bulk_create([
+            Enrollment(student=student, enrolled_class=self.class_obj)
+            for student in make_students(30, prefix='more')
+        ])
+
+        self.assertEqual(count_queries(lambda: self.matrix(self.class_obj)), small)
@@ -0,0 +1,90 @@
+from datetime import timedelta
+from smtplib import SMTPAuthenticationError, SMTPRecipientsRefused
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from attendance.models import OutgoingEmail
+from attendance.outbox import deliver_pending, queue_emails
+
+
+# locmem backend whose sends, or whose connection, fail.
+class RefusingBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise SMTPRecipientsRefused({})
+
+
+class UnreachableBackend(EmailBackend):
+    def open(self):
+        raise SMTPAuthenticationError(535, b'Authentication failed')
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+                   OUTBOX_RETRY_DELAY=60, OUTBOX_MAX_ATTEMPTS=3)
+class OutboxTests(TestCase):
+    def queue(self, *recipients):
+        return queue_emails(recipients, 'Attendance warning', 'Please attend.', 'office@example.com')
+
+    def make_due(self):
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+
+    def test_delivers_pending_messages(self):
+        self.queue('a@example.com', 'b@example.com')
+
+        self.assertEqual(deliver_pending(), 2)
+
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['a@example.com', 'b@example.com'])
+        self.assertFalse(OutgoingEmail.objects.exclude(status=OutgoingEmail.SENT).exists())
+        self.assertEqual(deliver_pending(), 0)
+
+    def test_queue_skips_recipients_with_pending_message(self):
+        self.assertEqual(self.queue('a@example.com', 'a@example.com'), 1)
+        self.assertEqual(self.queue('a@example.com', 'b@example.com'), 1)
+        self.assertEqual(OutgoingEmail.objects.count(), 2)
+
+    def test_failed_send_backs_off_exponentially(self):
+        self.queue('a@example.com')
+        email = OutgoingEmail.objects.get()
+
+        for attempt, delay in [(1, 60), (2, 120)]:
+            self.make_due()
+            before = timezone.now()
+            deliver_pending(RefusingBackend())
+            email.refresh_from_db()
+            self.assertEqual(email.status, OutgoingEmail.PENDING)
+            self.assertEqual(email.attempts, attempt)
+            self.assertGreaterEqual(email.next_attempt_at, before + timedelta(seconds=delay))
+            self.assertLess(email.next_attempt_at, before + timedelta(seconds=delay + 30))
+            # Not due again until the delay has passed.
+            self.assertEqual(deliver_pending(RefusingBackend()), 0)
+
+        self.make_due()
+        deliver_pending(RefusingBackend())
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutgoingEmail.FAILED)
+        self.assertEqual(email.attempts, 3)
+        self.assertEqual(mail.outbox, [])
+
+    def test_retry_after_failure_is_sent(self):
+        self.queue('a@example.com')
+        deliver_pending(RefusingBackend())
+        self.make_due()
+
+        self.assertEqual(deliver_pending(), 1)
+
+        email = OutgoingEmail.objects.get()
+        self.assertEqual((email.status, email.attempts), (OutgoingEmail.SENT, 2))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_connection_failure_does_not_use_an_attempt(self):
+        self.queue('a@example.com', 'b@example.com')
+
+        with self.assertRaises(SMTPAuthenticationError):
+            deliver_pending(UnreachableBackend())
+
+        for email in OutgoingEmail.objects.all():
+            self.assertEqual((email.status, email.attempts), (OutgoingEmail.PENDING, 0))
+            self.assertGreater(email.next_attempt_at, timezone.now())
+            self.assertIn('Authentication failed', email.last_error)
@@ -0,0 +1,86 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from attendance.bench import make_students
+from attendance.models import Student
+from attendance.pagination import KeysetPaginationMixin, decode_cursor, encode_cursor
+
+
+# Student list pages of two, ordered by student_id.
+@override_settings(ATTENDANCE_PAGE_SIZE=2)
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.ids = sorted(student.student_id for student in make_students(5, prefix='page'))
+        self.client.force_login(User.objects.create_superuser('page-admin'))
+
+    def page(self, **params):
+        response = self.client.get(reverse('student_list'), params)
+        self.assertEqual(response.status_code, 200)
+        page_obj = response.context['page_obj']
+        return [student.student_id for student in page_obj.object_list], page_obj
+
+    def test_next_and_previous_pages(self):
+        first, page_obj = self.page()
+        self.assertEqual(first, self.ids[:2])
+        self.assertFalse(page_obj.has_previous())
+
+        second, page_obj = self.page(after=page_obj.next_cursor)
+        self.assertEqual(second, self.ids[2:4])
+
+        third, page_obj = self.page(after=page_obj.next_cursor)
+        self.assertEqual(third, self.ids[4:])
+        self.assertFalse(page_obj.has_next())
+
+        back, page_obj = self.page(before=page_obj.previous_cursor)
+        self.assertEqual(back, self.ids[2:4])
+        self.assertTrue(page_obj.has_next())
+        self.assertTrue(page_obj.has_previous())
+
+    def test_invalid_cursors_show_the_first_page(self):
+        first, _ = self.page()
+        for cursor in ['not base64!', encode_cursor(5), encode_cursor({'a': 1}), encode_cursor([]),
+                       encode_cursor(['a', 'b']), encode_cursor([None]), encode_cursor([True])]:
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.page(after=cursor)[0], first)
+                self.assertEqual(self.page(before=cursor)[0], first)
+
+    def test_cursor_of_the_wrong_type_for_the_field(self):
+        response = self.client.get(reverse('class_list'), {'after': encode_cursor(['x'])})
+        self.assertEqual(response.status_code, 200)
+
+    def test_decode_cursor(self):
+        self.assertEqual(decode_cursor(encode_cursor(['2024-03-04', 7]), 2), ['2024-03-04', 7])
+        self.assertIsNone(decode_cursor(encode_cursor(['2024-03-04', 7]), 1))
+        self.assertIsNone(decode_cursor('', 1))
+
+
+class NamePages(KeysetPaginationMixin):
+    keyset_ordering = ('full_name', 'pk')
+
+    def __init__(self, **params):
+        self.request = RequestFactory().get('/', params)
+
+
+class CompositeKeysetTests(TestCase):
+    def test_pages_through_ties_on_the_first_field(self):
+        students = make_students(5, prefix='tie')
+        for student, name in zip(students, ['B', 'A', 'B', 'A', 'B']):
+            student.full_name = name
+        Student.objects.bulk_update(students, ['full_name'])
+        expected = list(Student.objects.order_by('full_name', 'pk').values_list('pk', flat=True))
+
+        seen = []
+        params = {}
+        while True:
+            _, page, object_list, _ = NamePages(**params).paginate_queryset(Student.objects.all(), 2)
+            seen += [student.pk for student in object_list]
+            if not page.has_next():
+                break
+            params = {'after': page.next_cursor}
+
+        self.assertEqual(seen, expected)
+        _, page, object_list, _ = NamePages(before=page.previous_cursor).paginate_queryset(Student.objects.all(), 2)
+        self.assertEqual([student.pk for student in object_list], expected[2:4])
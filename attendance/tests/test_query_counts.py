@@ -0,0 +1,63 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from attendance.bench import assert_constant_queries, make_class, make_students
+from attendance.caching import bump_versions
+from attendance.models import Class, Course, Enrollment
+
+
+# The list, form and autocomplete pages must issue the same number of queries
+# however many rows they show.
+class QueryCountTests(TestCase):
+    sizes = (10, 120)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_superuser('query-count-admin'))
+        # Every page reads request.roles; load the user's cached groups once
+        # so the first measurement does not include the cache miss.
+        self.client.get(reverse('home'))
+        self.base_class = make_class('querycount')
+
+    def assert_constant(self, url_names, grow):
+        urls = [reverse(url_name) for url_name in url_names]
+        assert_constant_queries(lambda: [self.client.get(url) for url in urls], grow, self.sizes)
+
+    def test_class_pages(self):
+        def grow(size):
+            existing = Class.objects.count()
+            Class.objects.bulk_create([
+                Class(number=number, course=self.base_class.course, semester=self.base_class.semester,
+                      lecturer=self.base_class.lecturer)
+                for number in range(existing + 1, size + 1)
+            ])
+
+        self.assert_constant(['class_list', 'class_autocomplete'], grow)
+
+    def test_enrollment_pages(self):
+        def grow(size):
+            existing = Enrollment.objects.count()
+            students = make_students(size - existing, prefix='querycount', start=existing)
+            Enrollment.objects.bulk_create(
+                [Enrollment(student=student, enrolled_class=self.base_class) for student in students]
+            )
+
+        self.assert_constant(['enrollment_list', 'enrollment_create', 'student_autocomplete'], grow)
+
+    def test_course_list(self):
+        def grow(size):
+            existing = Course.objects.count()
+            courses = Course.objects.bulk_create([
+                Course(code=f'QC{number}', name=f'Course {number}') for number in range(existing, size)
+            ])
+            Course.semesters.through.objects.bulk_create([
+                Course.semesters.through(course_id=course.pk, semester_id=self.base_class.semester_id)
+                for course in courses
+            ])
+            # Bulk writes skip the signals that invalidate the cached course
+            # list, and invalidate() waits for a commit that never comes.
+            bump_versions(Course)
+
+        self.assert_constant(['course_list'], grow)
@@ -0,0 +1,82 @@
+from datetime import date
+
+from django.test import TestCase
+from django.urls import reverse
+
+from attendance.bench import count_queries, make_roster, make_students
+from attendance.models import Attendance, AttendanceSummary, CollegeDay, Enrollment
+from attendance.services import record_attendance
+
+
+class RecordAttendanceTests(TestCase):
+    def setUp(self):
+        self.class_obj = make_roster(3)
+        self.first, self.second, self.third = (
+            Enrollment.objects.filter(enrolled_class=self.class_obj).order_by('id').values_list('id', flat=True)
+        )
+
+    def summary(self, enrollment_id):
+        summary = AttendanceSummary.objects.get(enrollment_id=enrollment_id)
+        return summary.present_count, summary.absent_count, summary.last_date, summary.percentage
+
+    def test_resubmitting_a_day_updates_rows_and_summaries(self):
+        day = date(2024, 3, 4)
+        record_attendance(self.class_obj.pk, day, {self.first: 'Present', self.second: 'Absent'})
+        record_attendance(self.class_obj.pk, day, {self.first: 'Absent', self.second: 'Absent',
+                                                   self.third: 'Present'})
+
+        self.assertEqual(Attendance.objects.count(), 3)
+        self.assertEqual(
+            dict(Attendance.objects.values_list('enrollment_id', 'status')),
+            {self.first: 'Absent', self.second: 'Absent', self.third: 'Present'},
+        )
+        self.assertEqual(self.summary(self.first), (0, 1, day, 0.0))
+        self.assertEqual(self.summary(self.second), (0, 1, day, 0.0))
+        self.assertEqual(self.summary(self.third), (1, 0, day, 100.0))
+
+    def test_summaries_accumulate_over_days(self):
+        record_attendance(self.class_obj.pk, date(2024, 3, 5), {self.first: 'Present'})
+        record_attendance(self.class_obj.pk, date(2024, 3, 4), {self.first: 'Absent'})
+        record_attendance(self.class_obj.pk, date(2024, 3, 6), {self.first: 'Present'})
+
+        present, absent, last_date, percentage = self.summary(self.first)
+        self.assertEqual((present, absent, last_date), (2, 1, date(2024, 3, 6)))
+        self.assertAlmostEqual(percentage, 200 / 3)
+
+    def test_unknown_statuses_are_ignored(self):
+        self.assertEqual(record_attendance(self.class_obj.pk, date(2024, 3, 4), {self.first: 'Late'}), 0)
+        self.assertFalse(Attendance.objects.exists())
+
+
+class EnterAttendanceTests(TestCase):
+    def setUp(self):
+        self.class_obj = make_roster(3)
+        self.college_day = CollegeDay.objects.create(class_info=self.class_obj, date=date(2024, 3, 4))
+        self.client.force_login(self.class_obj.lecturer.user)
+        self.url = reverse('enter_attendance', args=[self.class_obj.pk])
+
+    def submit(self, status, college_day=None):
+        data = {'college_day': (college_day or self.college_day).pk}
+        for enrollment_id in Enrollment.objects.filter(enrolled_class=self.class_obj).values_list('id', flat=True):
+            data[f'attendance_{enrollment_id}'] = status
+        return self.client.post(self.url, data)
+
+    def test_submitting_twice_updates_the_day(self):
+        self.assertRedirects(self.submit('Present'), reverse('lecturer_dashboard'), fetch_redirect_response=False)
+        self.submit('Absent')
+
+        self.assertEqual(list(Attendance.objects.values_list('date', 'status').distinct()),
+                         [(date(2024, 3, 4), 'Absent')])
+        self.assertEqual(Attendance.objects.count(), 3)
+        self.assertEqual(set(AttendanceSummary.objects.values_list('present_count', 'absent_count')), {(0, 1)})
+
+    def test_query_count_does_not_grow_with_the_roster(self):
+        later_day = CollegeDay.objects.create(class_info=self.class_obj, date=date(2024, 3, 6))
+        self.client.get(self.url)
+        small = count_queries(lambda: self.submit('Present'))
+        Enrollment.objects.bulk_create([
+            Enrollment(student=student, enrolled_class=self.class_obj)
+            for student in make_students(40, prefix='more')
+        ])
+
+        self.assertEqual(count_queries(lambda: self.submit('Present', later_day)), small)
@@ -0,0 +1,64 @@
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from attendance.roles import LECTURER_GROUP, STUDENT_GROUP, get_user_groups
+
+
+class RoleCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='member')
+        self.lecturers = Group.objects.create(name=LECTURER_GROUP)
+        self.students = Group.objects.create(name=STUDENT_GROUP)
+
+    def groups(self):
+        return get_user_groups(User.objects.get(pk=self.user.pk))
+
+    def test_groups_are_cached(self):
+        self.user.groups.add(self.lecturers)
+        self.assertEqual(self.groups(), {LECTURER_GROUP})
+
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_groups(user), {LECTURER_GROUP})
+
+    def test_membership_changes_from_the_user(self):
+        self.assertEqual(self.groups(), set())
+        self.user.groups.add(self.lecturers, self.students)
+        self.assertEqual(self.groups(), {LECTURER_GROUP, STUDENT_GROUP})
+        self.user.groups.remove(self.students)
+        self.assertEqual(self.groups(), {LECTURER_GROUP})
+        self.user.groups.clear()
+        self.assertEqual(self.groups(), set())
+
+    def test_membership_changes_from_the_group(self):
+        self.assertEqual(self.groups(), set())
+        self.lecturers.user_set.add(self.user)
+        self.assertEqual(self.groups(), {LECTURER_GROUP})
+        self.lecturers.user_set.remove(self.user)
+        self.assertEqual(self.groups(), set())
+        self.students.user_set.add(self.user)
+        self.assertEqual(self.groups(), {STUDENT_GROUP})
+        self.students.user_set.clear()
+        self.assertEqual(self.groups(), set())
+
+    def test_group_renamed_or_deleted(self):
+        self.user.groups.add(self.lecturers)
+        self.assertEqual(self.groups(), {LECTURER_GROUP})
+
+        self.lecturers.name = 'Tutors'
+        self.lecturers.save()
+        self.assertEqual(self.groups(), {'Tutors'})
+        self.lecturers.delete()
+        self.assertEqual(self.groups(), set())
+
+    def test_request_roles(self):
+        self.user.groups.add(self.students)
+        self.client.force_login(self.user)
+
+        request = self.client.get(reverse('home')).context['request']
+
+        self.assertEqual((request.roles.is_admin, request.roles.is_lecturer, request.roles.is_student),
+                         (False, False, True))
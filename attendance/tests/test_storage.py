@@ -0,0 +1,83 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from attendance.analytics import load_semester_arrays
+from attendance.bench import make_roster
+from attendance.bitmaps import count_days, decode_days, encode_days, get_day, set_day
+from attendance.exports import export_rows
+from attendance.models import Attendance, AttendanceBitmap, AttendanceSummary, Enrollment
+from attendance.services import poor_attendance_enrollments
+from attendance.storage import attendance_matrix, get_storage
+
+
+class BitmapCodecTests(TestCase):
+    def test_encode_decode_round_trip(self):
+        statuses = {0: 'Present', 1: 'Absent', 3: 'Present', 4: 'Absent', 9: 'Present', 120: 'Absent'}
+
+        days = encode_days(statuses)
+
+        self.assertEqual(len(days), 120 // 4 + 1)
+        self.assertEqual(dict(decode_days(days)), statuses)
+        self.assertEqual(count_days(days), (3, 3, 120))
+        self.assertEqual(encode_days({}), b'')
+        self.assertEqual(count_days(b''), (0, 0, None))
+
+    def test_set_day_overwrites_and_clears(self):
+        days = encode_days({2: 'Present'})
+        days = set_day(days, 2, 'Absent')
+        days = set_day(days, 10, 'Present')
+
+        self.assertEqual((get_day(days, 2), get_day(days, 10), get_day(days, 11)), ('Absent', 'Present', None))
+        self.assertEqual(get_day(days, 400), None)
+        self.assertEqual(dict(decode_days(set_day(days, 2, None))), {10: 'Present'})
+
+
+@override_settings(ATTENDANCE_STORAGE='bitmap')
+class BitmapStorageTests(TestCase):
+    def setUp(self):
+        self.class_obj = make_roster(2)
+        self.first, self.second = (
+            Enrollment.objects.filter(enrolled_class=self.class_obj).order_by('id').values_list('id', flat=True)
+        )
+
+    def record(self):
+        for day in range(4):
+            get_storage().record(self.class_obj, date(2024, 3, 4) + timedelta(days=day),
+                                 {self.first: 'Absent', self.second: 'Present' if day else 'Absent'})
+
+    # Everything read back through the storage backend and the readers on top
+    # of it, to compare the two backends.
+    def read_all(self):
+        arrays = load_semester_arrays(self.class_obj.semester)
+        return {
+            'export': sorted(export_rows(semester=self.class_obj.semester)),
+            'arrays': sorted(zip(arrays.enrollment_index.tolist(), arrays.day.tolist(), arrays.present.tolist())),
+            'matrix': attendance_matrix(self.class_obj.pk),
+            'summaries': list(AttendanceSummary.objects.order_by('pk').values_list('present_count', 'absent_count')),
+        }
+
+    def test_records_and_flags_poor_attendance(self):
+        self.record()
+
+        self.assertFalse(Attendance.objects.exists())
+        self.assertEqual(list(poor_attendance_enrollments(0.5).values_list('id', flat=True)), [self.first])
+        summary = AttendanceSummary.objects.get(enrollment_id=self.second)
+        self.assertEqual((summary.present_count, summary.absent_count), (3, 1))
+    def test_converted_attendance_reads_the_same(self):
+        with self.settings(ATTENDANCE_STORAGE='table'):
+            self.record()
+            table = self.read_all()
+
+        call_command('convert_attendance_storage', to='bitmap', delete=True, stdout=StringIO())
+
+        self.assertFalse(Attendance.objects.exists())
+        self.assertEqual(self.read_all(), table)
+        self.assertEqual(len(table['export']), 8)
+
+        with self.settings(ATTENDANCE_STORAGE='table'):
+            call_command('convert_attendance_storage', to='table', delete=True, stdout=StringIO())
+            self.assertFalse(AttendanceBitmap.objects.exists())
+            self.assertEqual(self.read_all(), table)
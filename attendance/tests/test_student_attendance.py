@@ -0,0 +1,57 @@
+from datetime import date
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from attendance.bench import make_roster
+from attendance.models import Enrollment
+from attendance.pagination import encode_cursor
+from attendance.storage import get_storage
+
+
+class StudentAttendanceTests(TestCase):
+    def setUp(self):
+        self.class_obj = make_roster(1)
+        self.enrollment = Enrollment.objects.select_related('student__user').get(enrolled_class=self.class_obj)
+        self.client.force_login(self.enrollment.student.user)
+
+    def record(self):
+        for day, status in [(4, 'Present'), (5, 'Absent'), (6, 'Present')]:
+            get_storage().record(self.class_obj, date(2024, 3, day), {self.enrollment.pk: status})
+
+    def totals(self, **params):
+        response = self.client.get(reverse('view_attendance'), {'semester': self.class_obj.semester_id, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.context['date_range'], [
+            (row['class_number'], row['present_count'], row['absent_count'], row['percentage'])
+            for row in response.context['summaries']
+        ]
+
+    def check_totals(self):
+        self.record()
+        self.assertEqual(self.totals(), (False, [(1, 2, 1, 200 / 3)]))
+        self.assertEqual(self.totals(date_from='2024-03-05'), (True, [(1, 1, 1, 50.0)]))
+        self.assertEqual(self.totals(date_to='2024-03-04'), (True, [(1, 1, 0, 100.0)]))
+        self.assertEqual(self.totals(date_from='2024-04-01'), (True, []))
+
+    def test_totals_follow_the_date_range(self):
+        self.check_totals()
+
+    @override_settings(ATTENDANCE_STORAGE='bitmap')
+    def test_totals_follow_the_date_range_in_bitmap_storage(self):
+        self.check_totals()
+
+    def test_history_pages(self):
+        self.record()
+        with self.settings(ATTENDANCE_PAGE_SIZE=2):
+            response = self.client.get(reverse('view_attendance'))
+            self.assertEqual([row['date'].day for row in response.context['attendance_records']], [6, 5])
+            response = self.client.get(reverse('view_attendance'), {'after': response.context['page_obj'].next_cursor})
+        self.assertEqual([row['date'].day for row in response.context['attendance_records']], [4])
+
+    def test_invalid_history_cursor_shows_the_latest_records(self):
+        for cursor in [encode_cursor(['not a date', 1]), encode_cursor(['2024-02-30', 1]),
+                       encode_cursor([1, '2024-03-04']), encode_cursor(5)]:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(reverse('view_attendance'), {'after': cursor})
+                self.assertEqual(response.status_code, 200)
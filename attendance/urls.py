@@ -1,11 +1,15 @@
 from django.contrib.auth.views import LogoutView
-from django.urls import path, include
-from . import views
+from django.conf import settings
+from django.urls import path, include, reverse_lazy
+from . import async_views, views
 from django.contrib.auth import views as auth_views
 
+# Views that have a native async version in async_views.
+hot_views = async_views if getattr(settings, 'ATTENDANCE_ASYNC_VIEWS', False) else views
+
 urlpatterns = [
     # Home
-    path('', views.home, name='home'),
+    path('', hot_views.home, name='home'),
 
     # Administrator Login
     path('admin/login/', views.AdminLoginView.as_view(), name='admin_login'),
@@ -22,6 +26,12 @@ urlpatterns = [
     # Logout view
     path('logout/', auth_views.LogoutView.as_view(), name='logout'),
 
+    # One-time set-password links for provisioned accounts
+    path('accounts/setup/<uidb64>/<token>/',
+         auth_views.PasswordResetConfirmView.as_view(success_url=reverse_lazy('password_setup_done')),
+         name='password_setup'),
+    path('accounts/setup/done/', auth_views.PasswordResetCompleteView.as_view(), name='password_setup_done'),
+
 
     # Semester CRUD
     path('semesters/', views.SemesterListView.as_view(), name='semester_list'),
@@ -60,18 +70,36 @@ urlpatterns = [
     path('enrollments/', views.EnrollmentListView.as_view(), name='enrollment_list'),
     path('enrollments/create/', views.EnrollStudentCreateView.as_view(), name='enrollment_create'),
     path('enrollments/<int:pk>/delete/', views.EnrollStudentDeleteView.as_view(), name='enrollment_delete'),
+    path('enrollments/bulk/', views.bulk_enroll, name='bulk_enroll'),
+    path('enrollments/autocomplete/students/', views.student_autocomplete, name='student_autocomplete'),
+    path('enrollments/autocomplete/classes/', views.class_autocomplete, name='class_autocomplete'),
 
     # Upload Students via Excel
     path('students/upload/', views.upload_students, name='upload_students'),
+    path('students/upload/jobs/<int:pk>/', views.import_job_status, name='import_job_status'),
+
+    # Attendance export and report for registrars
+    path('attendance/export/', views.export_attendance, name='export_attendance'),
+    path('attendance/report/', views.attendance_report, name='attendance_report'),
+
+    # Cache hit and miss counters
+    path('cache/stats/', views.cache_statistics, name='cache_statistics'),
+
+    # Request latency and query statistics
+    path('instrumentation/', views.request_statistics, name='request_statistics'),
 
     # Email Students with Poor Attendance
-    path('students/email-poor-attendance/', views.email_students_with_poor_attendance, name='email_poor_attendance'),
+    path('students/email-poor-attendance/', hot_views.email_students_with_poor_attendance, name='email_poor_attendance'),
+
+    # Lecturer Dashboard and per-class attendance matrix
+    path('lecturer/', views.lecturer_dashboard, name='lecturer_dashboard'),
+    path('lecturer/classes/<int:class_id>/attendance/', views.class_attendance_matrix, name='class_attendance_matrix'),
 
     # Lecturer Enter Attendance for a Class
-    path('attendance/enter/<int:class_id>/', views.enter_attendance, name='enter_attendance'),
+    path('attendance/enter/<int:class_id>/', hot_views.enter_attendance, name='enter_attendance'),
 
     # Student View Attendance
-    path('attendance/view/', views.student_view_attendance, name='view_attendance'),
+    path('attendance/view/', hot_views.student_view_attendance, name='view_attendance'),
 
     # Authentication views
     path('logout/', LogoutView.as_view(), name='logout'),
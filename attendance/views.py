@@ -1,26 +1,30 @@
-from datetime import datetime
-from django.contrib.auth.models import User
-from django.shortcuts import render, redirect
+from django.http import FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse_lazy
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 from django.contrib.auth.views import LoginView, LogoutView
-from django.core.mail import send_mail
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.contrib.auth.decorators import login_required
-from .models import Semester, Course, Class, Lecturer, Student, Enrollment, Attendance
-import pandas as pd
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.conf import settings
+from django.db.models import Count, Exists, OuterRef, Prefetch, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from .models import Semester, Course, Class, Lecturer, Student, Enrollment, AttendanceSnapshot, CollegeDay, StudentImportJob
+from .forms import (AttendanceExportForm, AttendanceFilterForm, BulkEnrollmentForm, CollegeDayChoiceForm, EnrollmentForm,
+                    class_label, student_label)
+from .services import enroll_students, poor_attendance_emails
+from .storage import attendance_matrix, get_storage
+from .summaries import student_standings
+from .outbox import queue_emails
+from .exports import export_rows, iter_csv, write_parquet
+from .pagination import KeysetPage, KeysetPaginationMixin, decode_cursor, encode_cursor
+from .caching import CachedFragmentMixin, cache_stats, cached_queryset
+from .instrumentation import instrumentation_enabled, instrumentation_report
 from django.contrib.auth import logout
 # Home view
 @login_required
 def home(request):
-    is_lecturer = request.user.groups.filter(name="Lecturers").exists()
-    is_student = request.user.groups.filter(name="Students").exists()
-    is_admin = request.user.is_superuser
-    return render(request, 'attendance/home.html', {
-        'is_lecturer': is_lecturer,
-        'is_student': is_student,
-        'is_admin': is_admin,
-    })
+    return render(request, 'attendance/home.html')
 
 # Custom Admin login view
 class AdminLoginView(LoginView):
@@ -59,21 +63,24 @@ class CustomLogoutView(LogoutView):
 
 
 # Semester CRUD views
-class SemesterListView(LoginRequiredMixin, ListView):
+class SemesterListView(LoginRequiredMixin, CachedFragmentMixin, KeysetPaginationMixin, ListView):
     model = Semester
     template_name = 'attendance/semester_list.html'
+    fragment_template_name = 'attendance/semester_list_fragment.html'
+    cache_name = 'semester_list'
+    cache_models = (Semester,)
 
 
 class SemesterCreateView(LoginRequiredMixin, CreateView):
     model = Semester
-    fields = ['year', 'name', 'start_date', 'end_date']
+    fields = ['year', 'name', 'start_date', 'end_date', 'absence_threshold']
     template_name = 'attendance/semester_form.html'
     success_url = reverse_lazy('semester_list')
 
 
 class SemesterUpdateView(LoginRequiredMixin, UpdateView):
     model = Semester
-    fields = ['year', 'name', 'start_date', 'end_date']
+    fields = ['year', 'name', 'start_date', 'end_date', 'absence_threshold']
     template_name = 'attendance/semester_form.html'
     success_url = reverse_lazy('semester_list')
 
@@ -85,15 +92,21 @@ class SemesterDeleteView(LoginRequiredMixin, DeleteView):
 
 
 # Administrator CRUD for Courses
-class CourseListView(LoginRequiredMixin, ListView):
+class CourseListView(LoginRequiredMixin, CachedFragmentMixin, KeysetPaginationMixin, ListView):
     model = Course
     template_name = 'attendance/course_list.html'
+    fragment_template_name = 'attendance/course_list_fragment.html'
+    cache_name = 'course_list'
+    cache_models = (Course, Semester)
     login_url = 'admin_login'
+    queryset = Course.objects.only('code', 'name').prefetch_related(
+        Prefetch('semesters', queryset=Semester.objects.only('year', 'name'))
+    )
 
 
 class CourseCreateView(LoginRequiredMixin, CreateView):
     model = Course
-    fields = ['code', 'name', 'semesters']
+    fields = ['code', 'name', 'semesters', 'absence_threshold']
     template_name = 'attendance/course_form.html'
     success_url = reverse_lazy('course_list')
     login_url = 'admin_login'
@@ -101,7 +114,7 @@ class CourseCreateView(LoginRequiredMixin, CreateView):
 
 class CourseUpdateView(LoginRequiredMixin, UpdateView):
     model = Course
-    fields = ['code', 'name', 'semesters']
+    fields = ['code', 'name', 'semesters', 'absence_threshold']
     template_name = 'attendance/course_form.html'
     success_url = reverse_lazy('course_list')
     login_url = 'admin_login'
@@ -115,10 +128,13 @@ class CourseDeleteView(LoginRequiredMixin, DeleteView):
 
 
 # Administrator CRUD for Classes
-class ClassListView(LoginRequiredMixin, ListView):
+class ClassListView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
     model = Class
     template_name = 'attendance/class_list.html'
     login_url = 'admin_login'
+    queryset = Class.objects.select_related('course', 'semester').only(
+        'number', 'course__name', 'semester__name'
+    )
 
 
 class ClassCreateView(LoginRequiredMixin, CreateView):
@@ -145,9 +161,12 @@ class ClassDeleteView(LoginRequiredMixin, DeleteView):
 
 
 # Administrator CRUD for Lecturers
-class LecturerListView(LoginRequiredMixin, ListView):
+class LecturerListView(LoginRequiredMixin, CachedFragmentMixin, KeysetPaginationMixin, ListView):
     model = Lecturer
     template_name = 'attendance/lecturer_list.html'
+    fragment_template_name = 'attendance/lecturer_list_fragment.html'
+    cache_name = 'lecturer_list'
+    cache_models = (Lecturer,)
     login_url = 'admin_login'
 
 
@@ -184,8 +203,9 @@ class LecturerAssignView(LoginRequiredMixin, UpdateView):
 
 
 # Administrator CRUD for Students
-class StudentListView(LoginRequiredMixin, ListView):
+class StudentListView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
     model = Student
+    keyset_ordering = ('student_id',)
     template_name = 'attendance/student_list.html'
     login_url = 'admin_login'
 
@@ -214,20 +234,68 @@ class StudentDeleteView(LoginRequiredMixin, DeleteView):
 
 
 # Administrator Enroll/Remove Students from Classes
-class EnrollmentListView(LoginRequiredMixin, ListView):
+class EnrollmentListView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
     model = Enrollment
     template_name = 'attendance/enrollment_list.html'
     login_url = 'admin_login'
+    queryset = Enrollment.objects.select_related('student', 'enrolled_class__course').only(
+        'student__full_name', 'enrolled_class__number', 'enrolled_class__course__name'
+    )
 
 
 class EnrollStudentCreateView(LoginRequiredMixin, CreateView):
     model = Enrollment
-    fields = ['student', 'enrolled_class']
+    form_class = EnrollmentForm
     template_name = 'attendance/enroll_form.html'
     success_url = reverse_lazy('enrollment_list')
     login_url = 'admin_login'
 
 
+# Enroll a whole cohort in a class at once
+@user_passes_test(lambda user: user.is_staff, login_url='admin_login')
+def bulk_enroll(request):
+    result = None
+    if request.method == 'POST':
+        form = BulkEnrollmentForm(request.POST, request.FILES)
+        if form.is_valid():
+            created, existing = enroll_students(form.cleaned_data['enrolled_class'].pk, form.cleaned_data['students'])
+            result = {'class': class_label(form.cleaned_data['enrolled_class']), 'created': created, 'existing': existing}
+            form = BulkEnrollmentForm()
+    else:
+        form = BulkEnrollmentForm()
+    return render(request, 'attendance/bulk_enroll.html', {'form': form, 'result': result})
+
+
+# Autocomplete choices for the enrollment forms: up to 20 matches for ?q=
+AUTOCOMPLETE_RESULTS = 20
+
+
+@user_passes_test(lambda user: user.is_staff, login_url='admin_login')
+def student_autocomplete(request):
+    query = request.GET.get('q', '').strip()
+    students = Student.objects.only('student_id', 'full_name').order_by('full_name', 'pk')
+    if query:
+        students = students.filter(Q(student_id__istartswith=query) | Q(full_name__icontains=query))
+    return JsonResponse({'results': [
+        {'id': student.pk, 'text': student_label(student)} for student in students[:AUTOCOMPLETE_RESULTS]
+    ]})
+
+
+# Every word has to match the course, the semester or the class number.
+@user_passes_test(lambda user: user.is_staff, login_url='admin_login')
+def class_autocomplete(request):
+    classes = Class.objects.select_related('course', 'semester').order_by('-semester__start_date', 'course__name', 'number')
+    for word in request.GET.get('q', '').split():
+        match = (Q(course__name__icontains=word) | Q(course__code__istartswith=word)
+                 | Q(semester__name__icontains=word))
+        if word.isdigit():
+            match |= Q(number=int(word)) | Q(semester__year=int(word))
+        classes = classes.filter(match)
+    return JsonResponse({'results': [
+        {'id': class_obj.pk, 'text': class_label(class_obj)} for class_obj in classes[:AUTOCOMPLETE_RESULTS]
+    ]})
+
+
 class EnrollStudentDeleteView(LoginRequiredMixin, DeleteView):
     model = Enrollment
     template_name = 'attendance/enrollment_confirm_delete.html'
@@ -235,64 +303,257 @@ class EnrollStudentDeleteView(LoginRequiredMixin, DeleteView):
     login_url = 'admin_login'
 
 
-# Upload Students from Excel
+# Upload Students from Excel or CSV. The file is stored and imported in the
+# background by the run_import_jobs command.
 @login_required(login_url='admin_login')
 def upload_students(request):
     if request.method == 'POST':
-        excel_file = request.FILES['file']
-        df = pd.read_excel(excel_file)
-
-        for _, row in df.iterrows():
-            Student.objects.create(
-                student_id=row['student_id'],
-                full_name=row['full_name'],
-                user=User.objects.create(username=row['username'])
-            )
-        return redirect('student_list')
+        upload = request.FILES['file']
+        job = StudentImportJob.objects.create(
+            file=upload,
+            original_name=upload.name,
+            update_existing=request.POST.get('update_existing') == 'on',
+            created_by=request.user,
+        )
+        return render(request, 'attendance/upload_students.html', {'job': job})
 
     return render(request, 'attendance/upload_students.html')
 
 
+# Import Job Progress
+@login_required(login_url='admin_login')
+def import_job_status(request, pk):
+    job = get_object_or_404(StudentImportJob, pk=pk)
+    return JsonResponse({
+        'id': job.pk,
+        'file': job.original_name,
+        'status': job.status,
+        'rows_processed': job.rows_processed,
+        'rows_failed': job.rows_failed,
+        'created': job.created_count,
+        'updated': job.updated_count,
+        'skipped': job.skipped_count,
+        'rows_per_second': round(job.throughput(), 1),
+        'errors': job.errors,
+    })
+
+
+# Export Attendance for registrars, as streamed CSV or a Parquet file
+@user_passes_test(lambda user: user.is_staff, login_url='admin_login')
+def export_attendance(request):
+    form = AttendanceExportForm(request.GET or None)
+    if not form.is_bound or not form.is_valid():
+        return render(request, 'attendance/attendance_export.html', {'form': form})
+
+    rows = export_rows(form.cleaned_data['semester'], form.cleaned_data['course'])
+    if form.cleaned_data['format'] == 'parquet':
+        try:
+            output = write_parquet(rows)
+        except ImportError:
+            return HttpResponse('Parquet export needs pandas and pyarrow installed.', status=501)
+        return FileResponse(output, as_attachment=True, filename='attendance.parquet')
+
+    response = StreamingHttpResponse(iter_csv(rows), content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="attendance.csv"'
+    return response
+
+
+# Semester attendance report for registrars. Reads only the snapshots written
+# by the compute_attendance_analytics command.
+@user_passes_test(lambda user: user.is_staff, login_url='admin_login')
+def attendance_report(request):
+    semesters = cached_queryset('semesters', (Semester,), Semester.objects.order_by('-start_date'))
+    semester = None
+    semester_id = request.GET.get('semester', '')
+    if semester_id.isdigit():
+        semester = next((option for option in semesters if option.pk == int(semester_id)), None)
+    if semester is None:
+        semester = Semester.objects.filter(snapshots__isnull=False).order_by('-start_date').first()
+
+    snapshots = []
+    if semester is not None:
+        snapshots = list(
+            AttendanceSnapshot.objects.filter(semester=semester)
+            .select_related('course', 'class_info')
+            .order_by('course__code', 'scope', 'class_info__number')
+        )
+    return render(request, 'attendance/attendance_report.html', {
+        'semesters': semesters,
+        'semester': semester,
+        'sections': [
+            ('Courses', 'Course', [s for s in snapshots if s.scope == AttendanceSnapshot.COURSE]),
+            ('Classes', 'Class', [s for s in snapshots if s.scope == AttendanceSnapshot.CLASS]),
+        ] if snapshots else [],
+        'computed_at': max((s.computed_at for s in snapshots), default=None),
+    })
+
+
+# Hit and miss counters of the attendance caches, for monitoring
+@user_passes_test(lambda user: user.is_staff, login_url='admin_login')
+def cache_statistics(request):
+    return JsonResponse(cache_stats())
+
+
+# Per-route latency and query statistics from InstrumentationMiddleware
+@user_passes_test(lambda user: user.is_staff, login_url='admin_login')
+def request_statistics(request):
+    return JsonResponse({'enabled': instrumentation_enabled(), 'routes': instrumentation_report()})
+
+
+# Subject, body and sender of the poor attendance alert.
+POOR_ATTENDANCE_EMAIL = (
+    'Attendance Alert',
+    'You have poor attendance. Please attend your classes.',
+    'admin@attendancesystem.com',
+)
+
+
 # Email Students with Poor Attendance
 @login_required(login_url='admin_login')
 def email_students_with_poor_attendance(request):
-    students_with_poor_attendance = Enrollment.objects.filter(attendance__status='Absent').distinct()
-
-    for enrollment in students_with_poor_attendance:
-        student_email = enrollment.student.user.email
-        send_mail(
-            'Attendance Alert',
-            'You have poor attendance. Please attend your classes.',
-            'admin@attendancesystem.com',
-            [student_email],
-            fail_silently=False,
-        )
+    # Messages are queued here and sent by the send_queued_emails command.
+    queue_emails(poor_attendance_emails(), *POOR_ATTENDANCE_EMAIL)
 
     return redirect('student_list')
 
 
-# Lecturer Enter Attendance
+# Classes a lecturer may work with: their own, or any class for an admin.
+def lecturer_classes(user):
+    classes = Class.objects.select_related('course', 'semester')
+    if user.is_superuser:
+        return classes
+    return classes.filter(lecturer__user=user)
+
+
+# Lecturer Dashboard
+@login_required(login_url='lecturer_login')
+def lecturer_dashboard(request):
+    classes = (
+        Class.objects.filter(lecturer__user=request.user)
+        .select_related('course', 'semester')
+        .annotate(
+            student_count=Count('enrollment'),
+            session_today=Exists(
+                CollegeDay.objects.filter(class_info=OuterRef('pk'), date=timezone.localdate())
+            ),
+        )
+        .order_by('-semester__start_date', 'course__name', 'number')
+    )
+    return render(request, 'attendance/lecturer_dashboard.html', {'classes': classes})
+
+
+# Lecturer Class Attendance Matrix
+@login_required(login_url='lecturer_login')
+def class_attendance_matrix(request, class_id):
+    class_obj = get_object_or_404(lecturer_classes(request.user), pk=class_id)
+    days, rows = attendance_matrix(class_obj.pk)
+    return render(request, 'attendance/class_attendance_matrix.html', {
+        'class': class_obj,
+        'days': days,
+        'rows': rows,
+    })
+
+
+# Lecturer Enter Attendance for one of the class's college days. Classes
+# without a calendar record attendance for today.
 @login_required(login_url='lecturer_login')
 def enter_attendance(request, class_id):
-    enrolled_students = Enrollment.objects.filter(enrolled_class=class_id)
+    class_obj = get_object_or_404(lecturer_classes(request.user), pk=class_id)
+    enrolled_students = Enrollment.objects.filter(enrolled_class=class_obj).select_related('student')
+    today = timezone.localdate()
+    session_form = CollegeDayChoiceForm(request.POST or None, class_obj=class_obj)
+    sessions = session_form.fields['college_day'].queryset
+    has_sessions = sessions.exists()
+    error = None
+
+    if request.method == 'POST' and (not has_sessions or session_form.is_valid()):
+        date = session_form.cleaned_data['college_day'].date if has_sessions else today
+        enrollment_ids = enrolled_students.values_list('id', flat=True)
+        statuses = {
+            enrollment_id: request.POST.get(f'attendance_{enrollment_id}')
+            for enrollment_id in enrollment_ids
+        }
+        try:
+            get_storage().record(class_obj, date, statuses)
+        except ValueError as exc:
+            error = str(exc)
+        else:
+            return redirect('lecturer_dashboard')
+
+    if not session_form.is_bound and has_sessions:
+        session_form.initial['college_day'] = (
+            sessions.filter(date__lte=today).order_by('-date').first() or sessions.first()
+        )
 
-    if request.method == 'POST':
-        for enrollment in enrolled_students:
-            status = request.POST.get(f'attendance_{enrollment.id}')
-            Attendance.objects.create(
-                enrollment=enrollment,
-                date=datetime.now(),
-                status=status
-            )
-        return redirect('class_list')
+    return render(request, 'attendance/enter_attendance.html', {
+        'class': class_obj,
+        'enrolled_students': enrolled_students,
+        'session_form': session_form if has_sessions else None,
+        'error': error,
+    })
+
+
+def attendance_page_size():
+    return getattr(settings, 'ATTENDANCE_PAGE_SIZE', 50)
 
-    return render(request, 'attendance/enter_attendance.html', {'enrolled_students': enrolled_students})
 
+# The (date, id) cursor of the requested history page, or None for the first
+# page when there is no cursor or it does not hold an ISO date and an id.
+def history_cursor(request):
+    cursor = decode_cursor(request.GET.get('after', ''), 2)
+    if cursor is None or not isinstance(cursor[0], str) or not isinstance(cursor[1], int):
+        return None
+    try:
+        if parse_date(cursor[0]) is None:
+            return None
+    except ValueError:
+        return None
+    return cursor
 
-# Student View Attendance
+
+# A page of history rows fetched with one extra row, which only tells whether
+# there is a next page.
+def history_page(rows, page_size):
+    page_obj = KeysetPage(rows[:page_size])
+    if len(rows) > page_size:
+        last = rows[page_size - 1]
+        page_obj.next_cursor = encode_cursor([last['date'], last['id']])
+    return page_obj
+
+
+# Student View Attendance, filtered by semester, course and date range. With
+# no filters the most recent semester is shown, so the cost of a page depends
+# on the selected range rather than the student's whole history.
 @login_required(login_url='student_login')
 def student_view_attendance(request):
-    student = Student.objects.get(user=request.user)
-    attendance_records = Attendance.objects.filter(enrollment__student=student)
-
-    return render(request, 'attendance/student_attendance.html', {'attendance_records': attendance_records})
+    student = get_object_or_404(Student.objects.only('id'), user=request.user)
+    form = AttendanceFilterForm(request.GET or None, student=student)
+    filters = form.cleaned_data if form.is_bound and form.is_valid() else {}
+    if not any(filters.values()):
+        semesters = form.fields['semester'].queryset
+        filters = {'semester': semesters.filter(start_date__lte=timezone.localdate()).first() or semesters.first()}
+        if not form.is_bound:
+            form = AttendanceFilterForm(initial=filters, student=student)
+
+    storage = get_storage()
+
+    # Detail rows newest first, one keyset page at a time.
+    page_size = attendance_page_size()
+    rows = storage.student_history(student, filters, before=history_cursor(request), limit=page_size + 1)
+    page_obj = history_page(rows, page_size)
+
+    # Totals over the chosen date range, or the stored whole-enrollment
+    # standing when no range is given.
+    date_range = bool(filters.get('date_from') or filters.get('date_to'))
+    if date_range:
+        summaries = storage.student_totals(student, filters)
+    else:
+        summaries = student_standings(student, filters)
+
+    return render(request, 'attendance/student_attendance.html', {
+        'form': form,
+        'summaries': summaries,
+        'date_range': date_range,
+        'attendance_records': page_obj.object_list,
+        'page_obj': page_obj,
+    })
@@ -0,0 +1,35 @@
+# Gunicorn settings for the production profile, read automatically from the
+# working directory. Each value can be overridden from the environment.
+
+import multiprocessing
+import os
+
+os.environ.setdefault('DJANGO_PROFILE', 'production')
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+# Views mostly wait on the database, so each process serves several requests
+# at once with threads. Processes scale with cores, threads with I/O wait.
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Load Django once in the master and fork, so workers start fast and share
+# the imported code pages.
+preload_app = True
+
+# Recycle workers after a number of requests, staggered so they do not all
+# restart at once, which bounds memory growth in long-running processes.
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+
+# Heartbeat files on tmpfs rather than a possibly slow disk.
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = '-'
+errorlog = '-'